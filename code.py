@@ -81,6 +81,10 @@ print("Press Ctrl+C to stop\n")
 
 manager = EffectManager(pixels, config.width, config.height, config, clock)
 
+# Or list the show in a JSON file instead of code (effect modules are then
+# only imported when their turn comes) - see examples/show.json:
+# manager.load_playlist("show.json")
+
 # Add your effects here! Each effect runs for a specified number of beats.
 # Tip: Use beats=8/16/32 to sync with musical phrases
 # All speeds now scale with BPM for tight sync!
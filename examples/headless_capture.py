@@ -0,0 +1,36 @@
+"""
+Headless Capture Example
+
+Runs an effect on a normal computer (no Pico, no LEDs) and records every
+frame in memory. Useful for profiling effects and checking their output.
+
+Run from the examples folder:
+    python headless_capture.py
+"""
+
+import sys
+sys.path.insert(0, '../lib')
+
+from cratelight import headless
+headless.install()  # Fake board/digitalio modules for CPython
+
+import board
+from cratelight import CapturePixels, FixedBPMClock, ZigzagGrid
+from cratelight.effects import RainbowChase
+
+config = ZigzagGrid(pin=board.GP2, width=32, height=8, brightness=0.1)
+pixels = config.create_pixels(backend=CapturePixels)
+clock = FixedBPMClock(bpm=120)
+
+effect = RainbowChase(pixels, config.width, config.height, config, clock=clock)
+effect.setup()
+for _ in range(90):
+    clock.update()
+    effect.update()
+    effect.show()
+effect.cleanup()
+
+first_time, _ = pixels.frames[0]
+last_time, last_frame = pixels.frames[-1]
+print(f"Captured {len(pixels.frames)} frames in {last_time - first_time:.3f}s")
+print(f"Last frame: {len(last_frame)} bytes, first LED = {tuple(last_frame[:3])}")
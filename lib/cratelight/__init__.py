@@ -1,40 +1,99 @@
 """CrateLight - LED Animation Library for Raspberry Pi Pico"""
 
+# Only the color table is imported up front. Every other public name is
+# imported from its submodule on first access (module __getattr__), so
+# `from cratelight import COLORS` doesn't pay for the fonts, the 24x12 map
+# or the effect classes at boot. On CircuitPython `from cratelight import *`
+# only sees names already loaded; import names explicitly instead.
 from .colors import COLORS, get_random_color
-from .grid_utils import (
-    ids_by_coord,
-    coords_to_id,
-    id_to_coords,
-    clear_grid,
-    borders,
-    color_coords,
-    color_id,
-    draw_from_grid
-)
-from .animations import (
-    light_up_grid_horizontal,
-    light_up_grid_vertical,
-    light_up_grid
-)
-from .game_of_life import gol_step
-from .effect_base import Effect
-from .clock import ClockSource, BPMClock, FixedBPMClock, ManualClock
-from .utils import wheel, scale_color, sine_wave, lerp_color
-from .hardware import (
-    HardwareConfig,
-    CrateLightGrid,
-    LEDStrip,
-    ZigzagGrid,
-    LinearGrid
-)
-from .effect_manager import EffectManager, BPMSyncedEffect
-from .text import Font, Font8x8, TextRenderer
 
-# Text rendering uses hardcoded fonts (Font and Font8x8)
+__version__ = "0.1.0"
+
+# Public name -> submodule that defines it
+_LAZY = {
+    "ids_by_coord": "grid_utils",
+    "coords_to_id": "grid_utils",
+    "id_to_coords": "grid_utils",
+    "clear_grid": "grid_utils",
+    "borders": "grid_utils",
+    "color_coords": "grid_utils",
+    "color_id": "grid_utils",
+    "draw_from_grid": "grid_utils",
+    "light_up_grid_horizontal": "animations",
+    "light_up_grid_vertical": "animations",
+    "light_up_grid": "animations",
+    "gol_step": "game_of_life",
+    "NO_LED": "mapping",
+    "build_lookup_tables": "mapping",
+    "Effect": "effect_base",
+    "FrameBuffer": "framebuffer",
+    "BakedEffect": "bake",
+    "FrameTable": "bake",
+    "FrameScheduler": "scheduler",
+    "FrameStats": "stats",
+    "HOOK_EVENTS": "hooks",
+    "ClockSource": "clock",
+    "BPMClock": "clock",
+    "FixedBPMClock": "clock",
+    "ManualClock": "clock",
+    "SimulatedClock": "clock",
+    "TimeSource": "timesource",
+    "VirtualTime": "timesource",
+    "SYSTEM_TIME": "timesource",
+    "wheel": "utils",
+    "scale_color": "utils",
+    "sine_wave": "utils",
+    "lerp_color": "utils",
+    "ColorCorrection": "correction",
+    "PixelBuffer": "backends",
+    "CapturePixels": "backends",
+    "OffscreenPixels": "backends",
+    "CorrectedPixels": "backends",
+    "SegmentedPixels": "backends",
+    "ThreadedOutput": "backends",
+    "Transition": "transitions",
+    "Crossfade": "transitions",
+    "Wipe": "transitions",
+    "Dissolve": "transitions",
+    "QualityGovernor": "governor",
+    "Layer": "layers",
+    "LayerStack": "layers",
+    "BLEND_MODES": "layers",
+    "set_default_backend": "hardware",
+    "HardwareConfig": "hardware",
+    "CrateLightGrid": "hardware",
+    "LEDStrip": "hardware",
+    "ZigzagGrid": "hardware",
+    "LinearGrid": "hardware",
+    "MappedGrid": "hardware",
+    "TiledGrid": "hardware",
+    "MultiSegmentConfig": "hardware",
+    "FrameRecorder": "recording",
+    "FrameReader": "recording",
+    "ReplayEffect": "recording",
+    "EffectManager": "effect_manager",
+    "BPMSyncedEffect": "effect_manager",
+    "Font": "text",
+    "Font8x8": "text",
+    "TextRenderer": "text",
+    "effects": "effects",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    module = __import__(f"{__name__}.{module_name}", None, None, ["__name__"])
+    value = module if module_name == name else getattr(module, name)
+    globals()[name] = value  # Later lookups skip __getattr__
+    return value
+
+
+def __dir__():
+    return __all__
 
-from . import effects
 
-__version__ = "0.1.0"
 __all__ = [
     "COLORS",
     "get_random_color",
@@ -50,20 +109,54 @@ __all__ = [
     "light_up_grid_vertical",
     "light_up_grid",
     "gol_step",
+    "NO_LED",
+    "build_lookup_tables",
     "Effect",
+    "FrameBuffer",
+    "BakedEffect",
+    "FrameTable",
+    "FrameScheduler",
+    "FrameStats",
+    "HOOK_EVENTS",
     "ClockSource",
     "BPMClock",
     "FixedBPMClock",
     "ManualClock",
+    "SimulatedClock",
+    "TimeSource",
+    "VirtualTime",
+    "SYSTEM_TIME",
     "wheel",
     "scale_color",
     "sine_wave",
     "lerp_color",
+    "PixelBuffer",
+    "CapturePixels",
+    "OffscreenPixels",
+    "CorrectedPixels",
+    "ColorCorrection",
+    "SegmentedPixels",
+    "ThreadedOutput",
+    "Transition",
+    "Crossfade",
+    "Wipe",
+    "Dissolve",
+    "QualityGovernor",
+    "Layer",
+    "LayerStack",
+    "BLEND_MODES",
+    "set_default_backend",
     "HardwareConfig",
     "CrateLightGrid",
     "LEDStrip",
     "ZigzagGrid",
     "LinearGrid",
+    "MappedGrid",
+    "TiledGrid",
+    "MultiSegmentConfig",
+    "FrameRecorder",
+    "FrameReader",
+    "ReplayEffect",
     "EffectManager",
     "BPMSyncedEffect",
     "Font",
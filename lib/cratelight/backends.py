@@ -0,0 +1,532 @@
+"""Pixel backends: software strips and wrappers that sit in front of real ones"""
+
+import time
+from array import array
+try:
+    import threading
+except ImportError:
+    threading = None
+
+from .correction import apply_tables
+
+
+class PixelBuffer:
+    """
+    In-memory NeoPixel stand-in
+
+    Implements the parts of the adafruit_neopixel API that CrateLight uses
+    (indexing, slice assignment, fill, brightness, show) on top of a flat
+    RGB bytearray. show() does nothing, so this doubles as a null backend
+    for profiling effects off-device.
+
+    Usage:
+        pixels = config.create_pixels(backend=PixelBuffer)
+    """
+
+    def __init__(self, pin, n, brightness=1.0, auto_write=False, pixel_order=None):
+        """
+        Initialize pixel buffer (same signature as neopixel.NeoPixel)
+
+        Args:
+            pin: Data pin (kept for reference only)
+            n: Number of LEDs
+            brightness: Brightness applied to frame() output (0.0 to 1.0)
+            auto_write: Call show() after every write
+            pixel_order: Ignored, frames are always RGB
+        """
+        self.pin = pin
+        self.n = n
+        self.buf = bytearray(n * 3)
+        self.auto_write = auto_write
+        self.show_count = 0
+        self.brightness = brightness
+
+    @property
+    def brightness(self):
+        """Output brightness (0.0 to 1.0)"""
+        return self._brightness
+
+    @brightness.setter
+    def brightness(self, value):
+        self._brightness = min(max(value, 0.0), 1.0)
+        self._build_tables()
+
+    def _build_tables(self):
+        """Rebuild the output lookup tables (None when output is unscaled)"""
+        if self._brightness < 1.0:
+            table = bytes(int(v * self._brightness) for v in range(256))
+            self._tables = (table, table, table)
+        else:
+            self._tables = None
+
+    def __len__(self):
+        return self.n
+
+    def __getitem__(self, index):
+        buf = self.buf
+        if isinstance(index, slice):
+            return [(buf[i * 3], buf[i * 3 + 1], buf[i * 3 + 2])
+                    for i in range(*index.indices(self.n))]
+        if index < 0:
+            index += self.n
+        offset = index * 3
+        return (buf[offset], buf[offset + 1], buf[offset + 2])
+
+    def __setitem__(self, index, value):
+        if isinstance(index, slice):
+            self._set_slice(index, value)
+        else:
+            if index < 0:
+                index += self.n
+            if not 0 <= index < self.n:
+                raise IndexError("pixel index out of range")
+            self._set_pixel(index, value)
+
+        if self.auto_write:
+            self.show()
+
+    def _set_pixel(self, index, color):
+        """Store one color (tuple or 0xRRGGBB int) at an LED index"""
+        if isinstance(color, int):
+            color = ((color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF)
+        offset = index * 3
+        buf = self.buf
+        buf[offset] = color[0]
+        buf[offset + 1] = color[1]
+        buf[offset + 2] = color[2]
+
+    def _set_slice(self, index, values):
+        """Slice assignment: a sequence of colors or flattened RGB values"""
+        start, stop, step = index.indices(self.n)
+        indices = range(start, stop, step)
+        count = len(indices)
+
+        if len(values) == count * 3:
+            if step == 1:
+                # Flattened RGB bytes - one bulk copy
+                self.buf[start * 3:stop * 3] = bytes(values)
+            else:
+                for i, led_id in enumerate(indices):
+                    self._set_pixel(led_id, values[i * 3:i * 3 + 3])
+        elif len(values) == count:
+            for led_id, color in zip(indices, values):
+                self._set_pixel(led_id, color)
+        else:
+            raise ValueError(f"expected {count} colors or {count * 3} values, got {len(values)}")
+
+    def fill(self, color):
+        """Set every LED to the same color"""
+        if isinstance(color, int):
+            color = ((color >> 16) & 0xFF, (color >> 8) & 0xFF, color & 0xFF)
+        self.buf[:] = bytes(color) * self.n
+        if self.auto_write:
+            self.show()
+
+    def frame(self):
+        """
+        Get the bytes that would go out on the wire
+
+        Returns:
+            bytes: RGB triples per LED with brightness applied
+        """
+        if self._tables is None:
+            return bytes(self.buf)
+        return bytes(apply_tables(self.buf, self._tables))
+
+    def show(self):
+        """Push the buffer to the output (no-op for the null backend)"""
+        self.show_count += 1
+
+    def deinit(self):
+        """Release the output (nothing to release in memory)"""
+        pass
+
+
+class CapturePixels(PixelBuffer):
+    """
+    PixelBuffer that records every show() as (timestamp, frame bytes)
+
+    Usage:
+        pixels = config.create_pixels(backend=CapturePixels)
+        effect.run(fps=30, max_frames=90)
+        timestamp, frame = pixels.frames[-1]
+    """
+
+    def __init__(self, pin, n, brightness=1.0, auto_write=False, pixel_order=None,
+                 max_frames=None, time_func=None):
+        """
+        Initialize capture backend
+
+        Args:
+            max_frames: Keep only the most recent N frames (None for all)
+            time_func: Timestamp source (default time.monotonic)
+        """
+        super().__init__(pin, n, brightness, auto_write, pixel_order)
+        self.frames = []
+        self.max_frames = max_frames
+        self.time_func = time_func if time_func is not None else time.monotonic
+
+    def show(self):
+        """Record the current frame"""
+        super().show()
+        self.frames.append((self.time_func(), self.frame()))
+        if self.max_frames is not None and len(self.frames) > self.max_frames:
+            self.frames.pop(0)
+
+    def clear_frames(self):
+        """Forget all recorded frames"""
+        self.frames = []
+
+
+class OffscreenPixels(PixelBuffer):
+    """
+    PixelBuffer used as an effect's render target instead of the strip
+
+    show() hands the buffer to presenter(pixels) if one is set, so whoever
+    owns the real strip (e.g. the EffectManager during transitions) decides
+    what reaches the LEDs. With no presenter, show() only counts frames.
+
+    Usage:
+        def present(stage):
+            pixels[:] = stage.buf
+            pixels.show()
+
+        stage = OffscreenPixels(len(pixels), presenter=present)
+        effect = WaveEffect(stage, 24, 12, config)
+    """
+
+    def __init__(self, n, presenter=None):
+        """
+        Initialize off-screen buffer
+
+        Args:
+            n: Number of LEDs
+            presenter: Optional callable invoked with this object on show()
+        """
+        super().__init__(None, n)
+        self.presenter = presenter
+
+    def show(self):
+        """Hand the frame to the presenter"""
+        self.show_count += 1
+        if self.presenter is not None:
+            self.presenter(self)
+
+
+class CorrectedPixels(PixelBuffer):
+    """
+    Output stage that color-corrects the whole frame on show()
+
+    Effects write plain RGB into this buffer. show() runs it through the
+    ColorCorrection tables (gamma, white balance and master brightness) in
+    one bulk pass and pushes the result to the device, which should run at
+    brightness 1.0. The buffer itself is never modified, so effects that
+    only redraw part of the frame don't get corrected twice.
+
+    Usage:
+        config.color_correction = ColorCorrection(gamma=2.2)
+        pixels = config.create_pixels()  # returns CorrectedPixels
+    """
+
+    def __init__(self, device, correction, brightness=1.0):
+        """
+        Initialize corrected output
+
+        Args:
+            device: NeoPixel-compatible object that receives corrected frames
+            correction: ColorCorrection to apply
+            brightness: Master brightness folded into the tables (0.0 to 1.0)
+        """
+        self.device = device
+        self.correction = correction
+        super().__init__(getattr(device, "pin", None), len(device), brightness)
+
+    def _build_tables(self):
+        """Fold brightness into the correction tables"""
+        self._tables = self.correction.build_tables(self._brightness)
+
+    def show(self):
+        """Correct the frame and push it to the device"""
+        self.show_count += 1
+        self.device[:] = apply_tables(self.buf, self._tables)
+        self.device.show()
+
+    def deinit(self):
+        """Release the device"""
+        if hasattr(self.device, "deinit"):
+            self.device.deinit()
+
+
+class ThreadedOutput(PixelBuffer):
+    """
+    Output stage that pushes frames to the device from a background thread
+
+    Effects draw into this buffer as usual. show() copies the finished frame
+    into a free slot of a small ring (double or triple buffering) and returns
+    straight away; the output thread owns the device and writes slots to it
+    in order. Rendering of the next frame overlaps the bus transfer of the
+    previous one. If every slot is still queued, show() waits for one to
+    free up, so a slow device paces the render loop instead of piling up.
+    An exception from the device is re-raised by the next show() or flush().
+
+    Without threading (CircuitPython) show() writes the device synchronously.
+
+    Usage:
+        pixels = config.create_pixels(threaded=True)
+        ...
+        pixels.deinit()  # stop the output thread
+    """
+
+    def __init__(self, device, slots=2):
+        """
+        Initialize threaded output
+
+        Args:
+            device: NeoPixel-compatible object the output thread writes to
+            slots: Frames in the ring (2 = double buffering, 3 = triple)
+        """
+        if slots < 1:
+            raise ValueError(f"slots must be at least 1, got {slots}")
+
+        super().__init__(getattr(device, "pin", None), len(device))
+        self.device = device
+        self.thread = None
+
+        if threading is not None:
+            self._free = [bytearray(len(self.buf)) for _ in range(slots)]
+            self._ready = []
+            self.error = None  # Exception from the output thread, re-raised by show()
+            self._condition = threading.Condition()
+            self._running = True
+            self.thread = threading.Thread(target=self._loop)
+            self.thread.daemon = True
+            self.thread.start()
+
+    @property
+    def brightness(self):
+        """Brightness of the device"""
+        return self.device.brightness
+
+    @brightness.setter
+    def brightness(self, value):
+        # Set during PixelBuffer.__init__ before the device is known
+        if hasattr(self, "device"):
+            self.device.brightness = value
+        self._brightness = 1.0
+        self._tables = None
+
+    def show(self):
+        """Hand the current frame to the output thread"""
+        self.show_count += 1
+
+        if self.thread is None:
+            self.device[:] = self.buf
+            self.device.show()
+            return
+
+        with self._condition:
+            while not self._free and self.error is None:
+                self._condition.wait()
+            self._raise_error()
+            slot = self._free.pop()
+            slot[:] = self.buf
+            self._ready.append(slot)
+            self._condition.notify_all()
+
+    def _loop(self):
+        """Output thread: write queued frames to the device in order"""
+        while True:
+            with self._condition:
+                while self._running and not self._ready:
+                    self._condition.wait()
+                if not self._ready:
+                    return
+                slot = self._ready[0]
+
+            error = None
+            try:
+                self.device[:] = slot
+                self.device.show()
+            except Exception as e:
+                # Keep the thread alive and hand the slot back so the next
+                # show() or flush() raises instead of waiting forever
+                error = e
+
+            with self._condition:
+                self._ready.pop(0)
+                self._free.append(slot)
+                if error is not None:
+                    self.error = error
+                self._condition.notify_all()
+
+    def _raise_error(self):
+        """Re-raise the output thread's last exception (call holding the condition)"""
+        error = self.error
+        if error is not None:
+            self.error = None
+            raise error
+
+    def flush(self):
+        """Wait until every queued frame has been written to the device"""
+        if self.thread is None:
+            return
+        with self._condition:
+            while self._ready:
+                self._condition.wait()
+            self._raise_error()
+
+    def deinit(self):
+        """Write any queued frames, stop the output thread and release the device"""
+        if self.thread is not None:
+            with self._condition:
+                self._running = False
+                self._condition.notify_all()
+            self.thread.join()
+            self.thread = None
+        if hasattr(self.device, "deinit"):
+            self.device.deinit()
+
+
+class _SegmentWorker:
+    """Thread that pushes one segment's strip whenever it is signalled"""
+
+    def __init__(self, pixels):
+        self.pixels = pixels
+        self.error = None  # Exception from the last show(), re-raised by the caller
+        self.go = threading.Event()
+        self.done = threading.Event()
+        self.thread = threading.Thread(target=self._loop)
+        self.thread.daemon = True
+        self.thread.start()
+
+    def _loop(self):
+        while True:
+            self.go.wait()
+            self.go.clear()
+            try:
+                self.pixels.show()
+            except Exception as e:
+                # Keep the thread alive so the next show() doesn't hang
+                self.error = e
+            self.done.set()
+
+
+class SegmentedPixels:
+    """
+    One logical strip made of several physical chains, one per data pin
+
+    LED IDs are numbered segment after segment. Bulk writes (FrameBuffer
+    blits) are split into one slice per chain, and show() pushes every
+    chain. With parallel=True each chain is pushed from its own thread so
+    the bus transfers overlap; this needs threading (CPython) and an output
+    whose show() releases the GIL (SPI, USB, network). On CircuitPython the
+    chains are written one after another.
+
+    Usage:
+        pixels = MultiSegmentConfig(...).create_pixels()
+    """
+
+    def __init__(self, segments, parallel=False):
+        """
+        Initialize segmented pixels
+
+        Args:
+            segments: List of NeoPixel-compatible objects, in LED ID order
+            parallel: Push segments concurrently from worker threads
+        """
+        self.segments = list(segments)
+        self.offsets = []
+        self.n = 0
+        for segment in self.segments:
+            self.offsets.append(self.n)
+            self.n += len(segment)
+
+        # Which segment each global LED ID lives in
+        self.segment_by_id = array('B', bytes(self.n))
+        for index, segment in enumerate(self.segments):
+            offset = self.offsets[index]
+            for led_id in range(offset, offset + len(segment)):
+                self.segment_by_id[led_id] = index
+
+        self.workers = None
+        if parallel and threading is not None and len(self.segments) > 1:
+            self.workers = [_SegmentWorker(segment) for segment in self.segments]
+
+    @property
+    def brightness(self):
+        """Brightness of the first segment (all segments share it)"""
+        return self.segments[0].brightness
+
+    @brightness.setter
+    def brightness(self, value):
+        for segment in self.segments:
+            segment.brightness = value
+
+    def __len__(self):
+        return self.n
+
+    def _locate(self, index):
+        """Map a global LED ID to (segment, local ID)"""
+        if index < 0:
+            index += self.n
+        if not 0 <= index < self.n:
+            raise IndexError("pixel index out of range")
+        segment_index = self.segment_by_id[index]
+        return self.segments[segment_index], index - self.offsets[segment_index]
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.n))]
+        segment, local_id = self._locate(index)
+        return segment[local_id]
+
+    def __setitem__(self, index, value):
+        if not isinstance(index, slice):
+            segment, local_id = self._locate(index)
+            segment[local_id] = value
+            return
+
+        start, stop, step = index.indices(self.n)
+        if start == 0 and stop == self.n and step == 1 and len(value) == self.n * 3:
+            # Whole flattened frame - one bulk slice per chain
+            for segment, offset in zip(self.segments, self.offsets):
+                segment[:] = value[offset * 3:(offset + len(segment)) * 3]
+            return
+
+        indices = range(start, stop, step)
+        if len(value) == len(indices) * 3:
+            for i, led_id in enumerate(indices):
+                self[led_id] = tuple(value[i * 3:i * 3 + 3])
+        else:
+            for led_id, color in zip(indices, value):
+                self[led_id] = color
+
+    def fill(self, color):
+        """Set every LED on every chain to the same color"""
+        for segment in self.segments:
+            segment.fill(color)
+
+    def show(self):
+        """Push every chain"""
+        if self.workers is None:
+            for segment in self.segments:
+                segment.show()
+            return
+
+        for worker in self.workers:
+            worker.go.set()
+        for worker in self.workers:
+            worker.done.wait()
+            worker.done.clear()
+
+        for worker in self.workers:
+            error = worker.error
+            if error is not None:
+                worker.error = None
+                raise error
+
+    def deinit(self):
+        """Release every chain"""
+        for segment in self.segments:
+            if hasattr(segment, "deinit"):
+                segment.deinit()
@@ -0,0 +1,150 @@
+"""Phase-quantized frame tables for periodic beat effects"""
+
+# Positions this close below a step boundary count as on it (float rounding)
+STEP_EPSILON = 1e-6
+
+
+class FrameTable:
+    """
+    Pre-rendered frames covering one cycle of a periodic effect
+
+    Frames are stored back to back in one bytearray. Looking one up copies it
+    into the frame buffer with a single slice assignment, so the per-frame
+    cost no longer depends on how expensive the effect's math is.
+
+    Frames are copies of FrameBuffer.buf, so they are in strip order. Memory
+    use is about steps * num_leds * 3 bytes (24x12 grid: 864 bytes per
+    step), so keep steps small on a microcontroller.
+    """
+
+    def __init__(self, frame_size, steps, cycle_length):
+        """
+        Initialize frame table
+
+        Args:
+            frame_size: Bytes per frame (len(FrameBuffer.buf))
+            steps: Frames stored for one cycle
+            cycle_length: Length of the cycle in position units
+        """
+        if steps <= 0:
+            raise ValueError(f"steps must be positive, got {steps}")
+        if cycle_length <= 0:
+            raise ValueError(f"cycle_length must be positive, got {cycle_length}")
+
+        self.frame_size = frame_size
+        self.steps = steps
+        self.cycle_length = cycle_length
+        self.data = bytearray(frame_size * steps)
+        self._view = memoryview(self.data)
+
+    def store(self, step, buf):
+        """Store one rendered frame"""
+        start = step * self.frame_size
+        self.data[start:start + self.frame_size] = buf
+
+    def locate(self, position):
+        """
+        Find the stored frames around a cycle position
+
+        Returns:
+            tuple: (step, next step, weight of next step 0-255)
+        """
+        scaled = (position % self.cycle_length) * self.steps / self.cycle_length
+        step = int(scaled + STEP_EPSILON)
+        if step >= self.steps:
+            # position % cycle_length can round up to cycle_length
+            step = 0
+            scaled = 0.0
+        weight = max(0, int((scaled - step) * 256))
+        return step, (step + 1) % self.steps, weight
+
+    def copy_to(self, buf, position):
+        """Copy the nearest stored frame at or before position into buf"""
+        step = self.locate(position)[0]
+        start = step * self.frame_size
+        buf[:] = self._view[start:start + self.frame_size]
+
+    def blend_to(self, buf, position):
+        """
+        Write a linear blend of the two frames around position into buf
+
+        Smoother than copy_to() with few steps, but runs a loop over every
+        byte, so it costs more per frame.
+        """
+        step, next_step, weight = self.locate(position)
+        if weight == 0:
+            self.copy_to(buf, position)
+            return
+
+        data = self.data
+        size = self.frame_size
+        start = step * size
+        next_start = next_step * size
+        keep = 256 - weight
+        for i in range(size):
+            buf[i] = (data[start + i] * keep + data[next_start + i] * weight) >> 8
+
+
+class BakedEffect:
+    """
+    Mixin for framebuffer effects whose output repeats over a cycle
+
+    Effects whose frames depend only on a position within a fixed cycle
+    (beat phase, beat count mod N) implement:
+    - bake_cycle(): cycle length, in the units used for positions
+    - render_at(position): draw the frame for that position into
+      self.framebuffer
+
+    Calling init_bake() in __init__ and setup_bake() at the end of setup()
+    makes the effect pre-render the cycle when baking is requested; update()
+    then calls draw_baked(position) instead of drawing live.
+
+    Usage:
+        manager.add_effect(WaveEffect, beats=16, bake=32)
+        manager.add_effect(RainbowScroll, beats=16, bake=64, bake_blend=True)
+    """
+
+    def init_bake(self, bake=None, bake_blend=False):
+        """
+        Store bake settings
+
+        Args:
+            bake: Frames to pre-render per cycle, None to render live
+            bake_blend: Blend neighbouring baked frames (smoother, slower)
+        """
+        if bake is not None and bake <= 0:
+            raise ValueError(f"bake must be a positive number of steps, got {bake}")
+
+        self.bake_steps = bake
+        self.bake_blend = bake_blend
+        self.frame_table = None
+
+    def bake_cycle(self):
+        """Return the cycle length in position units (override)"""
+        return 1.0
+
+    def render_at(self, position):
+        """Draw the frame at a cycle position into self.framebuffer (override)"""
+        raise NotImplementedError
+
+    def setup_bake(self):
+        """Pre-render the cycle if baking is enabled (call at the end of setup())"""
+        self.frame_table = None
+        if not self.bake_steps:
+            return
+
+        cycle = self.bake_cycle()
+        steps = self.bake_steps
+        buf = self.framebuffer.buf
+        table = FrameTable(len(buf), steps, cycle)
+        for step in range(steps):
+            self.render_at(step * cycle / steps)
+            table.store(step, buf)
+        self.frame_table = table
+
+    def draw_baked(self, position):
+        """Draw the baked frame for a cycle position into self.framebuffer"""
+        if self.bake_blend:
+            self.frame_table.blend_to(self.framebuffer.buf, position)
+        else:
+            self.frame_table.copy_to(self.framebuffer.buf, position)
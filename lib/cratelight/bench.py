@@ -0,0 +1,328 @@
+"""
+Headless benchmark for the built-in effects
+
+Renders every effect in cratelight.effects on a set of grid sizes with a
+SimulatedClock and a PixelBuffer (no LEDs attached), and reports frames per
+second, time per pixel and memory allocated per frame. A second table times
+the output path on its own: one solid frame written LED by LED through
+coords_to_id() (how effects drew before FrameBuffer) against the same frame
+drawn into a FrameBuffer and blitted.
+
+Usage (CPython, from the lib directory):
+    python -m cratelight.bench
+    python -m cratelight.bench --frames 100 --grids 24x12,64x32 --json bench.json
+    python -m cratelight.bench --effects WaveEffect,RainbowChase
+
+Usage (on the board, small grids only):
+    from cratelight import bench
+    bench.print_table(bench.run_benchmarks(grids=((24, 12),), frames=50))
+"""
+
+import gc
+import random
+import sys
+
+from . import effects
+from .backends import PixelBuffer
+from .clock import SimulatedClock
+from .framebuffer import FrameBuffer
+from .hardware import ZigzagGrid
+from .stats import ticks, ticks_diff
+
+try:
+    import tracemalloc
+except ImportError:
+    tracemalloc = None
+
+# Grid sizes benchmarked by default (width, height)
+GRID_SIZES = ((24, 12), (32, 8), (64, 32), (128, 64))
+
+DEFAULT_FRAMES = 200
+ALLOC_FRAMES = 20        # Frames measured (separately) for allocations
+BENCH_FPS = 30           # Simulated frame rate for the clock
+BENCH_BPM = 120
+BENCH_SEED = 0
+
+
+def effect_classes():
+    """Every effect class exported from cratelight.effects, in export order"""
+    return [getattr(effects, name) for name in effects.__all__]
+
+
+def _render(effect, clock, frames):
+    """Render frames like the EffectManager does, restarting finished effects"""
+    for _ in range(frames):
+        clock.update()
+        if effect.update() is False:
+            effect.setup()
+        effect.show()
+        effect.frame_count += 1
+
+
+def _alloc_per_frame(effect, clock, frames):
+    """
+    Measure memory allocated per frame
+
+    MicroPython/CircuitPython: bytes allocated with the GC paused.
+    CPython: peak transient bytes per frame from tracemalloc (freed memory is
+    returned immediately by reference counting, so this is the high-water
+    mark above the live heap, not a cumulative total).
+
+    Returns:
+        float: Bytes per frame, or None if it can't be measured
+    """
+    if hasattr(gc, "mem_free"):
+        gc.collect()
+        gc.disable()
+        try:
+            free_before = gc.mem_free()
+            _render(effect, clock, frames)
+            return (free_before - gc.mem_free()) / frames
+        finally:
+            gc.enable()
+
+    if tracemalloc is None:
+        return None
+
+    tracemalloc.start()
+    try:
+        total = 0
+        for _ in range(frames):
+            current = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            _render(effect, clock, 1)
+            total += tracemalloc.get_traced_memory()[1] - current
+        return total / frames
+    finally:
+        tracemalloc.stop()
+
+
+def bench_effect(effect_class, width, height, frames=DEFAULT_FRAMES, seed=BENCH_SEED, **kwargs):
+    """
+    Benchmark one effect on one grid size
+
+    Args:
+        effect_class: Effect class to instantiate
+        width: Grid width
+        height: Grid height
+        frames: Frames to render for the timing
+        seed: Seed for the random module
+        **kwargs: Additional arguments for the effect
+
+    Returns:
+        dict: effect, width, height, frames, fps, us_per_frame, us_per_pixel,
+            alloc_bytes_per_frame
+    """
+    random.seed(seed)
+    config = ZigzagGrid(width=width, height=height)
+    pixels = config.create_pixels(backend=PixelBuffer)
+    clock = SimulatedClock(bpm=BENCH_BPM, fps=BENCH_FPS)
+
+    effect = effect_class(pixels, width, height, config, clock=clock, **kwargs)
+    effect.setup()
+
+    # Warm up (first frames often allocate caches)
+    _render(effect, clock, 2)
+
+    gc.collect()
+    start = ticks()
+    _render(effect, clock, frames)
+    elapsed_us = max(ticks_diff(ticks(), start), 1)
+
+    alloc = _alloc_per_frame(effect, clock, min(frames, ALLOC_FRAMES))
+    effect.cleanup()
+
+    us_per_frame = elapsed_us / frames
+    return {
+        'effect': effect_class.__name__,
+        'width': width,
+        'height': height,
+        'frames': frames,
+        'fps': 1000000 / us_per_frame,
+        'us_per_frame': us_per_frame,
+        'us_per_pixel': us_per_frame / (width * height),
+        'alloc_bytes_per_frame': alloc,
+    }
+
+
+def _frame_per_pixel(pixels, config, color):
+    """One frame the way effects drew before FrameBuffer: LED by LED"""
+    for y in range(config.height):
+        for x in range(config.width):
+            led_id = config.coords_to_id(x, y)
+            if led_id is not None:
+                pixels[led_id] = color
+
+
+def _frame_buffered(pixels, framebuffer, color):
+    """One frame drawn into a FrameBuffer (strip order) and blitted"""
+    for y in range(framebuffer.height):
+        for x in range(framebuffer.width):
+            framebuffer.set_pixel(x, y, color)
+    framebuffer.blit(pixels)
+
+
+def bench_output(width, height, frames=DEFAULT_FRAMES):
+    """
+    Time the output path: per-LED writes against FrameBuffer and blit
+
+    Args:
+        width: Grid width
+        height: Grid height
+        frames: Frames to time each way
+
+    Returns:
+        dict: width, height, frames, per_pixel_us, buffered_us (per frame),
+            speedup
+    """
+    config = ZigzagGrid(width=width, height=height)
+    pixels = config.create_pixels(backend=PixelBuffer)
+    framebuffer = FrameBuffer(width, height, config)
+    color = (10, 20, 30)
+
+    timings = []
+    for draw, target in ((_frame_per_pixel, config), (_frame_buffered, framebuffer)):
+        draw(pixels, target, color)  # Warm up
+        gc.collect()
+        start = ticks()
+        for _ in range(frames):
+            draw(pixels, target, color)
+        timings.append(max(ticks_diff(ticks(), start), 1) / frames)
+
+    return {
+        'width': width,
+        'height': height,
+        'frames': frames,
+        'per_pixel_us': timings[0],
+        'buffered_us': timings[1],
+        'speedup': timings[0] / timings[1],
+    }
+
+
+def format_output_table(results):
+    """Format bench_output() results as a text table"""
+    header = f"{'output path':<24} {'grid':>7} {'per-LED us':>11} {'buffered us':>12} {'speedup':>8}"
+    lines = [header, "-" * len(header)]
+    for result in results:
+        grid = f"{result['width']}x{result['height']}"
+        lines.append(f"{'FrameBuffer.blit':<24} {grid:>7} {result['per_pixel_us']:>11.0f} "
+                     f"{result['buffered_us']:>12.0f} {result['speedup']:>7.2f}x")
+    return "\n".join(lines)
+
+
+def run_benchmarks(classes=None, grids=GRID_SIZES, frames=DEFAULT_FRAMES, seed=BENCH_SEED, verbose=False):
+    """
+    Benchmark effects across grid sizes
+
+    Args:
+        classes: Effect classes (default: everything in cratelight.effects)
+        grids: Sequence of (width, height)
+        frames: Frames per effect and grid
+        seed: Seed for the random module
+        verbose: Print each result as it completes
+
+    Returns:
+        list: One dict per (effect, grid), see bench_effect()
+    """
+    if classes is None:
+        classes = effect_classes()
+
+    results = []
+    for width, height in grids:
+        for effect_class in classes:
+            result = bench_effect(effect_class, width, height, frames, seed)
+            results.append(result)
+            if verbose:
+                print(format_row(result))
+    return results
+
+
+def format_row(result):
+    """Format one benchmark result as a table row"""
+    alloc = result['alloc_bytes_per_frame']
+    alloc_text = "n/a" if alloc is None else f"{alloc:.0f}"
+    grid = f"{result['width']}x{result['height']}"
+    return (f"{result['effect']:<24} {grid:>7} {result['fps']:>10.1f} "
+            f"{result['us_per_pixel']:>10.3f} {alloc_text:>12}")
+
+
+def format_table(results):
+    """Format benchmark results as a text table"""
+    header = f"{'effect':<24} {'grid':>7} {'fps':>10} {'us/pixel':>10} {'alloc B/frm':>12}"
+    lines = [header, "-" * len(header)]
+    lines.extend(format_row(result) for result in results)
+    return "\n".join(lines)
+
+
+def print_table(results):
+    """Print benchmark results as a text table"""
+    print(format_table(results))
+
+
+def to_json(results):
+    """
+    Serialize benchmark results with the interpreter they ran on
+
+    Returns:
+        str: JSON document {"implementation", "version", "results"}
+    """
+    import json
+
+    return json.dumps({
+        'implementation': sys.implementation.name,
+        'version': ".".join(str(part) for part in sys.implementation.version[:3]),
+        'results': results,
+    }, indent=2)
+
+
+def _parse_grids(text):
+    """Parse "24x12,64x32" into ((24, 12), (64, 32))"""
+    grids = []
+    for item in text.split(","):
+        width, height = item.lower().split("x")
+        grids.append((int(width), int(height)))
+    return tuple(grids)
+
+
+def main(argv=None):
+    """Command line entry point (CPython)"""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m cratelight.bench",
+                                     description="Benchmark the built-in effects headlessly")
+    parser.add_argument("--frames", type=int, default=DEFAULT_FRAMES,
+                        help=f"frames per effect and grid (default {DEFAULT_FRAMES})")
+    parser.add_argument("--grids", type=_parse_grids, default=GRID_SIZES,
+                        help="comma separated WIDTHxHEIGHT list (default 24x12,32x8,64x32,128x64)")
+    parser.add_argument("--effects", default=None,
+                        help="comma separated effect class names (default: all)")
+    parser.add_argument("--seed", type=int, default=BENCH_SEED, help="random seed")
+    parser.add_argument("--json", metavar="PATH", default=None,
+                        help="also write results as JSON ('-' for stdout only)")
+    args = parser.parse_args(argv)
+
+    classes = None
+    if args.effects:
+        names = args.effects.split(",")
+        for name in names:
+            if name not in effects.__all__:
+                parser.error(f"unknown effect '{name}'")
+        classes = [getattr(effects, name) for name in names]
+
+    if args.json == "-":
+        print(to_json(run_benchmarks(classes, args.grids, args.frames, args.seed)))
+        return
+
+    print(format_table([]))
+    results = run_benchmarks(classes, args.grids, args.frames, args.seed, verbose=True)
+    print()
+    print(format_output_table([bench_output(width, height, args.frames)
+                               for width, height in args.grids]))
+    if args.json:
+        with open(args.json, "w") as f:
+            f.write(to_json(results))
+        print(f"Wrote {args.json}")
+
+
+if __name__ == "__main__":
+    main()
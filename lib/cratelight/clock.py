@@ -1,15 +1,26 @@
 """Clock and timing synchronization for LED effects"""
 
-import time
-import digitalio
+try:
+    import digitalio
+except ImportError:
+    from .headless import digitalio
+
+from .timesource import SYSTEM_TIME, VirtualTime
 
 
 class ClockSource:
-    """Base class for timing/clock sources that effects can sync to"""
+    """
+    Base class for timing/clock sources that effects can sync to
+
+    Clocks read time from self.time_source (a TimeSource), which is the wall
+    clock unless a VirtualTime is passed in.
+    """
+
+    time_source = SYSTEM_TIME
 
     def get_time(self):
         """Return current time in seconds"""
-        return time.monotonic()
+        return self.time_source.monotonic()
 
     def get_phase(self):
         """Return current phase (0.0 to 1.0) within the current beat/cycle"""
@@ -41,7 +52,7 @@ class BPMClock(ClockSource):
         bpm = clock.get_bpm()
     """
 
-    def __init__(self, pin, default_bpm=60, pull=digitalio.Pull.DOWN, output_pin=None):
+    def __init__(self, pin, default_bpm=60, pull=digitalio.Pull.DOWN, output_pin=None, time_source=None):
         """
         Initialize BPM clock
 
@@ -50,7 +61,10 @@ class BPMClock(ClockSource):
             default_bpm: Default BPM before first pulse detected
             pull: Pull direction for input (Pull.DOWN or Pull.UP)
             output_pin: Optional GPIO pin to echo BPM pulses to
+            time_source: TimeSource to read time from (default: wall clock)
         """
+        if time_source is not None:
+            self.time_source = time_source
         self.bpm_input = digitalio.DigitalInOut(pin)
         self.bpm_input.direction = digitalio.Direction.INPUT
         self.bpm_input.pull = pull
@@ -90,7 +104,7 @@ class BPMClock(ClockSource):
 
         # Check for timeout - reset to default if no pulse for too long
         if self.last_pulse_time is not None:
-            time_since_pulse = time.monotonic() - self.last_pulse_time
+            time_since_pulse = self.time_source.monotonic() - self.last_pulse_time
             if time_since_pulse > self.timeout_seconds:
                 # Reset to default BPM and clear history
                 self.bpm = self.default_bpm
@@ -99,7 +113,7 @@ class BPMClock(ClockSource):
 
         # Handle output pulse timing
         if self.bpm_output and self.output_pulse_time:
-            if time.monotonic() - self.output_pulse_time > self.output_pulse_duration:
+            if self.time_source.monotonic() - self.output_pulse_time > self.output_pulse_duration:
                 self.bpm_output.value = False
                 self.output_pulse_time = None
 
@@ -115,7 +129,7 @@ class BPMClock(ClockSource):
 
     def _on_pulse(self):
         """Called when a pulse is detected"""
-        now = time.monotonic()
+        now = self.time_source.monotonic()
         self.pulse_this_frame = True  # Set flag for this frame
 
         if self.last_pulse_time is not None:
@@ -173,7 +187,7 @@ class BPMClock(ClockSource):
         if self.last_pulse_time is None:
             return 0.0
 
-        time_since_pulse = time.monotonic() - self.last_pulse_time
+        time_since_pulse = self.time_source.monotonic() - self.last_pulse_time
 
         # Use the median period directly for phase calculation
         # This locks phase to actual pulse intervals, not smoothed BPM
@@ -199,7 +213,7 @@ class BPMClock(ClockSource):
         """Get time in seconds since last pulse"""
         if self.last_pulse_time is None:
             return 0.0
-        return time.monotonic() - self.last_pulse_time
+        return self.time_source.monotonic() - self.last_pulse_time
 
     def beat_occurred(self):
         """Check if a beat occurred this frame (after calling update())"""
@@ -217,15 +231,18 @@ class FixedBPMClock(ClockSource):
             print("Beat!")
     """
 
-    def __init__(self, bpm=60):
+    def __init__(self, bpm=60, time_source=None):
         """
         Initialize fixed BPM clock
 
         Args:
             bpm: Beats per minute (fixed)
+            time_source: TimeSource to read time from (default: wall clock)
         """
+        if time_source is not None:
+            self.time_source = time_source
         self.bpm = bpm
-        self.start_time = time.monotonic()
+        self.start_time = self.time_source.monotonic()
         self.last_beat_number = -1
         self.beat_this_frame = False
 
@@ -234,7 +251,7 @@ class FixedBPMClock(ClockSource):
         self.beat_this_frame = False
 
         # Calculate which beat number we're currently in
-        elapsed = time.monotonic() - self.start_time
+        elapsed = self.time_source.monotonic() - self.start_time
         beat_period = 60.0 / self.bpm
         current_beat_number = int(elapsed / beat_period)
 
@@ -257,7 +274,7 @@ class FixedBPMClock(ClockSource):
 
     def get_phase(self):
         """Get current phase within beat (0.0 to 1.0)"""
-        elapsed = time.monotonic() - self.start_time
+        elapsed = self.time_source.monotonic() - self.start_time
         beat_period = 60.0 / self.bpm
         phase = (elapsed / beat_period) % 1.0
         return phase
@@ -273,19 +290,22 @@ class ManualClock(ClockSource):
         phase = clock.get_phase()
     """
 
-    def __init__(self, default_bpm=60):
+    def __init__(self, default_bpm=60, time_source=None):
         """
         Initialize manual clock
 
         Args:
             default_bpm: Default BPM before first beat
+            time_source: TimeSource to read time from (default: wall clock)
         """
+        if time_source is not None:
+            self.time_source = time_source
         self.bpm = default_bpm
         self.last_beat_time = None
 
     def trigger_beat(self):
         """Manually trigger a beat"""
-        now = time.monotonic()
+        now = self.time_source.monotonic()
         if self.last_beat_time is not None:
             period = now - self.last_beat_time
             if period > 0:
@@ -301,7 +321,50 @@ class ManualClock(ClockSource):
         if self.last_beat_time is None:
             return 0.0
 
-        time_since_beat = time.monotonic() - self.last_beat_time
+        time_since_beat = self.time_source.monotonic() - self.last_beat_time
         beat_period = 60.0 / self.bpm
         phase = (time_since_beat / beat_period) % 1.0
         return phase
+
+
+class SimulatedClock(FixedBPMClock):
+    """
+    FixedBPMClock on VirtualTime that steps one frame per update()
+
+    Time comes from the frame count instead of the wall clock, so an effect
+    sees the same beat and phase sequence on every run, however fast or slow
+    the frames are rendered. Used for benchmarks and headless captures.
+    Loops that pace frames themselves (EffectManager, Effect.run) pick up
+    the same VirtualTime through time_source, so they don't wait either.
+
+    Example:
+        clock = SimulatedClock(bpm=120, fps=30)
+        effect = WaveEffect(pixels, 32, 8, config, clock=clock)
+        for _ in range(300):  # exactly 10 simulated seconds
+            clock.update()
+            effect.update()
+    """
+
+    def __init__(self, bpm=120, fps=30, start_time=0.0, time_source=None):
+        """
+        Initialize simulated clock
+
+        Args:
+            bpm: Beats per minute (fixed)
+            fps: Simulated frames per second (time step per update())
+            start_time: Time reported before the first update()
+            time_source: VirtualTime to step (default: a new one at start_time)
+        """
+        if fps <= 0:
+            raise ValueError(f"fps must be positive, got {fps}")
+
+        super().__init__(bpm, time_source if time_source is not None else VirtualTime(start_time))
+        self.fps = fps
+        self.frame = -1
+
+    def update(self):
+        """Advance one frame and update beat detection"""
+        self.frame += 1
+        # Multiply instead of accumulating, so frame times don't drift
+        self.time_source.sleep_until(self.start_time + self.frame / self.fps)
+        super().update()
@@ -0,0 +1,82 @@
+"""Output color correction: gamma, white balance and brightness lookup tables"""
+
+# bytes.translate() applies a 256-entry table in C (CPython); MicroPython lacks it
+_HAS_TRANSLATE = hasattr(bytes, "translate")
+
+
+class ColorCorrection:
+    """
+    Gamma and white balance for the output stage
+
+    Combined with the master brightness into one 256-entry table per channel,
+    applied once per frame to the whole buffer when it is pushed to the strip.
+    Effects keep working in plain 0-255 RGB.
+
+    Usage:
+        config = ZigzagGrid(pin=board.GP2, width=32, height=8, brightness=0.3)
+        config.color_correction = ColorCorrection(gamma=2.2, white_balance=(1.0, 0.85, 0.7))
+        pixels = config.create_pixels()  # NeoPixel runs at brightness 1.0
+    """
+
+    def __init__(self, gamma=2.2, white_balance=(1.0, 1.0, 1.0)):
+        """
+        Initialize color correction
+
+        Args:
+            gamma: Gamma exponent (1.0 = no correction)
+            white_balance: (R, G, B) channel gains, 0.0 to 1.0
+        """
+        if gamma <= 0:
+            raise ValueError(f"gamma must be positive, got {gamma}")
+        for gain in white_balance:
+            if not 0.0 <= gain <= 1.0:
+                raise ValueError(f"white_balance gains must be between 0.0 and 1.0, got {white_balance}")
+
+        self.gamma = gamma
+        self.white_balance = tuple(white_balance)
+
+    def build_tables(self, brightness=1.0):
+        """
+        Build the per-channel lookup tables
+
+        Args:
+            brightness: Master brightness (0.0 to 1.0)
+
+        Returns:
+            tuple: (red, green, blue) 256-byte tables
+        """
+        curve = [((value / 255.0) ** self.gamma) * brightness for value in range(256)]
+        return tuple(
+            bytes(int(level * gain * 255 + 0.5) for level in curve)
+            for gain in self.white_balance
+        )
+
+
+def apply_tables(src, tables):
+    """
+    Run flattened RGB bytes through per-channel lookup tables
+
+    Args:
+        src: bytes/bytearray of RGB triples
+        tables: (red, green, blue) 256-byte tables
+
+    Returns:
+        bytearray: Corrected RGB triples
+    """
+    red, green, blue = tables
+
+    if _HAS_TRANSLATE:
+        if red == green == blue:
+            return bytearray(src.translate(red))
+        out = bytearray(len(src))
+        out[0::3] = src[0::3].translate(red)
+        out[1::3] = src[1::3].translate(green)
+        out[2::3] = src[2::3].translate(blue)
+        return out
+
+    out = bytearray(len(src))
+    for i in range(0, len(src), 3):
+        out[i] = red[src[i]]
+        out[i + 1] = green[src[i + 1]]
+        out[i + 2] = blue[src[i + 2]]
+    return out
@@ -1,6 +1,12 @@
 """Base class for creating custom LED effects"""
 
-import time
+from .framebuffer import FrameBuffer
+from .hooks import HookRegistry
+from .mapping import NO_LED, build_lookup_tables
+from .scheduler import FrameScheduler
+from .stats import FrameStats, ticks, ticks_diff
+from .timesource import SYSTEM_TIME
+
 
 class Effect:
     """
@@ -12,6 +18,10 @@ class Effect:
     3. Implement the update() method for each animation frame
     4. Optionally implement cleanup() for teardown
 
+    Effects that set use_framebuffer = True draw into self.framebuffer in
+    logical (x, y) space instead of writing self.pixels; show() pushes the
+    finished frame to the strip in one bulk write.
+
     Example:
         class MyEffect(Effect):
             def setup(self):
@@ -23,6 +33,13 @@ class Effect:
                 return self.counter < 100  # Return False to stop
     """
 
+    # Set True in subclasses that draw into self.framebuffer
+    use_framebuffer = False
+
+    # Detail levels update() can render at (0 = full detail, higher is
+    # cheaper); the QualityGovernor picks one with set_quality() under load
+    quality_levels = 1
+
     def __init__(self, pixels, width=24, height=12, hardware_config=None, clock=None):
         """
         Initialize the effect
@@ -40,6 +57,36 @@ class Effect:
         self.hardware_config = hardware_config
         self.clock = clock
         self.frame_count = 0
+        self.quality = 0
+        self.frame_stats = None  # FrameStats filled in by run()
+        self.hooks = HookRegistry()
+        self._active_hooks = None
+        self._init_lookup_tables()
+        self.framebuffer = FrameBuffer(width, height, hardware_config) if self.use_framebuffer else None
+
+    def _init_lookup_tables(self):
+        """
+        Set up id_by_coord / coords_by_id for this effect's grid
+
+        Per-pixel loops should index these directly:
+            led_id = self.id_by_coord[y * self.width + x]
+            if led_id != NO_LED: ...
+        """
+        config = self.hardware_config
+        if config and config.width == self.width and config.height == self.height:
+            # Share the tables compiled by the hardware config
+            self.id_by_coord = config.id_by_coord
+            self.coords_by_id = config.coords_by_id
+        elif config:
+            self.id_by_coord, self.coords_by_id = build_lookup_tables(
+                self.width, self.height, config.num_leds, config.coords_to_id
+            )
+        else:
+            # Default simple mapping
+            self.id_by_coord, self.coords_by_id = build_lookup_tables(
+                self.width, self.height, self.width * self.height,
+                lambda x, y: y * self.width + x
+            )
 
     def coords_to_id(self, x, y):
         """
@@ -47,13 +94,11 @@ class Effect:
 
         Uses hardware_config if provided, otherwise simple linear mapping
         """
-        if self.hardware_config:
-            return self.hardware_config.coords_to_id(x, y)
-        else:
-            # Default simple mapping
-            if 0 <= x < self.width and 0 <= y < self.height:
-                return y * self.width + x
-            return None
+        if 0 <= x < self.width and 0 <= y < self.height:
+            led_id = self.id_by_coord[y * self.width + x]
+            if led_id != NO_LED:
+                return led_id
+        return None
 
     def id_to_coords(self, led_id):
         """
@@ -61,16 +106,9 @@ class Effect:
 
         Uses hardware_config if provided, otherwise simple linear mapping
         """
-        if self.hardware_config:
-            return self.hardware_config.id_to_coords(led_id)
-        else:
-            # Default simple mapping
-            num_leds = self.width * self.height
-            if 0 <= led_id < num_leds:
-                x = led_id % self.width
-                y = led_id // self.width
-                return (x, y)
-            return None
+        if 0 <= led_id < len(self.coords_by_id):
+            return self.coords_by_id[led_id]
+        return None
 
     def setup(self):
         """
@@ -80,6 +118,15 @@ class Effect:
         """
         pass
 
+    def activate(self):
+        """
+        Called when the effect starts playing, after setup().
+        The EffectManager may run setup() early (prepare_next) while the
+        previous effect is still showing, so state tied to the clock, such
+        as a start time, belongs here. Override this in your effect class.
+        """
+        pass
+
     def update(self):
         """
         Called every frame to update the LED display.
@@ -97,29 +144,153 @@ class Effect:
         """
         pass
 
-    def run(self, fps=30, max_frames=None):
+    def show(self):
+        """Push the current frame to the LEDs"""
+        if self.framebuffer is not None:
+            self.framebuffer.blit(self.pixels)
+        self.pixels.show()
+
+    def add_hook(self, event, callback):
+        """
+        Register a profiling hook for this effect's frames
+
+        Args:
+            event: One of HOOK_EVENTS ("on_frame_start", "on_beat",
+                "on_update_done", "on_show_done", "on_effect_switch")
+            callback: Called with this effect (on_effect_switch gets the
+                previous and the new effect)
+        """
+        self.hooks.add(event, callback)
+
+    def remove_hook(self, event, callback):
+        """Unregister a profiling hook"""
+        self.hooks.remove(event, callback)
+
+    def set_quality(self, level):
+        """
+        Choose a detail level, 0 to quality_levels - 1 (called by the
+        QualityGovernor between frames)
+
+        Override to react to a change (e.g. rebuild tables); update()
+        reads self.quality.
+        """
+        self.quality = level
+
+    def _run_frame(self, stats):
+        """Update and show one frame, recording timings"""
+        start = ticks()
+        should_continue = self.update()
+        update_done = ticks()
+        self.show()
+        stats.record(0, ticks_diff(update_done, start), ticks_diff(ticks(), update_done))
+        self.frame_count += 1
+        return should_continue
+
+    def _run_frame_hooked(self, stats):
+        """_run_frame() with hook dispatch (hook time is not counted in stats)"""
+        hooks = self._active_hooks
+        for hook in hooks['on_frame_start']:
+            hook(self)
+
+        if self.clock and hooks['on_beat'] and self.clock.beat_occurred():
+            for hook in hooks['on_beat']:
+                hook(self)
+
+        start = ticks()
+        should_continue = self.update()
+        update_done = ticks()
+
+        for hook in hooks['on_update_done']:
+            hook(self)
+
+        show_start = ticks()
+        self.show()
+        stats.record(0, ticks_diff(update_done, start), ticks_diff(ticks(), show_start))
+        self.frame_count += 1
+
+        for hook in hooks['on_show_done']:
+            hook(self)
+        return should_continue
+
+    def run(self, fps=30, max_frames=None, policy="skip", busy_wait=0.0, time_source=None):
         """
         Run the effect
 
+        Frame timings are recorded in self.frame_stats; hooks registered
+        with add_hook() before run() are called each frame.
+
         Args:
             fps: Frames per second (default 30)
             max_frames: Maximum frames to run, None for infinite
+            policy: Missed deadline policy, "skip" or "catch_up"
+            busy_wait: Seconds to spin before each deadline (see FrameScheduler)
+            time_source: Time for frame pacing (default: the clock's)
         """
-        self.setup()
-        frame_delay = 1.0 / fps
+        scheduler, frame, stats = self._start_run(fps, policy, busy_wait, time_source)
+
+        try:
+            while True:
+                if max_frames and self.frame_count >= max_frames:
+                    break
+
+                should_continue = frame(stats)
+
+                if should_continue is False:
+                    break
+
+                scheduler.wait()
+        finally:
+            self.cleanup()
+
+    async def run_async(self, fps=30, max_frames=None, policy="skip", time_source=None):
+        """
+        Run the effect as an asyncio task
+
+        Like run(), but other tasks on the event loop (network control,
+        serial input) run while it waits for each frame deadline, and can
+        change the effect's parameters between frames without locks.
+
+        Args:
+            fps: Frames per second (default 30)
+            max_frames: Maximum frames to run, None for infinite
+            policy: Missed deadline policy, "skip" or "catch_up"
+            time_source: Time for frame pacing (default: the clock's)
+
+        Usage:
+            asyncio.run(effect.run_async(fps=30))
+        """
+        scheduler, frame, stats = self._start_run(fps, policy, 0.0, time_source)
 
         try:
             while True:
                 if max_frames and self.frame_count >= max_frames:
                     break
 
-                should_continue = self.update()
-                self.pixels.show()
-                self.frame_count += 1
+                should_continue = frame(stats)
 
                 if should_continue is False:
                     break
 
-                time.sleep(frame_delay)
+                await scheduler.wait_async()
         finally:
             self.cleanup()
+
+    def _start_run(self, fps, policy, busy_wait, time_source=None):
+        """
+        Set up the effect for a run loop
+
+        Returns:
+            tuple: (FrameScheduler, frame function, FrameStats)
+        """
+        self.setup()
+        self.activate()
+        if time_source is None:
+            time_source = getattr(self.clock, 'time_source', SYSTEM_TIME)
+        scheduler = FrameScheduler(fps, policy=policy, busy_wait=busy_wait,
+                                   time_source=time_source)
+        stats = FrameStats(budget_us=int(scheduler.frame_period * 1000000))
+        self.frame_stats = stats
+        self._active_hooks = self.hooks.active()
+        frame = self._run_frame if self._active_hooks is None else self._run_frame_hooked
+        scheduler.start()
+        return scheduler, frame, stats
@@ -1,6 +1,13 @@
 """Effect manager for cycling through multiple effects synced to BPM"""
 
-import time
+from .backends import OffscreenPixels
+from .hooks import HookRegistry
+from .scheduler import FrameScheduler
+from .stats import DEFAULT_WINDOW, FrameStats, ticks, ticks_diff
+from .timesource import SYSTEM_TIME
+
+# Frames the current effect runs before the next one is prepared
+PREPARE_AFTER_FRAMES = 2
 
 
 class EffectManager:
@@ -14,7 +21,9 @@ class EffectManager:
         manager.run(fps=30)
     """
 
-    def __init__(self, pixels, width, height, hardware_config=None, clock=None, debug=False):
+    def __init__(self, pixels, width, height, hardware_config=None, clock=None, debug=False,
+                 collect_stats=True, stats_window=DEFAULT_WINDOW, prepare_next=False,
+                 time_source=None):
         """
         Initialize effect manager
 
@@ -25,6 +34,18 @@ class EffectManager:
             hardware_config: Hardware configuration object
             clock: Clock source (BPMClock, FixedBPMClock, etc.)
             debug: Enable debug output (default False)
+            collect_stats: Time each frame stage per effect (see stats())
+            stats_window: Frames kept per effect for the timing statistics
+            prepare_next: Create and set up the next effect in spare frame time
+                while the current one runs, so the switch frame only has to
+                call update() (needs memory for both effects at once). Without
+                a transition the next effect's setup() draws on the live strip
+                and runs before the current effect's cleanup(), so only turn
+                this on with a transition or for effects whose setup() doesn't
+                touch the pixels. Clock-dependent state should be set in the
+                effect's activate(), which runs at the actual switch
+            time_source: Time for frame pacing and durations (default: the
+                clock's, so a clock on VirtualTime renders the show offline)
         """
         self.pixels = pixels
         self.width = width
@@ -32,8 +53,35 @@ class EffectManager:
         self.hardware_config = hardware_config
         self.clock = clock
         self.debug = debug
+        if time_source is None:
+            time_source = getattr(clock, 'time_source', SYSTEM_TIME)
+        self.time_source = time_source
         self.effects = []  # List of (EffectClass, kwargs) tuples
         self.current_effect_index = 0
+        self.frame_count = 0  # Frames rendered in the current run
+        self.scheduler = None
+        # (start time, frames already run) to continue a frame schedule in the
+        # next run instead of starting a new one now (see render.py)
+        self.schedule_origin = None
+        self.collect_stats = collect_stats
+        self.stats_window = stats_window
+        self.frame_stats = {}  # Effect class name -> FrameStats
+        self.hooks = HookRegistry()
+        self._active_hooks = None
+        self.prepare_next = prepare_next
+        self._prepared = None  # (effect config, effect already set up)
+        self.setup_costs = {}  # Effect class name -> last create + setup() time in seconds
+        self.transition = None
+        self.governor = None
+        self._stages = None  # Two OffscreenPixels render targets when transitions are on
+        self._blend_buf = None
+        self._current_effect = None
+        self._retiring = None  # Finished effect waiting to be transitioned out
+        self._outgoing = None  # Effect being transitioned out
+        self._outgoing_finished = False  # Outgoing effect's update() returned False
+        self._finished_effect = None  # Last effect that ended itself
+        self._transition_start = 0.0
+        self._transition_length = 0.0
 
     def add_effect(self, effect_class, beats=None, duration=None, **kwargs):
         """
@@ -52,6 +100,38 @@ class EffectManager:
             'kwargs': kwargs
         })
 
+    def load_playlist(self, path):
+        """
+        Add the effects listed in a JSON show file (see playlist.load_show)
+
+        Effect classes are named by dotted path and only imported when their
+        entry is about to play, so modules for effects later in the show
+        don't cost boot time or RAM up front.
+
+        Args:
+            path: Path to the show file
+
+        Returns:
+            int: Number of effects added
+
+        Usage:
+            manager.load_playlist("show.json")
+            manager.run(fps=30)
+        """
+        # Imported here so managers without a show file skip json and playlist
+        from .playlist import load_show
+
+        playlist = load_show(path)
+        for entry in playlist:
+            self.effects.append({
+                'class': None,  # Imported by _effect_class() on first use
+                'path': entry['effect'],
+                'beats': entry['beats'],
+                'duration': entry['duration'],
+                'kwargs': entry['args']
+            })
+        return len(playlist)
+
     def repeat_effect(self, effect_class, times=2, beats=None, duration=None, **kwargs):
         """
         Add the same effect multiple times
@@ -79,122 +159,525 @@ class EffectManager:
         for effect_class in effect_classes:
             self.add_effect(effect_class, beats=beats, duration=duration, **kwargs)
 
-    def run(self, fps=30):
-        """Run the effect manager, cycling through effects"""
+    def add_layers(self, layers, beats=None, duration=None):
+        """
+        Add several effects that run at the same time, composited in order
+
+        Args:
+            layers: Sequence of Layer, bottom first
+            beats: Number of beats to run (requires clock)
+            duration: Duration in seconds (alternative to beats)
+        """
+        from .layers import LayerStack
+
+        self.add_effect(LayerStack, beats=beats, duration=duration, layers=layers)
+
+    def set_transition(self, transition):
+        """
+        Blend between effects instead of cutting
+
+        Effects are then rendered into two off-screen buffers: during a
+        transition the old effect keeps running in one while the new one
+        starts in the other, and the transition combines them into the strip.
+
+        Args:
+            transition: Transition instance (Crossfade, Wipe, Dissolve), or
+                None for hard cuts
+        """
+        self.transition = transition
+
+    def set_governor(self, governor):
+        """
+        Adapt effect quality to the frame budget
+
+        Profiling hooks see every frame at full quality, so the governor
+        only acts while no hooks are registered.
+
+        Args:
+            governor: QualityGovernor instance, or None to always render
+                every frame at full quality
+        """
+        self.governor = governor
+
+    def run(self, fps=30, policy="skip", busy_wait=0.0, max_frames=None):
+        """
+        Run the effect manager, cycling through effects
+
+        Frames are paced against one schedule for the whole show, so effect
+        setup time at a switch is absorbed instead of shifting the beat.
+
+        Args:
+            fps: Frames per second (default 30)
+            policy: Missed deadline policy, "skip" or "catch_up"
+            busy_wait: Seconds to spin before each deadline (see FrameScheduler)
+            max_frames: Stop after this many frames (default: run forever)
+        """
         if not self.effects:
             print("No effects added!")
             return
 
-        frame_delay = 1.0 / fps
+        self._start(fps, policy, busy_wait)
+        previous_effect = None
 
-        while True:
-            # Get current effect config
-            effect_config = self.effects[self.current_effect_index]
-
-            # Create effect instance with clock
-            effect = effect_config['class'](
-                self.pixels,
-                self.width,
-                self.height,
-                self.hardware_config,
-                clock=self.clock,
-                **effect_config['kwargs']
-            )
-
-            # Determine how long to run
-            beats = effect_config['beats']
-            duration = effect_config['duration']
-
-            if beats and self.clock:
-                # Run for specified number of beats
-                if self.debug:
-                    print(f"Running {effect.__class__.__name__} for {beats} beats")
-                self._run_effect_beats(effect, beats, fps)
-            elif duration:
-                # Run for specified duration
-                if self.debug:
-                    print(f"Running {effect.__class__.__name__} for {duration}s")
-                self._run_effect_duration(effect, duration, fps)
-            else:
-                # Run until effect returns False
-                if self.debug:
-                    print(f"Running {effect.__class__.__name__} until complete")
-                self._run_effect_until_done(effect, fps)
+        try:
+            while self.effects and not self._finished(max_frames):
+                effect, frames = self._switch_effect(previous_effect)
+                try:
+                    for _ in frames:
+                        if self._finished(max_frames):
+                            break
+                        self.scheduler.wait()
+                finally:
+                    self._retire(effect)
+                previous_effect = effect
+
+                # Move to next effect
+                self.current_effect_index = (self.current_effect_index + 1) % len(self.effects)
+        finally:
+            self._stop()
 
-            # Move to next effect
-            self.current_effect_index = (self.current_effect_index + 1) % len(self.effects)
+    async def run_async(self, fps=30, policy="skip", max_frames=None):
+        """
+        Run the effect manager as an asyncio task
 
-    def _run_effect_beats(self, effect, beats, fps):
-        """Run effect for specified number of beats"""
-        effect.setup()
+        Same show as run(), but the wait for each frame deadline is an
+        asyncio sleep, so network control, serial input or a second output
+        can run as tasks on the same event loop. Everything shares one
+        thread: other tasks may change self.effects, effect parameters or
+        the clock between frames without locks. Playlist changes apply at
+        the next effect switch.
 
-        # Track beats
-        beat_count = 0
+        Args:
+            fps: Frames per second (default 30)
+            policy: Missed deadline policy, "skip" or "catch_up"
+            max_frames: Stop after this many frames (default: run forever)
 
-        try:
-            while beat_count < beats:
-                # Update clock
-                if self.clock:
-                    self.clock.update()
-
-                    # Check if beat occurred this frame
-                    if self.clock.beat_occurred():
-                        beat_count += 1
-                        if self.debug:
-                            print(f"Beat {beat_count}/{beats}, BPM: {self.clock.get_bpm():.1f}")
-
-                # Update effect
-                should_continue = effect.update()
-                self.pixels.show()
-                effect.frame_count += 1
+        Usage:
+            async def main():
+                asyncio.create_task(read_serial_commands(manager))
+                await manager.run_async(fps=30)
+
+            asyncio.run(main())
+        """
+        if not self.effects:
+            print("No effects added!")
+            return
 
-                if should_continue is False:
-                    break
+        self._start(fps, policy, 0.0)
+        previous_effect = None
 
-                time.sleep(1.0 / fps)
+        try:
+            while self.effects and not self._finished(max_frames):
+                effect, frames = self._switch_effect(previous_effect)
+                try:
+                    for _ in frames:
+                        if self._finished(max_frames):
+                            break
+                        await self.scheduler.wait_async()
+                finally:
+                    self._retire(effect)
+                previous_effect = effect
+
+                self.current_effect_index = (self.current_effect_index + 1) % len(self.effects)
         finally:
-            effect.cleanup()
+            self._stop()
+
+    def _start(self, fps, policy, busy_wait):
+        """Create the off-screen stages and the frame schedule for a run"""
+        if self.transition is not None:
+            num_leds = len(self.pixels)
+            self._stages = (OffscreenPixels(num_leds), OffscreenPixels(num_leds))
+            self._blend_buf = bytearray(num_leds * 3)
+            self.transition.prepare(num_leds, self.width, self.height, self.hardware_config)
+
+        self.frame_count = 0
+        self.scheduler = FrameScheduler(fps, policy=policy, busy_wait=busy_wait,
+                                        time_source=self.time_source)
+        if self.schedule_origin is not None:
+            self.scheduler.start(*self.schedule_origin)
+        else:
+            self.scheduler.start()
+
+    def _finished(self, max_frames):
+        """True once a run limited to max_frames has rendered them all"""
+        return max_frames is not None and self.frame_count >= max_frames
+
+    def _stop(self):
+        """Clean up the effects still alive when a run ends"""
+        self._end_transition()
+        if self._retiring is not None:
+            self._retiring.cleanup()
+            self._retiring = None
+        if self._prepared is not None:
+            self._prepared[1].cleanup()
+            self._prepared = None
+
+    def _switch_effect(self, previous_effect):
+        """
+        Start the effect at current_effect_index
 
-    def _run_effect_duration(self, effect, duration, fps):
-        """Run effect for specified duration in seconds"""
+        Returns:
+            tuple: (effect, generator rendering its frames, see _play())
+        """
+        # A transition still running from a very short effect ends here
+        self._end_transition()
+
+        # The playlist may have shrunk since the index was advanced
+        self.current_effect_index %= len(self.effects)
+        effect_config = self.effects[self.current_effect_index]
+
+        # Use the effect prepared during the previous one if it still matches
+        prepared = self._prepared
+        self._prepared = None
+        if prepared is not None and prepared[0] is effect_config:
+            effect = prepared[1]
+        else:
+            effect = self._create_effect(effect_config)
+        effect.activate()
+
+        self._current_effect = effect
+        self._begin_transition(effect)
+
+        stats = self._stats_for(effect)
+        self._active_hooks = self.hooks.active(effect.hooks)
+        if self._active_hooks is not None:
+            for hook in self._active_hooks['on_effect_switch']:
+                hook(previous_effect, effect)
+
+        return effect, self._play(effect, effect_config, stats)
+
+    def _create_effect(self, effect_config):
+        """Create effect instance with clock and run its setup()"""
+        start = self.time_source.monotonic()
+        pixels = self.pixels
+        if self._stages is not None:
+            # Render into whichever buffer the current effect isn't using
+            current = self._current_effect
+            pixels = self._stages[0]
+            if current is not None and current.pixels is pixels:
+                pixels = self._stages[1]
+
+        effect = self._effect_class(effect_config)(
+            pixels,
+            self.width,
+            self.height,
+            self.hardware_config,
+            clock=self.clock,
+            **effect_config['kwargs']
+        )
         effect.setup()
-        start_time = time.monotonic()
+        self.setup_costs[self._effect_name(effect_config)] = self.time_source.monotonic() - start
+        return effect
+
+    def _effect_class(self, effect_config):
+        """Effect class of a playlist entry, importing it on first use"""
+        effect_class = effect_config['class']
+        if effect_class is None:
+            from .playlist import DEFAULT_EFFECT_PACKAGE, import_object, resolve_args
+
+            effect_class = import_object(effect_config['path'], DEFAULT_EFFECT_PACKAGE)
+            effect_config['kwargs'] = resolve_args(effect_config['kwargs'])
+            effect_config['class'] = effect_class
+        return effect_class
+
+    def _effect_name(self, effect_config):
+        """Class name of a playlist entry without importing it"""
+        if effect_config['class'] is None:
+            return effect_config['path'].rsplit(".", 1)[-1]
+        return effect_config['class'].__name__
+
+    def _use_slack(self, effect):
+        """
+        Prepare the next effect if this frame finished early
+
+        Called after each frame is shown, before waiting for the next deadline.
+        Constructing and setting up the next effect here moves the cost of a
+        heavy setup() (text renderers, seeded boards) away from the switch.
+        Waits for a frame with enough slack for the last measured setup cost;
+        setups longer than a whole frame go ahead at the first spare moment,
+        since a late frame mid-effect is better than one on the downbeat.
+        """
+        if (self._prepared is not None or not self.prepare_next
+                or self._outgoing is not None
+                or effect.frame_count < PREPARE_AFTER_FRAMES):
+            return
 
-        try:
-            while time.monotonic() - start_time < duration:
-                if self.clock:
-                    self.clock.update()
+        next_config = self.effects[(self.current_effect_index + 1) % len(self.effects)]
+        cost = self.setup_costs.get(self._effect_name(next_config), 0.0)
+        if cost >= self.scheduler.frame_period:
+            cost = 0.0
+        if self.scheduler.slack() > cost:
+            self._prepared = (next_config, self._create_effect(next_config))
+
+    def _now(self):
+        """Current show time (the clock's, so simulated clocks work too)"""
+        if self.clock:
+            return self.clock.get_time()
+        return self.time_source.monotonic()
+
+    def _retire(self, effect):
+        """Clean up a finished effect, or keep it running for the transition"""
+        if self._stages is None:
+            effect.cleanup()
+        else:
+            self._retiring = effect
+
+    def _begin_transition(self, effect):
+        """Route the new effect's frames to the strip, transitioning from the last one"""
+        finished = self._finished_effect
+        self._finished_effect = None
+        if self._stages is None:
+            return
 
-                should_continue = effect.update()
+        effect.pixels.presenter = self._present
+        outgoing = self._retiring
+        self._retiring = None
+        if outgoing is None:
+            return
+
+        outgoing.pixels.presenter = None
+        self._outgoing = outgoing
+        self._outgoing_finished = outgoing is finished
+        self._transition_start = self._now()
+        bpm = self.clock.get_bpm() if self.clock else 60.0
+        self._transition_length = self.transition.length(bpm)
+
+    def _end_transition(self):
+        """Finish the running transition, cleaning up the old effect"""
+        if self._outgoing is not None:
+            self._outgoing.cleanup()
+            self._outgoing = None
+
+    def _present(self, stage):
+        """
+        Push the current effect's off-screen frame to the strip
+
+        Called from the effect's show(). While a transition runs, the
+        outgoing effect renders a frame too and the two are blended, so its
+        cost shows up in the incoming effect's show timing.
+        """
+        outgoing = self._outgoing
+        if outgoing is not None:
+            progress = (self._now() - self._transition_start) / self._transition_length
+            if progress < 1.0:
+                # A finished effect (GameOfLife, PixelRandomFill) is frozen
+                # on its last frame for the rest of the transition
+                if not self._outgoing_finished:
+                    self._outgoing_finished = outgoing.update() is False
+                    outgoing.show()
+                    outgoing.frame_count += 1
+                self.transition.render(self._blend_buf, outgoing.pixels.buf, stage.buf, progress)
+                self.pixels[:] = self._blend_buf
                 self.pixels.show()
-                effect.frame_count += 1
+                return
+            self._end_transition()
 
-                if should_continue is False:
-                    break
+        self.pixels[:] = stage.buf
+        self.pixels.show()
 
-                time.sleep(1.0 / fps)
-        finally:
-            effect.cleanup()
+    def add_hook(self, event, callback):
+        """
+        Register a profiling hook for every effect the manager runs
 
-    def _run_effect_until_done(self, effect, fps):
-        """Run effect until it returns False"""
-        effect.setup()
+        Args:
+            event: One of HOOK_EVENTS ("on_frame_start", "on_beat",
+                "on_update_done", "on_show_done", "on_effect_switch")
+            callback: Called with the effect (on_effect_switch gets the
+                previous and the new effect)
+        """
+        self.hooks.add(event, callback)
 
-        try:
-            while True:
-                if self.clock:
-                    self.clock.update()
+    def remove_hook(self, event, callback):
+        """Unregister a profiling hook"""
+        self.hooks.remove(event, callback)
 
-                should_continue = effect.update()
-                self.pixels.show()
-                effect.frame_count += 1
+    def stats(self):
+        """
+        Frame timing statistics for each effect that has run
 
-                if should_continue is False:
-                    break
+        Effects are keyed by class name, so repeats of the same class share
+        one entry. Compare 'frame' p95/max and 'over_budget' against the
+        frame budget (1/fps) to find the effect that drops frames.
 
-                time.sleep(1.0 / fps)
-        finally:
-            effect.cleanup()
+        Returns:
+            dict: {effect name: FrameStats.summary()}
+        """
+        return {name: stats.summary() for name, stats in self.frame_stats.items()}
+
+    def reset_stats(self):
+        """Clear all collected frame timing statistics"""
+        self.frame_stats = {}
+
+    def _stats_for(self, effect):
+        """Get (or create) the FrameStats for an effect, None when disabled"""
+        if not self.collect_stats:
+            return None
+
+        name = effect.__class__.__name__
+        stats = self.frame_stats.get(name)
+        if stats is None:
+            budget_us = None
+            if self.scheduler is not None:
+                budget_us = int(self.scheduler.frame_period * 1000000)
+            stats = FrameStats(self.stats_window, budget_us)
+            self.frame_stats[name] = stats
+        return stats
+
+    def _frame_body(self, effect):
+        """Pick the frame function for an effect (hook-free if possible)"""
+        # Re-snapshot after setup(), which may have registered effect hooks
+        self._active_hooks = self.hooks.active(effect.hooks)
+        if self._active_hooks is not None:
+            return self._render_frame_hooked
+        if self.governor is not None:
+            self.governor.start(effect, int(self.scheduler.frame_period * 1000000))
+            return self._render_frame_governed
+        return self._render_frame
+
+    def _render_frame(self, effect, stats):
+        """
+        Render one frame: update clock, update effect, show
+
+        Returns:
+            Result of effect.update() (False ends the effect)
+        """
+        clock = self.clock
+
+        if stats is None:
+            if clock:
+                clock.update()
+            should_continue = effect.update()
+            effect.show()
+            effect.frame_count += 1
+            return should_continue
+
+        start = ticks()
+        if clock:
+            clock.update()
+        clock_done = ticks()
+        should_continue = effect.update()
+        update_done = ticks()
+        effect.show()
+        show_done = ticks()
+        effect.frame_count += 1
+
+        stats.record(ticks_diff(clock_done, start),
+                     ticks_diff(update_done, clock_done),
+                     ticks_diff(show_done, update_done))
+        return should_continue
+
+    def _render_frame_governed(self, effect, stats):
+        """_render_frame() under the QualityGovernor, which may skip frames without a beat"""
+        governor = self.governor
+        clock = self.clock
+
+        start = ticks()
+        if clock:
+            clock.update()
+        clock_done = ticks()
+
+        if governor.skipping and not (clock and clock.beat_occurred()) and governor.skip_frame():
+            return True
+
+        should_continue = effect.update()
+        update_done = ticks()
+        effect.show()
+        show_done = ticks()
+        effect.frame_count += 1
+
+        governor.record(ticks_diff(show_done, clock_done))
+        if stats is not None:
+            stats.record(ticks_diff(clock_done, start),
+                         ticks_diff(update_done, clock_done),
+                         ticks_diff(show_done, update_done))
+        return should_continue
+
+    def _render_frame_hooked(self, effect, stats):
+        """_render_frame() with hook dispatch (hook time is not counted in stats)"""
+        hooks = self._active_hooks
+        clock = self.clock
+
+        for hook in hooks['on_frame_start']:
+            hook(effect)
+
+        start = ticks()
+        if clock:
+            clock.update()
+        clock_done = ticks()
+
+        if clock and clock.beat_occurred():
+            for hook in hooks['on_beat']:
+                hook(effect)
+
+        update_start = ticks()
+        should_continue = effect.update()
+        update_done = ticks()
+
+        for hook in hooks['on_update_done']:
+            hook(effect)
+
+        show_start = ticks()
+        effect.show()
+        show_done = ticks()
+        effect.frame_count += 1
+
+        if stats is not None:
+            stats.record(ticks_diff(clock_done, start),
+                         ticks_diff(update_done, update_start),
+                         ticks_diff(show_done, show_start))
+
+        for hook in hooks['on_show_done']:
+            hook(effect)
+        return should_continue
+
+    def _play(self, effect, effect_config, stats=None):
+        """
+        Render an effect (already set up) for its beats or duration, or until done
+
+        A generator: it yields after every frame that needs a wait before the
+        next one, so run() and run_async() share the loop and only differ
+        in how they wait for the deadline.
+        """
+        beats = effect_config['beats']
+        duration = effect_config['duration']
+        clock = self.clock
+
+        if self.debug:
+            name = effect.__class__.__name__
+            if beats and clock:
+                print(f"Running {name} for {beats} beats")
+            elif duration:
+                print(f"Running {name} for {duration}s")
+            else:
+                print(f"Running {name} until complete")
+
+        render = self._frame_body(effect)
+        beat_count = 0
+        start_time = self.time_source.monotonic()
+
+        while True:
+            should_continue = render(effect, stats)
+            self.frame_count += 1
+
+            # Check if beat occurred this frame
+            if clock and clock.beat_occurred():
+                beat_count += 1
+                if self.debug and beats:
+                    print(f"Beat {beat_count}/{beats}, BPM: {clock.get_bpm():.1f}")
+
+            if should_continue is False:
+                self._finished_effect = effect
+                return
+
+            self._use_slack(effect)
+            yield
+
+            if beats and clock:
+                if beat_count >= beats:
+                    return
+            elif duration:
+                if self.time_source.monotonic() - start_time >= duration:
+                    return
 
 
 class BPMSyncedEffect:
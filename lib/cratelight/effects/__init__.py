@@ -1,16 +1,43 @@
 """Pre-built LED effects for CrateLight"""
 
-from .pulse import PulseOnBeat
-from .wave import WaveEffect
-from .flash import FlashOnBeat, StrobeEffect
-from .rainbow import RainbowChase
-from .game_of_life import GameOfLife
-from .scrolling import StaticText, ScrollingText, BlinkingText, CountdownEffect
-from .random_fill import RandomFill, PixelRandomFill, RandomStrobe, DirectionalFillOnBeat
-from .color_scroll import RainbowScroll
-from .sparkle import SparkleEffect
-from .knightrider import KnightRiderEffect
-from .rings import ConcentricRingsEffect
+# Effect modules are imported on first access, so a show only loads the
+# effects it actually plays (see EffectManager.load_playlist).
+
+# Effect class -> module that defines it
+_LAZY = {
+    'PulseOnBeat': 'pulse',
+    'WaveEffect': 'wave',
+    'FlashOnBeat': 'flash',
+    'StrobeEffect': 'flash',
+    'RainbowChase': 'rainbow',
+    'GameOfLife': 'game_of_life',
+    'StaticText': 'scrolling',
+    'ScrollingText': 'scrolling',
+    'BlinkingText': 'scrolling',
+    'CountdownEffect': 'scrolling',
+    'RandomFill': 'random_fill',
+    'PixelRandomFill': 'random_fill',
+    'RandomStrobe': 'random_fill',
+    'DirectionalFillOnBeat': 'random_fill',
+    'RainbowScroll': 'color_scroll',
+    'SparkleEffect': 'sparkle',
+    'KnightRiderEffect': 'knightrider',
+    'ConcentricRingsEffect': 'rings',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module '{__name__}' has no attribute '{name}'")
+    value = getattr(__import__(f"{__name__}.{module_name}", None, None, ["__name__"]), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return __all__
+
 
 __all__ = [
     'PulseOnBeat',
@@ -1,6 +1,7 @@
 """Scrolling color effects"""
 
 import random
+from ..bake import BakedEffect
 from ..effect_base import Effect
 from ..effect_manager import BPMSyncedEffect
 from ..colors import COLORS
@@ -12,7 +13,7 @@ RAINBOW_SCROLL_HORIZONTAL_COLOR_STEP = 12  # Color gradient spread for horizonta
 RAINBOW_SCROLL_BASE_BPM = 120.0  # Baseline BPM for speed scaling
 
 
-class RainbowScroll(Effect, BPMSyncedEffect):
+class RainbowScroll(Effect, BPMSyncedEffect, BakedEffect):
     """
     Smooth rainbow scroll effect - SYNCED TO BEAT PHASE!
     Movement is now locked to the beat for perfect timing
@@ -22,20 +23,27 @@ class RainbowScroll(Effect, BPMSyncedEffect):
         manager.add_effect(RainbowScroll, beats=16, axis="vertical", speed=1.0, direction=-1)
         manager.add_effect(RainbowScroll, beats=16, axis="random", speed=1.0)  # Random axis each time
         manager.add_effect(RainbowScroll, beats=16, axis="horizontal", direction="random")  # Random dir
+        manager.add_effect(RainbowScroll, beats=16, bake=64)  # Pre-rendered, 64 steps per color cycle
     """
 
+    use_framebuffer = True
+
     def __init__(self, pixels, width=24, height=12, hardware_config=None, clock=None,
-                 axis="horizontal", direction=1, speed=1.0):
+                 axis="horizontal", direction=1, speed=1.0, bake=None, bake_blend=False):
         """
         Args:
             axis: "horizontal", "vertical", or "random"
             direction: 1 for right/up, -1 for left/down, or "random"
             speed: Scroll speed multiplier (cycles per beat)
+            bake: Frames to pre-render over one full color cycle at setup(),
+                None to render live
+            bake_blend: Blend neighbouring baked frames
         """
         super().__init__(pixels, width, height, hardware_config, clock)
         self.axis = axis.lower()
         self.direction = direction
         self.speed = speed
+        self.init_bake(bake, bake_blend)
 
     def setup(self):
         self.beat_count = 0
@@ -53,6 +61,26 @@ class RainbowScroll(Effect, BPMSyncedEffect):
         else:
             self.active_direction = self.direction
 
+        self.setup_bake()
+
+    def bake_cycle(self):
+        # The pattern repeats every 256 steps of color shift
+        return 256
+
+    def render_at(self, shift):
+        """Draw the scroll shifted by a color offset (0-255)"""
+        framebuffer = self.framebuffer
+        for y in range(self.height):
+            for x in range(self.width):
+                if self.active_axis == "vertical":
+                    # Vertical scroll - colors change by row
+                    color_pos = int((y * RAINBOW_SCROLL_VERTICAL_COLOR_STEP + shift) % 256)
+                else:
+                    # Horizontal scroll - colors change by column
+                    color_pos = int((x * RAINBOW_SCROLL_HORIZONTAL_COLOR_STEP + shift) % 256)
+
+                framebuffer.set_pixel(x, y, wheel(color_pos))
+
     def update(self):
         # Track beats for full cycle offset
         if self.beat_occurred():
@@ -64,19 +92,11 @@ class RainbowScroll(Effect, BPMSyncedEffect):
         self.offset = (self.beat_count + phase) * self.speed * 256 / 16  # 16 pixels per full color cycle
 
         # Fill entire grid
-        for y in range(self.height):
-            for x in range(self.width):
-                if self.active_axis == "vertical":
-                    # Vertical scroll - colors change by row
-                    color_pos = int((y * RAINBOW_SCROLL_VERTICAL_COLOR_STEP + self.offset * self.active_direction) % 256)
-                else:
-                    # Horizontal scroll - colors change by column
-                    color_pos = int((x * RAINBOW_SCROLL_HORIZONTAL_COLOR_STEP + self.offset * self.active_direction) % 256)
-
-                color = wheel(color_pos)
-                led_id = self.coords_to_id(x, y)
-                if led_id is not None:
-                    self.pixels[led_id] = color
+        shift = self.offset * self.active_direction
+        if self.frame_table is not None:
+            self.draw_baked(shift)
+        else:
+            self.render_at(shift)
 
         return True
 
@@ -18,6 +18,8 @@ GOL_STUCK_THRESHOLD_BEATS = 15  # Beats before reseeding when stuck
 class GameOfLife(Effect, BPMSyncedEffect):
     """Conway's Game of Life on LED grid"""
 
+    use_framebuffer = True
+
     def __init__(self, pixels, width=24, height=12, hardware_config=None, clock=None,
                  rainbow=False):
         """
@@ -125,12 +127,12 @@ class GameOfLife(Effect, BPMSyncedEffect):
             self.board = gol_step(self.board)
 
         # Draw to LEDs (every frame for smooth display)
+        framebuffer = self.framebuffer
         for y in range(self.height):
+            board_row = self.board[y]
             for x in range(self.width):
-                led_id = self.coords_to_id(x, y)
-                if led_id is not None:
-                    color = self.alive_color if self.board[y][x] == 1 else self.dead_color
-                    self.pixels[led_id] = color
+                color = self.alive_color if board_row[x] == 1 else self.dead_color
+                framebuffer.set_pixel(x, y, color)
 
         return True
 
@@ -25,6 +25,8 @@ class KnightRiderEffect(Effect, BPMSyncedEffect):
         manager.add_effect(KnightRiderEffect, beats=16, axis="horizontal", random_color=True)
     """
 
+    use_framebuffer = True
+
     def __init__(self, pixels, width=24, height=12, hardware_config=None, clock=None,
                  axis="horizontal", rainbow=False, random_color=False, color=None):
         """
@@ -94,7 +96,8 @@ class KnightRiderEffect(Effect, BPMSyncedEffect):
             position = (1.0 - sweep_phase) * max_pos
 
         # Clear all pixels
-        self.pixels.fill(COLORS["OFF"])
+        framebuffer = self.framebuffer
+        framebuffer.fill(COLORS["OFF"])
 
         # Draw the scanner line with tail
         for y in range(self.height):
@@ -116,10 +119,7 @@ class KnightRiderEffect(Effect, BPMSyncedEffect):
                     brightness = 0.0
 
                 if brightness > KNIGHT_RIDER_BRIGHTNESS_MIN:
-                    color = scale_color(self.current_color, brightness)
-                    led_id = self.coords_to_id(x, y)
-                    if led_id is not None:
-                        self.pixels[led_id] = color
+                    framebuffer.set_pixel(x, y, scale_color(self.current_color, brightness))
 
         return True
 
@@ -1,6 +1,7 @@
 """Rainbow and color cycling effects"""
 
 import random
+from ..bake import BakedEffect
 from ..effect_base import Effect
 from ..effect_manager import BPMSyncedEffect
 from ..utils import wheel, scale_color
@@ -13,9 +14,10 @@ CHASE_BRIGHTNESS_TAIL = 0.8  # Starting brightness for tail
 CHASE_BRIGHTNESS_BACKGROUND = 0.1  # Dim background brightness
 CHASE_CENTER_WIDTH = 2  # Pixels in bright center
 CHASE_TAIL_LENGTH = 8  # Length of trailing gradient
+CHASE_CYCLE_BEATS = 256 // CHASE_COLOR_STEP_PER_BEAT  # Beats until the hue rotation repeats
 
 
-class RainbowChase(Effect, BPMSyncedEffect):
+class RainbowChase(Effect, BPMSyncedEffect, BakedEffect):
     """
     Rainbow chase that sweeps with the beat - now with configurable direction!
 
@@ -25,18 +27,25 @@ class RainbowChase(Effect, BPMSyncedEffect):
         manager.add_effect(RainbowChase, beats=8, direction="up")
         manager.add_effect(RainbowChase, beats=8, direction="down")
         manager.add_effect(RainbowChase, beats=8, direction="random")  # Picks new direction each time
+        manager.add_effect(RainbowChase, beats=8, bake=128)  # Pre-rendered, 16 steps per beat
     """
 
+    use_framebuffer = True
+
     def __init__(self, pixels, width=24, height=12, hardware_config=None, clock=None,
-                 direction="right"):
+                 direction="right", bake=None, bake_blend=False):
         """
         Initialize rainbow chase
 
         Args:
             direction: "right", "left", "up", "down", or "random"
+            bake: Frames to pre-render over the CHASE_CYCLE_BEATS beat cycle
+                at setup(), None to render live
+            bake_blend: Blend neighbouring baked frames
         """
         super().__init__(pixels, width, height, hardware_config, clock)
         self.direction = direction
+        self.init_bake(bake, bake_blend)
 
     def setup(self):
         self.beat_count = 0
@@ -47,6 +56,16 @@ class RainbowChase(Effect, BPMSyncedEffect):
         else:
             self.active_direction = self.direction
 
+        self.setup_bake()
+
+    def bake_cycle(self):
+        return CHASE_CYCLE_BEATS
+
+    def render_at(self, position):
+        """Draw the chase at a cycle position (beats since the hue cycle started)"""
+        beat = int(position)
+        self._draw(beat, position - beat)
+
     def update(self):
         # Check if beat occurred THIS frame (most reliable method)
         beat_now = self.clock and self.clock.beat_occurred()
@@ -57,26 +76,36 @@ class RainbowChase(Effect, BPMSyncedEffect):
         if beat_now:
             self.beat_count += 1
 
+        if self.frame_table is not None:
+            self.draw_baked(self.beat_count % CHASE_CYCLE_BEATS + phase)
+        else:
+            self._draw(self.beat_count, phase)
+
+        return True
+
+    def _draw(self, beat_count, phase):
+        """Draw the chase for a beat count and phase within the beat"""
         # Calculate sweep position based on direction
+        framebuffer = self.framebuffer
         for y in range(self.height):
             for x in range(self.width):
                 # Determine distance from chase position based on direction
                 if self.active_direction == "right":
                     beat_position = phase * self.width
                     distance = abs(x - beat_position)
-                    color_pos = (x * CHASE_COLOR_STEP_PER_PIXEL + self.beat_count * CHASE_COLOR_STEP_PER_BEAT) % 256
+                    color_pos = (x * CHASE_COLOR_STEP_PER_PIXEL + beat_count * CHASE_COLOR_STEP_PER_BEAT) % 256
                 elif self.active_direction == "left":
                     beat_position = (1.0 - phase) * self.width
                     distance = abs(x - beat_position)
-                    color_pos = ((self.width - x) * CHASE_COLOR_STEP_PER_PIXEL + self.beat_count * CHASE_COLOR_STEP_PER_BEAT) % 256
+                    color_pos = ((self.width - x) * CHASE_COLOR_STEP_PER_PIXEL + beat_count * CHASE_COLOR_STEP_PER_BEAT) % 256
                 elif self.active_direction == "down":
                     beat_position = phase * self.height
                     distance = abs(y - beat_position)
-                    color_pos = (y * CHASE_COLOR_STEP_PER_PIXEL + self.beat_count * CHASE_COLOR_STEP_PER_BEAT) % 256
+                    color_pos = (y * CHASE_COLOR_STEP_PER_PIXEL + beat_count * CHASE_COLOR_STEP_PER_BEAT) % 256
                 else:  # up
                     beat_position = (1.0 - phase) * self.height
                     distance = abs(y - beat_position)
-                    color_pos = ((self.height - y) * CHASE_COLOR_STEP_PER_PIXEL + self.beat_count * CHASE_COLOR_STEP_PER_BEAT) % 256
+                    color_pos = ((self.height - y) * CHASE_COLOR_STEP_PER_PIXEL + beat_count * CHASE_COLOR_STEP_PER_BEAT) % 256
 
                 # Sharp, bright chase with longer tail
                 if distance < CHASE_CENTER_WIDTH:
@@ -86,10 +115,4 @@ class RainbowChase(Effect, BPMSyncedEffect):
                 else:
                     brightness = CHASE_BRIGHTNESS_BACKGROUND
 
-                color = scale_color(wheel(color_pos), brightness)
-
-                led_id = self.coords_to_id(x, y)
-                if led_id is not None:
-                    self.pixels[led_id] = color
-
-        return True
+                framebuffer.set_pixel(x, y, scale_color(wheel(color_pos), brightness))
@@ -1,6 +1,8 @@
 """Random fill effects"""
 
 import random
+from array import array
+from ..bake import STEP_EPSILON, BakedEffect
 from ..effect_base import Effect
 from ..effect_manager import BPMSyncedEffect
 from ..colors import COLORS, get_random_color
@@ -103,29 +105,46 @@ class RandomStrobe(Effect, BPMSyncedEffect):
         self.pixels.fill(COLORS["OFF"])
 
 
-class DirectionalFillOnBeat(Effect, BPMSyncedEffect):
+class DirectionalFillOnBeat(Effect, BPMSyncedEffect, BakedEffect):
     """
     Fill the grid from a direction ON each beat - like a wave sweeping across!
 
     Usage:
         manager.add_effect(DirectionalFillOnBeat, beats=8, direction="right", rainbow=True)
         manager.add_effect(DirectionalFillOnBeat, beats=8, direction="random", random_color=True)
+        manager.add_effect(DirectionalFillOnBeat, beats=8, bake=32)  # Pre-computed wipe, 32 steps per beat
+
+    The color changes every beat (possibly randomly), so baking stores how
+    far the wipe has got at each phase step (lit_table) rather than whole
+    frames, and each frame only draws the rows or columns the wipe reached
+    since the last one. There are no baked frames to blend, so bake_blend
+    is not supported.
     """
 
+    use_framebuffer = True
+
     def __init__(self, pixels, width=24, height=12, hardware_config=None, clock=None,
-                 direction="right", rainbow=False, random_color=False, color=None):
+                 direction="right", rainbow=False, random_color=False, color=None, bake=None,
+                 bake_blend=False):
         """
         Args:
             direction: "left", "right", "up", "down", or "random"
             rainbow: Cycle through rainbow colors
             random_color: Use random color each beat
             color: Fixed color (overrides other color modes)
+            bake: Phase steps per beat to pre-compute at setup(), None to render live
+            bake_blend: Not supported (raises ValueError if True)
         """
+        if bake_blend:
+            raise ValueError("DirectionalFillOnBeat bakes wipe extents, not frames, "
+                             "so bake_blend is not supported")
         super().__init__(pixels, width, height, hardware_config, clock)
         self.direction = direction
         self.rainbow = rainbow
         self.random_color = random_color
         self.fixed_color = color
+        self.init_bake(bake)
+        self.lit_table = None  # Lit rows/columns per phase step when baked
 
     def setup(self):
         self.current_color = COLORS["WHITE"]
@@ -137,6 +156,56 @@ class DirectionalFillOnBeat(Effect, BPMSyncedEffect):
         else:
             self.active_direction = self.direction
 
+        self.setup_bake()
+
+    def setup_bake(self):
+        """Pre-compute how many rows/columns are lit at each phase step"""
+        self.lit_table = None
+        if not self.bake_steps:
+            return
+
+        steps = self.bake_steps
+        if self.active_direction in ("left", "right"):
+            lines = self.width
+        else:
+            lines = self.height
+
+        # What the frame buffer currently shows (see draw_baked)
+        self.drawn_color = None
+        self.drawn_lit = 0
+
+        self.lit_table = array('H', [0] * steps)
+        for step in range(steps):
+            phase = step / steps
+            self.lit_table[step] = sum(1 for line in range(lines) if phase >= line / lines)
+
+    def draw_baked(self, phase):
+        """Draw the wipe for a beat phase from the pre-computed extents"""
+        steps = self.bake_steps
+        lit = self.lit_table[int(phase * steps + STEP_EPSILON) % steps]
+        framebuffer = self.framebuffer
+        color = self.current_color
+
+        # Draw only the rows/columns the wipe reached since the last frame;
+        # start over when the color changes or the wipe restarts (new beat)
+        drawn = self.drawn_lit
+        if color != self.drawn_color or lit < drawn:
+            framebuffer.fill(COLORS["OFF"])
+            self.drawn_color = color
+            drawn = 0
+
+        direction = self.active_direction
+        for line in range(drawn, lit):
+            if direction == "right":
+                framebuffer.fill_column(line, color)
+            elif direction == "left":
+                framebuffer.fill_column(self.width - 1 - line, color)
+            elif direction == "down":
+                framebuffer.fill_row(line, color)
+            else:  # up
+                framebuffer.fill_row(self.height - 1 - line, color)
+        self.drawn_lit = lit
+
     def update(self):
         # Change color on beat
         if self.beat_occurred():
@@ -153,6 +222,11 @@ class DirectionalFillOnBeat(Effect, BPMSyncedEffect):
 
         # Use beat phase to create directional wipe effect
         phase = self.get_beat_phase()
+        if self.lit_table is not None:
+            self.draw_baked(phase)
+            return True
+
+        framebuffer = self.framebuffer
 
         for y in range(self.height):
             for x in range(self.width):
@@ -168,13 +242,9 @@ class DirectionalFillOnBeat(Effect, BPMSyncedEffect):
 
                 # Light up pixel if phase has reached it
                 if phase >= progress:
-                    color = self.current_color
+                    framebuffer.set_pixel(x, y, self.current_color)
                 else:
-                    color = COLORS["OFF"]
-
-                led_id = self.coords_to_id(x, y)
-                if led_id is not None:
-                    self.pixels[led_id] = color
+                    framebuffer.set_pixel(x, y, COLORS["OFF"])
 
         return True
 
@@ -23,8 +23,14 @@ class ConcentricRingsEffect(Effect, BPMSyncedEffect):
         manager.add_effect(ConcentricRingsEffect, beats=16, origin="center", rainbow=True)
         manager.add_effect(ConcentricRingsEffect, beats=16, origin="random", random_color=True)
         manager.add_effect(ConcentricRingsEffect, beats=16, origin="corners", color=COLORS["BLUE"])
+
+    Quality level 1 (chosen by a QualityGovernor under load) computes one
+    value per 2x2 block, a quarter of the square roots.
     """
 
+    use_framebuffer = True
+    quality_levels = 2
+
     def __init__(self, pixels, width=24, height=12, hardware_config=None, clock=None,
                  origin="center", rainbow=False, random_color=False, color=None):
         """
@@ -111,18 +117,23 @@ class ConcentricRingsEffect(Effect, BPMSyncedEffect):
         expansion_radius = phase * max_distance
 
         # Clear display
-        self.pixels.fill(COLORS["OFF"])
+        framebuffer = self.framebuffer
+        framebuffer.fill(COLORS["OFF"])
+
+        # Reduced quality samples the middle of each 2x2 block
+        step = 2 if self.quality else 1
+        offset = (step - 1) / 2.0
 
         # Draw rings from each origin
-        for y in range(self.height):
-            for x in range(self.width):
+        for y in range(0, self.height, step):
+            for x in range(0, self.width, step):
                 brightest = 0.0
 
                 # Check distance from all origins
                 for origin_x, origin_y in self.origins:
                     # Calculate distance from this origin
-                    dx = x - origin_x
-                    dy = y - origin_y
+                    dx = x + offset - origin_x
+                    dy = y + offset - origin_y
                     distance = (dx ** 2 + dy ** 2) ** 0.5
 
                     # Calculate how far from the expanding ring edge
@@ -145,9 +156,12 @@ class ConcentricRingsEffect(Effect, BPMSyncedEffect):
                 # Set pixel if bright enough
                 if brightest > RINGS_BRIGHTNESS_MIN:
                     color = scale_color(self.current_color, brightest)
-                    led_id = self.coords_to_id(x, y)
-                    if led_id is not None:
-                        self.pixels[led_id] = color
+                    if step == 1:
+                        framebuffer.set_pixel(x, y, color)
+                        continue
+                    for block_y in range(y, min(y + step, self.height)):
+                        for block_x in range(x, min(x + step, self.width)):
+                            framebuffer.set_pixel(block_x, block_y, color)
 
         return True
 
@@ -1,5 +1,6 @@
 """Wave and ripple effects"""
 
+from ..bake import BakedEffect
 from ..effect_base import Effect
 from ..effect_manager import BPMSyncedEffect
 from ..colors import COLORS
@@ -9,24 +10,48 @@ from ..utils import wheel
 WAVE_PHASE_MULTIPLIER = 10  # How much the wave moves per beat
 
 
-class WaveEffect(Effect, BPMSyncedEffect):
-    """Wave pattern synced to BPM"""
+class WaveEffect(Effect, BPMSyncedEffect, BakedEffect):
+    """
+    Wave pattern synced to BPM
+
+    Usage:
+        manager.add_effect(WaveEffect, beats=8)
+        manager.add_effect(WaveEffect, beats=8, bake=32)  # Pre-rendered, 32 steps per beat
+    """
+
+    use_framebuffer = True
+
+    def __init__(self, pixels, width=24, height=12, hardware_config=None, clock=None,
+                 bake=None, bake_blend=False):
+        """
+        Args:
+            bake: Frames to pre-render per beat at setup(), None to render live
+            bake_blend: Blend neighbouring baked frames
+        """
+        super().__init__(pixels, width, height, hardware_config, clock)
+        self.init_bake(bake, bake_blend)
 
     def setup(self):
         self.offset = 0
+        self.setup_bake()
 
-    def update(self):
-        phase = self.get_beat_phase()
+    def render_at(self, phase):
+        """Draw the wave at a beat phase (the cycle is one beat)"""
+        framebuffer = self.framebuffer
 
         for y in range(self.height):
             for x in range(self.width):
                 # Wave based on position and beat
                 wave_pos = (x + y + phase * WAVE_PHASE_MULTIPLIER) % 256
-                color = wheel(int(wave_pos))
+                framebuffer.set_pixel(x, y, wheel(int(wave_pos)))
+
+    def update(self):
+        phase = self.get_beat_phase()
 
-                led_id = self.coords_to_id(x, y)
-                if led_id is not None:
-                    self.pixels[led_id] = color
+        if self.frame_table is not None:
+            self.draw_baked(phase)
+        else:
+            self.render_at(phase)
 
         return True
 
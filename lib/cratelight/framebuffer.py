@@ -0,0 +1,157 @@
+"""Off-screen frame buffer that effects draw into in logical (x, y) space"""
+
+from array import array
+
+from .mapping import NO_LED
+
+
+class FrameBuffer:
+    """
+    RGB frame buffer that effects draw into in (x, y), stored in strip order
+
+    Effects draw with set_pixel()/fill() and never touch LED IDs. The
+    hardware mapping is applied as each pixel is written, through a
+    precomputed table of LED IDs, so buf is already laid out the way the
+    strip expects and blit() hands it to the NeoPixel object with a single
+    slice assignment: no per-LED work at all at output time, and brightness
+    scaling and byte-order packing run once per frame in C.
+
+    buf holds one RGB triple per LED ID. Grid cells without an LED write to
+    one spare triple after the last LED, which is never shown; LEDs without
+    a grid cell stay black.
+
+    Usage:
+        frame = FrameBuffer(config.width, config.height, config)
+        frame.fill(COLORS["OFF"])
+        frame.set_pixel(3, 4, COLORS["RED"])
+        frame.blit(pixels)
+        pixels.show()
+    """
+
+    def __init__(self, width, height, hardware_config=None):
+        """
+        Initialize frame buffer
+
+        Args:
+            width: Grid width
+            height: Grid height
+            hardware_config: Optional HardwareConfig for the LED mapping
+                (default: row-major, one LED per grid position)
+        """
+        if width * height >= NO_LED:
+            raise ValueError(f"grid must have fewer than {NO_LED} pixels, got {width}x{height}")
+
+        self.width = width
+        self.height = height
+        self.hardware_config = hardware_config
+        self._build_mapping()
+
+    def _build_mapping(self):
+        """Precompute the LED ID each grid cell writes to"""
+        config = self.hardware_config
+        num_pixels = self.width * self.height
+
+        if config is None:
+            self.num_leds = num_pixels
+            self.id_by_pixel = array('H', range(num_pixels))
+        else:
+            self.num_leds = config.num_leds
+            if config.width == self.width and config.height == self.height:
+                self.id_by_pixel = array('H', config.id_by_coord)
+            else:
+                self.id_by_pixel = array('H', [NO_LED] * num_pixels)
+                for y in range(self.height):
+                    for x in range(self.width):
+                        led_id = config.coords_to_id(x, y)
+                        if led_id is not None:
+                            self.id_by_pixel[y * self.width + x] = led_id
+
+        # Holes (and LED IDs past the strip) write to a spare LED after the last one
+        spare = self.num_leds
+        id_by_pixel = self.id_by_pixel
+        for index in range(num_pixels):
+            if id_by_pixel[index] >= spare:
+                id_by_pixel[index] = spare
+        has_holes = spare in id_by_pixel
+
+        # LEDs no grid cell writes to; fill() keeps them black
+        drawn = bytearray(self.num_leds + 1)
+        for led_id in id_by_pixel:
+            drawn[led_id] = 1
+        self.unmapped = [led_id for led_id in range(self.num_leds) if not drawn[led_id]]
+
+        # Row-major strip with one LED per cell: rows are contiguous in buf
+        self.identity = not has_holes and self.num_leds == num_pixels and all(
+            led_id == index for index, led_id in enumerate(id_by_pixel))
+
+        self.buf = bytearray((self.num_leds + (1 if has_holes else 0)) * 3)
+        # The part of buf that goes to the strip
+        self.out = memoryview(self.buf)[:self.num_leds * 3] if has_holes else self.buf
+
+    def set_pixel(self, x, y, color):
+        """Set pixel at (x, y) - coordinates must be on the grid"""
+        offset = self.id_by_pixel[y * self.width + x] * 3
+        buf = self.buf
+        buf[offset] = color[0]
+        buf[offset + 1] = color[1]
+        buf[offset + 2] = color[2]
+
+    def get_pixel(self, x, y):
+        """Get (R, G, B) color at (x, y) - (0, 0, 0) for a cell without an LED"""
+        led_id = self.id_by_pixel[y * self.width + x]
+        if led_id == self.num_leds:
+            return (0, 0, 0)
+        offset = led_id * 3
+        buf = self.buf
+        return (buf[offset], buf[offset + 1], buf[offset + 2])
+
+    def fill(self, color):
+        """Set every pixel to the same color"""
+        self.buf[:] = bytes(color) * (len(self.buf) // 3)
+        buf = self.buf
+        for led_id in self.unmapped:
+            offset = led_id * 3
+            buf[offset] = 0
+            buf[offset + 1] = 0
+            buf[offset + 2] = 0
+
+    def fill_row(self, y, color):
+        """Set every pixel in row y to the same color"""
+        width = self.width
+        if self.identity:
+            start = y * width * 3
+            self.buf[start:start + width * 3] = bytes(color) * width
+            return
+        self._fill_cells(range(y * width, (y + 1) * width), color)
+
+    def fill_column(self, x, color):
+        """Set every pixel in column x to the same color"""
+        self._fill_cells(range(x, self.width * self.height, self.width), color)
+
+    def _fill_cells(self, cells, color):
+        """Set a range of row-major cell indices to one color"""
+        id_by_pixel = self.id_by_pixel
+        buf = self.buf
+        red, green, blue = color
+        for index in cells:
+            offset = id_by_pixel[index] * 3
+            buf[offset] = red
+            buf[offset + 1] = green
+            buf[offset + 2] = blue
+
+    def clear(self):
+        """Turn off every pixel"""
+        self.fill((0, 0, 0))
+
+    def render(self):
+        """
+        Get the frame in strip order (no copy: buf is already laid out that way)
+
+        Returns:
+            Flattened RGB bytes, one triple per LED ID
+        """
+        return self.out
+
+    def blit(self, pixels):
+        """Write the whole frame to a NeoPixel-compatible object (does not call show())"""
+        pixels[:] = self.out
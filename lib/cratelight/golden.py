@@ -0,0 +1,168 @@
+"""
+Golden-frame regression check for the built-in effects
+
+Drives every effect in cratelight.effects with a SimulatedClock and a seeded
+random module, hashes every frame pushed to the strip and compares the
+digests against golden_frames.json. Run it before and after touching a hot
+loop to prove the output is bit-identical.
+
+Usage (CPython, from the lib directory):
+    python -m cratelight.golden                 # check, exit status 1 on mismatch
+    python -m cratelight.golden --update        # record new golden digests
+    python -m cratelight.golden --effects WaveEffect,GameOfLife
+"""
+
+import hashlib
+import json
+import os
+import random
+
+from . import effects
+from .backends import PixelBuffer
+from .clock import SimulatedClock
+from .hardware import CrateLightGrid, ZigzagGrid
+
+GOLDEN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden_frames.json")
+
+GOLDEN_FRAMES = 120      # 4 simulated seconds, 8 beats
+GOLDEN_FPS = 30
+GOLDEN_BPM = 120
+GOLDEN_SEED = 1234
+
+# Layouts checked: the irregular crate wiring and a plain serpentine panel
+GOLDEN_CONFIGS = (
+    ("crate", CrateLightGrid),
+    ("zigzag32x8", lambda: ZigzagGrid(width=32, height=8)),
+)
+
+
+def frame_digest(effect_class, config, frames=GOLDEN_FRAMES, seed=GOLDEN_SEED, **kwargs):
+    """
+    Hash every frame an effect pushes to the strip
+
+    Args:
+        effect_class: Effect class to instantiate
+        config: HardwareConfig for the LED mapping
+        frames: Frames to render
+        seed: Seed for the random module (get_random_color uses it too)
+        **kwargs: Additional arguments for the effect
+
+    Returns:
+        str: SHA-256 hex digest over all frames in strip order
+    """
+    random.seed(seed)
+    pixels = config.create_pixels(backend=PixelBuffer)
+    clock = SimulatedClock(bpm=GOLDEN_BPM, fps=GOLDEN_FPS)
+    effect = effect_class(pixels, config.width, config.height, config, clock=clock, **kwargs)
+
+    digest = hashlib.sha256()
+    effect.setup()
+    for _ in range(frames):
+        clock.update()
+        if effect.update() is False:
+            effect.setup()
+        effect.show()
+        effect.frame_count += 1
+        digest.update(pixels.buf)
+    effect.cleanup()
+    return digest.hexdigest()
+
+
+def compute_digests(classes=None, frames=GOLDEN_FRAMES, seed=GOLDEN_SEED):
+    """
+    Compute digests for effects on every golden layout
+
+    Args:
+        classes: Effect classes (default: everything in cratelight.effects)
+        frames: Frames per effect
+        seed: Seed for the random module
+
+    Returns:
+        dict: {"EffectName@layout": digest}
+    """
+    if classes is None:
+        classes = [getattr(effects, name) for name in effects.__all__]
+
+    digests = {}
+    for layout, make_config in GOLDEN_CONFIGS:
+        config = make_config()
+        for effect_class in classes:
+            key = f"{effect_class.__name__}@{layout}"
+            digests[key] = frame_digest(effect_class, config, frames, seed)
+    return digests
+
+
+def load_golden(path=GOLDEN_PATH):
+    """Load stored golden digests ({} if the file does not exist)"""
+    try:
+        with open(path) as f:
+            return json.load(f)['digests']
+    except OSError:
+        return {}
+
+
+def save_golden(digests, path=GOLDEN_PATH):
+    """Store golden digests together with the settings they were made with"""
+    with open(path, "w") as f:
+        json.dump({
+            'frames': GOLDEN_FRAMES,
+            'fps': GOLDEN_FPS,
+            'bpm': GOLDEN_BPM,
+            'seed': GOLDEN_SEED,
+            'digests': digests,
+        }, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def compare(digests, golden):
+    """
+    Compare computed digests with golden ones
+
+    Returns:
+        tuple: (changed keys, keys missing from golden)
+    """
+    changed = [key for key in digests if key in golden and digests[key] != golden[key]]
+    missing = [key for key in digests if key not in golden]
+    return changed, missing
+
+
+def main(argv=None):
+    """Command line entry point (CPython)"""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m cratelight.golden",
+                                     description="Check effect output against golden frame digests")
+    parser.add_argument("--update", action="store_true", help="record new golden digests")
+    parser.add_argument("--effects", default=None,
+                        help="comma separated effect class names (default: all)")
+    parser.add_argument("--path", default=GOLDEN_PATH, help="golden digest file")
+    args = parser.parse_args(argv)
+
+    classes = None
+    if args.effects:
+        names = args.effects.split(",")
+        for name in names:
+            if name not in effects.__all__:
+                parser.error(f"unknown effect '{name}'")
+        classes = [getattr(effects, name) for name in names]
+
+    digests = compute_digests(classes)
+    golden = load_golden(args.path)
+
+    if args.update:
+        golden.update(digests)
+        save_golden(golden, args.path)
+        print(f"Recorded {len(digests)} digests in {args.path}")
+        return 0
+
+    changed, missing = compare(digests, golden)
+    for key in changed:
+        print(f"CHANGED  {key}")
+    for key in missing:
+        print(f"MISSING  {key} (run with --update to record)")
+    print(f"{len(digests) - len(changed) - len(missing)}/{len(digests)} effects match golden frames")
+    return 1 if changed or missing else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
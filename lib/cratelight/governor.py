@@ -0,0 +1,125 @@
+"""Adaptive quality: trade detail and frame rate for beat accuracy under load"""
+
+# Frames measured before each decision
+GOVERNOR_WINDOW = 8
+
+# Windows to wait after a change before trying a higher quality again
+GOVERNOR_RETRY_WINDOWS = 16
+
+
+class QualityGovernor:
+    """
+    Lowers an effect's cost when its frames overrun the frame budget
+
+    Each window of frames the governor compares the time spent rendering
+    (update() + show()) with the time available. While the load is too high
+    it steps down, in this order:
+    1. The effect's own cheaper levels (Effect.quality_levels, applied with
+       effect.set_quality(); e.g. lower internal resolution)
+    2. Rendering only every other frame; frames in which a beat occurred are
+       always rendered, so beat-synced effects never miss a beat
+
+    Beat phase accuracy comes first (effects read the phase from the clock
+    at render time), frame rate second, detail last. Once the load is low
+    again it steps back up, retrying higher levels now and then since an
+    effect's cost can change while it runs. The level reached is kept per
+    effect class for the next time that effect plays.
+
+    Usage:
+        manager.set_governor(QualityGovernor())
+    """
+
+    def __init__(self, max_load=0.85, recover_load=0.5, window=GOVERNOR_WINDOW,
+                 retry_windows=GOVERNOR_RETRY_WINDOWS):
+        """
+        Initialize quality governor
+
+        Args:
+            max_load: Step down when render time exceeds this share of the frame budget
+            recover_load: Step up when render time is below this share
+            window: Frames measured before each decision
+            retry_windows: Windows to wait after a change before stepping up
+        """
+        if not 0.0 < recover_load < max_load:
+            raise ValueError(f"need 0 < recover_load < max_load, got {recover_load} and {max_load}")
+        if window <= 0:
+            raise ValueError(f"window must be positive, got {window}")
+
+        self.max_load = max_load
+        self.recover_load = recover_load
+        self.window = window
+        self.retry_windows = retry_windows
+        self.levels = {}  # Effect class name -> level reached last time it ran
+        self.effect = None
+        self.level = 0
+        self.skipping = False
+        self.skipped_frames = 0
+        self._budget_us = 0
+        self._frames = 0
+        self._busy_us = 0
+        self._settled = 0
+        self._skip_next = False
+
+    def start(self, effect, budget_us):
+        """
+        Govern a newly started effect
+
+        Args:
+            effect: Effect about to render its first frame
+            budget_us: Frame budget in microseconds
+        """
+        self.effect = effect
+        self._budget_us = budget_us
+        self._frames = 0
+        self._busy_us = 0
+        self._settled = 0
+        self._skip_next = False
+        self._apply(self.levels.get(effect.__class__.__name__, 0))
+
+    def max_level(self):
+        """Lowest quality step: every effect level, then frame skipping"""
+        return self.effect.quality_levels
+
+    def skip_frame(self):
+        """
+        Decide whether to skip rendering this frame (call after the clock
+        update, only for frames without a beat)
+        """
+        skip = self._skip_next
+        self._skip_next = not skip
+        if skip:
+            self.skipped_frames += 1
+            self._count(0)
+        return skip
+
+    def record(self, busy_us):
+        """Record the render time of a frame that was drawn"""
+        self._skip_next = self.skipping
+        self._count(busy_us)
+
+    def _count(self, busy_us):
+        self._busy_us += busy_us
+        self._frames += 1
+        if self._frames < self.window:
+            return
+
+        load = self._busy_us / (self._frames * self._budget_us)
+        self._frames = 0
+        self._busy_us = 0
+        self._settled += 1
+
+        if load > self.max_load and self.level < self.max_level():
+            self._apply(self.level + 1)
+        elif (load < self.recover_load and self.level > 0
+                and self._settled >= self.retry_windows):
+            self._apply(self.level - 1)
+
+    def _apply(self, level):
+        """Switch the governed effect to a quality step"""
+        level = min(level, self.max_level())
+        effect = self.effect
+        self.level = level
+        self._settled = 0
+        self.skipping = level >= effect.quality_levels
+        effect.set_quality(min(level, effect.quality_levels - 1))
+        self.levels[effect.__class__.__name__] = level
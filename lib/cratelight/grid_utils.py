@@ -2,6 +2,8 @@
 
 import time
 
+from .mapping import NO_LED, build_lookup_tables
+
 # Define your LED coordinate mapping
 ids_by_coord = [
     [297, 298, 287, 286, 279, 278, 270, 269, 262, 261, 254, 253, 245, 244, 237, 236, 229, 228, 220, 219, 212, 211, 204, 203],
@@ -18,21 +20,29 @@ ids_by_coord = [
     [92, 91, 90, 83, 82, 75, 73, 66, 65, 58, 57, 50, 48, 41, 40, 33, 32, 25, 23, 16, 15, 8, 7, 0]
 ]
 
+GRID_WIDTH = 24
+GRID_HEIGHT = 12
+GRID_NUM_LEDS = 300
+
+# Flat lookup tables compiled once from ids_by_coord
+id_by_coord, coords_by_id = build_lookup_tables(
+    GRID_WIDTH, GRID_HEIGHT, GRID_NUM_LEDS, lambda x, y: ids_by_coord[y][x]
+)
+
 # Map coordinates to the LED ID
 def coords_to_id(x, y):
     """Convert grid coordinates (x, y) to LED ID"""
-    try:
-        return ids_by_coord[y][x]
-    except IndexError:
-        return None
+    if 0 <= x < GRID_WIDTH and 0 <= y < GRID_HEIGHT:
+        led_id = id_by_coord[y * GRID_WIDTH + x]
+        if led_id != NO_LED:
+            return led_id
+    return None
 
 # Map LED ID to coordinates
 def id_to_coords(led_id):
     """Convert LED ID to grid coordinates (x, y)"""
-    for y, row in enumerate(ids_by_coord):
-        for x, id in enumerate(row):
-            if id == led_id:
-                return (x, y)
+    if 0 <= led_id < GRID_NUM_LEDS:
+        return coords_by_id[led_id]
     return None
 
 def clear_grid(pixels, num_leds, off_color=(0, 0, 0)):
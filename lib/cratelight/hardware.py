@@ -1,16 +1,59 @@
 """Hardware configuration for different LED setups"""
 
-import board
+from array import array
+
+try:
+    import board
+except ImportError:
+    from .headless import board
 try:
     import adafruit_neopixel as neopixel
 except ImportError:
-    import neopixel
+    try:
+        import neopixel
+    except ImportError:
+        neopixel = None
+
+from .backends import PixelBuffer, CorrectedPixels, SegmentedPixels, ThreadedOutput
+from .mapping import NO_LED, build_lookup_tables, build_reverse_table, load_mapping
+
+# Pixel class used by create_pixels() when no backend is given
+default_backend = neopixel.NeoPixel if neopixel is not None else PixelBuffer
+
+
+def set_default_backend(backend):
+    """
+    Choose the pixel class every create_pixels() call uses by default
+
+    Args:
+        backend: Class with the neopixel.NeoPixel constructor signature,
+            e.g. PixelBuffer or CapturePixels to run without hardware
+    """
+    global default_backend
+    default_backend = backend
 
 
 class HardwareConfig:
-    """Base class for hardware configurations"""
+    """
+    Base class for hardware configurations
+
+    Subclasses describe their wiring in map_coords() and pass their width
+    and height to HardwareConfig.__init__(). The mapping is compiled into two
+    lookup tables:
+        id_by_coord: Flat row-major array('H') of LED IDs (NO_LED for holes)
+        coords_by_id: List of (x, y) per LED ID (None for unmapped LEDs)
+
+    Older subclasses that override coords_to_id() and/or id_to_coords()
+    instead still work: the tables are built from those overrides. The
+    tables are rebuilt on first use if width, height or num_leds changed
+    after they were built (e.g. set after super().__init__()).
+
+    Set color_correction to a ColorCorrection before create_pixels() to
+    apply gamma, white balance and brightness via lookup tables at output
+    time instead of the NeoPixel brightness setting.
+    """
 
-    def __init__(self, pin, num_leds, brightness=0.5):
+    def __init__(self, pin, num_leds, brightness=0.5, width=None, height=None):
         # Input validation
         if num_leds <= 0:
             raise ValueError(f"num_leds must be positive, got {num_leds}")
@@ -20,27 +63,122 @@ class HardwareConfig:
         self.pin = pin
         self.num_leds = num_leds
         self.brightness = brightness
-        self.width = num_leds
-        self.height = 1
+        self.color_correction = None
+        self.width = width if width is not None else num_leds
+        self.height = height if height is not None else 1
+        self._tables_size = None  # (width, height, num_leds) the tables were built for
+        self.build_lookup_tables()
+
+    @property
+    def id_by_coord(self):
+        """Flat row-major array('H') of LED IDs (NO_LED for holes)"""
+        self._check_tables()
+        return self._id_by_coord
+
+    @id_by_coord.setter
+    def id_by_coord(self, table):
+        self._id_by_coord = table
+        self._tables_size = (self.width, self.height, self.num_leds)
+
+    @property
+    def coords_by_id(self):
+        """List of (x, y) per LED ID (None for unmapped LEDs)"""
+        self._check_tables()
+        return self._coords_by_id
+
+    @coords_by_id.setter
+    def coords_by_id(self, table):
+        self._coords_by_id = table
+
+    def _check_tables(self):
+        """Rebuild the tables if the grid size changed since they were built"""
+        if self._tables_size != (self.width, self.height, self.num_leds):
+            self.build_lookup_tables()
+
+    def map_coords(self, x, y):
+        """Wiring math for grid coordinates to LED ID - override in subclasses"""
+        return x + (y * self.width)
+
+    def build_lookup_tables(self):
+        """(Re)compile map_coords() into id_by_coord and coords_by_id"""
+        self.id_by_coord, self.coords_by_id = build_lookup_tables(
+            self.width, self.height, self.num_leds, self.map_coords
+        )
+
+        # Legacy extension points: a subclass overriding coords_to_id() or
+        # id_to_coords() defines the mapping instead of map_coords(). The
+        # map_coords() tables above stay in place while these run, so an
+        # override that falls back to super() still works.
+        cls = type(self)
+        legacy_forward = cls.coords_to_id is not HardwareConfig.coords_to_id
+        legacy_reverse = cls.id_to_coords is not HardwareConfig.id_to_coords
+        if legacy_forward:
+            id_by_coord, coords_by_id = build_lookup_tables(
+                self.width, self.height, self.num_leds, self.coords_to_id
+            )
+        if legacy_reverse:
+            reverse = [None] * self.num_leds
+            for led_id in range(self.num_leds):
+                coords = self.id_to_coords(led_id)
+                if coords is not None:
+                    x, y = coords
+                    if 0 <= x < self.width and 0 <= y < self.height:
+                        reverse[led_id] = (x, y)
+            if not legacy_forward:
+                id_by_coord = array('H', [NO_LED] * (self.width * self.height))
+                for led_id, coords in enumerate(reverse):
+                    if coords is not None:
+                        x, y = coords
+                        id_by_coord[y * self.width + x] = led_id
+            coords_by_id = reverse
+        if legacy_forward or legacy_reverse:
+            self.id_by_coord, self.coords_by_id = id_by_coord, coords_by_id
 
     def coords_to_id(self, x, y):
-        """Convert grid coordinates to LED ID - override in subclasses"""
-        return x + (y * self.width)
+        """Convert grid coordinates to LED ID (None if off-grid or a hole)"""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            led_id = self.id_by_coord[y * self.width + x]
+            if led_id != NO_LED:
+                return led_id
+        return None
 
     def id_to_coords(self, led_id):
-        """Convert LED ID to coordinates - override in subclasses"""
-        x = led_id % self.width
-        y = led_id // self.width
-        return (x, y)
-
-    def create_pixels(self):
-        """Create NeoPixel object with this configuration"""
-        return neopixel.NeoPixel(
+        """Convert LED ID to grid coordinates (None if the LED is unmapped)"""
+        if 0 <= led_id < self.num_leds:
+            return self.coords_by_id[led_id]
+        return None
+
+    def create_pixels(self, backend=None, threaded=False):
+        """
+        Create NeoPixel object with this configuration
+
+        Args:
+            backend: Optional pixel class to use instead of the default
+                (neopixel.NeoPixel on hardware, PixelBuffer elsewhere)
+            threaded: Push frames from a background output thread
+                (see ThreadedOutput; synchronous where threading is missing)
+        """
+        if backend is None:
+            backend = default_backend
+        pixels = backend(
             self.pin,
             self.num_leds,
-            brightness=self.brightness,
+            brightness=self._device_brightness(),
             auto_write=False
         )
+        return self._wrap_output(pixels, threaded)
+
+    def _device_brightness(self):
+        """Brightness for the NeoPixel object (1.0 when correction handles it)"""
+        return 1.0 if self.color_correction is not None else self.brightness
+
+    def _wrap_output(self, pixels, threaded=False):
+        """Put the color correction and threaded output stages in front of the device"""
+        if self.color_correction is not None:
+            pixels = CorrectedPixels(pixels, self.color_correction, brightness=self.brightness)
+        if threaded:
+            pixels = ThreadedOutput(pixels)
+        return pixels
 
 
 class CrateLightGrid(HardwareConfig):
@@ -69,24 +207,11 @@ class CrateLightGrid(HardwareConfig):
     ]
 
     def __init__(self, pin=board.GP28, brightness=0.5):
-        super().__init__(pin, num_leds=300, brightness=brightness)
-        self.width = 24
-        self.height = 12
-
-    def coords_to_id(self, x, y):
-        """Convert grid coordinates (x, y) to LED ID"""
-        try:
-            return self.IDS_BY_COORD[y][x]
-        except IndexError:
-            return None
+        super().__init__(pin, num_leds=300, brightness=brightness, width=24, height=12)
 
-    def id_to_coords(self, led_id):
-        """Convert LED ID to grid coordinates (x, y)"""
-        for y, row in enumerate(self.IDS_BY_COORD):
-            for x, id in enumerate(row):
-                if id == led_id:
-                    return (x, y)
-        return None
+    def map_coords(self, x, y):
+        """Look up grid coordinates (x, y) in the wiring table"""
+        return self.IDS_BY_COORD[y][x]
 
 
 class LEDStrip(HardwareConfig):
@@ -99,21 +224,11 @@ class LEDStrip(HardwareConfig):
     """
 
     def __init__(self, pin=board.GP2, num_leds=256, brightness=0.1):
-        super().__init__(pin, num_leds, brightness)
-        self.width = num_leds
-        self.height = 1
+        super().__init__(pin, num_leds, brightness, width=num_leds, height=1)
 
-    def coords_to_id(self, x, y):
+    def map_coords(self, x, y):
         """Simple linear mapping for strip"""
-        if 0 <= x < self.num_leds and y == 0:
-            return x
-        return None
-
-    def id_to_coords(self, led_id):
-        """Simple linear mapping for strip"""
-        if 0 <= led_id < self.num_leds:
-            return (led_id, 0)
-        return None
+        return x
 
 
 class ZigzagGrid(HardwareConfig):
@@ -139,19 +254,15 @@ class ZigzagGrid(HardwareConfig):
         if height <= 0:
             raise ValueError(f"height must be positive, got {height}")
 
-        super().__init__(pin, num_leds=width * height, brightness=brightness)
-        self.width = width
-        self.height = height
         self.direction = direction.lower()
-
         if self.direction not in ["horizontal", "vertical"]:
             raise ValueError(f"direction must be 'horizontal' or 'vertical', got '{direction}'")
 
-    def coords_to_id(self, x, y):
-        """Zigzag pattern mapping (horizontal or vertical)"""
-        if not (0 <= x < self.width and 0 <= y < self.height):
-            return None
+        super().__init__(pin, num_leds=width * height, brightness=brightness,
+                         width=width, height=height)
 
+    def map_coords(self, x, y):
+        """Zigzag pattern mapping (horizontal or vertical)"""
         if self.direction == "horizontal":
             # Horizontal zigzag: rows alternate
             if y % 2 == 0:  # Even rows: left to right
@@ -165,28 +276,6 @@ class ZigzagGrid(HardwareConfig):
             else:  # Odd columns: bottom to top
                 return x * self.height + (self.height - 1 - y)
 
-    def id_to_coords(self, led_id):
-        """Reverse zigzag pattern mapping (horizontal or vertical)"""
-        if not (0 <= led_id < self.num_leds):
-            return None
-
-        if self.direction == "horizontal":
-            # Horizontal zigzag: rows alternate
-            y = led_id // self.width
-            if y % 2 == 0:  # Even rows: left to right
-                x = led_id % self.width
-            else:  # Odd rows: right to left
-                x = self.width - 1 - (led_id % self.width)
-            return (x, y)
-        else:  # vertical
-            # Vertical zigzag: columns alternate
-            x = led_id // self.height
-            if x % 2 == 0:  # Even columns: top to bottom
-                y = led_id % self.height
-            else:  # Odd columns: bottom to top
-                y = self.height - 1 - (led_id % self.height)
-            return (x, y)
-
 
 class LinearGrid(HardwareConfig):
     """
@@ -204,20 +293,268 @@ class LinearGrid(HardwareConfig):
         if height <= 0:
             raise ValueError(f"height must be positive, got {height}")
 
-        super().__init__(pin, num_leds=width * height, brightness=brightness)
-        self.width = width
-        self.height = height
+        super().__init__(pin, num_leds=width * height, brightness=brightness,
+                         width=width, height=height)
 
-    def coords_to_id(self, x, y):
+    def map_coords(self, x, y):
         """Simple row-major mapping"""
-        if 0 <= x < self.width and 0 <= y < self.height:
-            return y * self.width + x
-        return None
+        return y * self.width + x
 
-    def id_to_coords(self, led_id):
-        """Simple row-major mapping"""
-        if 0 <= led_id < self.num_leds:
-            x = led_id % self.width
-            y = led_id // self.width
-            return (x, y)
+
+class MappedGrid(HardwareConfig):
+    """
+    Grid whose wiring is loaded from a mapping file instead of code
+
+    Accepts a CSV file (one line per row of LED IDs, for authoring) or the
+    packed binary format from save_mapping() (for deployment). Binary files
+    are memory-mapped on CPython and read in one go on CircuitPython, so
+    large installations don't parse nested lists at boot.
+
+    Usage:
+        config = MappedGrid("/crate.map", pin=board.GP28, brightness=0.5)
+
+        # Convert an authored CSV to the binary format once:
+        from cratelight.mapping import save_mapping
+        csv_config = MappedGrid("crate.csv")
+        save_mapping("crate.map", csv_config.width, csv_config.height,
+                     csv_config.num_leds, csv_config.id_by_coord)
+    """
+
+    def __init__(self, path, pin=board.GP2, brightness=0.1, num_leds=None):
+        """
+        Initialize mapped grid
+
+        Args:
+            path: Mapping file (.csv or binary)
+            pin: Data pin
+            brightness: LED brightness (0.0 to 1.0)
+            num_leds: LEDs on the strip if more than the mapping covers
+                (default: taken from the file)
+        """
+        width, height, file_num_leds, id_by_coord = load_mapping(path)
+        self.path = path
+        self._loaded_ids = id_by_coord
+        super().__init__(pin, num_leds=num_leds or file_num_leds, brightness=brightness,
+                         width=width, height=height)
+
+    def map_coords(self, x, y):
+        """Look up grid coordinates (x, y) in the loaded table"""
+        led_id = self._loaded_ids[y * self.width + x]
+        return None if led_id == NO_LED else led_id
+
+    def build_lookup_tables(self):
+        """Use the loaded table as-is and derive the reverse table from it"""
+        self.id_by_coord = self._loaded_ids
+        self.coords_by_id = build_reverse_table(self.width, self.num_leds, self._loaded_ids)
+
+
+# Panel orientations for TiledGrid
+TILE_TRANSFORMS = ("none", "rot90", "rot180", "rot270", "flip_x", "flip_y")
+
+
+class TiledGrid(HardwareConfig):
+    """
+    Wall of identical panels chained on one data pin
+
+    The panel layout (rows, columns, chain order and per-tile rotation or
+    flip) is compiled once into the lookup tables, so effects pay nothing
+    for the tiling math at runtime.
+
+    Usage:
+        # 2x3 wall of 32x8 zigzag panels, serpentine chain along rows,
+        # with the middle row of panels mounted upside down
+        panel = ZigzagGrid(width=32, height=8, direction="vertical")
+        config = TiledGrid(pin=board.GP2, panel=panel, columns=2, rows=3,
+                           tile_transforms={(0, 1): "rot180", (1, 1): "rot180"})
+    """
+
+    def __init__(self, pin=board.GP2, panel=None, columns=1, rows=1, chain_order="rows",
+                 serpentine=True, tile_transforms=None, chain=None, brightness=0.1):
+        """
+        Initialize tiled grid
+
+        Args:
+            pin: Data pin of the chain
+            panel: HardwareConfig describing one panel's wiring (its pin is ignored)
+            columns: Number of panels across
+            rows: Number of panels down
+            chain_order: "rows" (chain runs along rows) or "columns"
+            serpentine: Reverse the chain direction on every other row/column
+            tile_transforms: Dict of (column, row) -> "none", "rot90", "rot180",
+                "rot270", "flip_x" or "flip_y" for panels mounted differently
+            chain: Optional explicit list of (column, row) in chain order
+                (overrides chain_order and serpentine)
+            brightness: LED brightness (0.0 to 1.0)
+        """
+        if panel is None:
+            panel = ZigzagGrid(width=32, height=8)
+        if columns <= 0:
+            raise ValueError(f"columns must be positive, got {columns}")
+        if rows <= 0:
+            raise ValueError(f"rows must be positive, got {rows}")
+        if chain_order not in ["rows", "columns"]:
+            raise ValueError(f"chain_order must be 'rows' or 'columns', got '{chain_order}'")
+
+        self.panel = panel
+        self.columns = columns
+        self.rows = rows
+
+        if chain is None:
+            chain = self._default_chain(chain_order, serpentine)
+        if sorted(chain) != [(c, r) for c in range(columns) for r in range(rows)]:
+            raise ValueError("chain must list every (column, row) tile exactly once")
+
+        tile_transforms = tile_transforms or {}
+        for tile, transform in tile_transforms.items():
+            if transform not in TILE_TRANSFORMS:
+                raise ValueError(f"unknown transform '{transform}' for tile {tile}")
+            if transform in ["rot90", "rot270"] and panel.width != panel.height:
+                raise ValueError(f"{transform} needs square panels, got {panel.width}x{panel.height}")
+
+        # (chain position, transform) for every tile, keyed by (column, row)
+        self.tiles = {}
+        for position, tile in enumerate(chain):
+            self.tiles[tile] = (position, tile_transforms.get(tile, "none"))
+
+        super().__init__(pin, num_leds=panel.num_leds * columns * rows, brightness=brightness,
+                         width=panel.width * columns, height=panel.height * rows)
+
+    def _default_chain(self, chain_order, serpentine):
+        """List tiles in wiring order, starting top-left"""
+        chain = []
+        if chain_order == "rows":
+            for row in range(self.rows):
+                columns = range(self.columns)
+                if serpentine and row % 2 == 1:
+                    columns = reversed(columns)
+                chain.extend((column, row) for column in columns)
+        else:
+            for column in range(self.columns):
+                rows = range(self.rows)
+                if serpentine and column % 2 == 1:
+                    rows = reversed(rows)
+                chain.extend((column, row) for row in rows)
+        return chain
+
+    def map_coords(self, x, y):
+        """Find the tile under (x, y), undo its orientation and offset the panel's LED ID"""
+        panel = self.panel
+        width = panel.width
+        height = panel.height
+        position, transform = self.tiles[(x // width, y // height)]
+        local_x = x % width
+        local_y = y % height
+
+        if transform == "rot180":
+            local_x, local_y = width - 1 - local_x, height - 1 - local_y
+        elif transform == "flip_x":
+            local_x = width - 1 - local_x
+        elif transform == "flip_y":
+            local_y = height - 1 - local_y
+        elif transform == "rot90":
+            local_x, local_y = local_y, height - 1 - local_x
+        elif transform == "rot270":
+            local_x, local_y = width - 1 - local_y, local_x
+
+        led_id = panel.coords_to_id(local_x, local_y)
+        if led_id is None:
+            return None
+        return position * panel.num_leds + led_id
+
+
+class MultiSegmentConfig(HardwareConfig):
+    """
+    Several hardware configs, each on its own data pin, stitched into one canvas
+
+    Each segment is placed at an (x, y) offset on the logical canvas; their
+    rectangles must not overlap, even where a segment has a hole. LED IDs
+    run through the segments in order, so effects see a single width x height
+    grid with the usual coords_to_id(). create_pixels() drives one chain per
+    pin.
+
+    Splitting a wall into chains does not by itself shorten the frame time:
+    on CircuitPython SegmentedPixels writes the chains one after another, so
+    a frame still costs as much bus time as one chain with every LED.
+    Only parallel=True on CPython (with an output that releases the GIL)
+    overlaps the pushes.
+
+    Usage:
+        config = MultiSegmentConfig([
+            (CrateLightGrid(pin=board.GP28), 0, 0),
+            (CrateLightGrid(pin=board.GP27), 24, 0),
+        ], brightness=0.5)
+        pixels = config.create_pixels()  # 48x12 canvas, two data pins
+    """
+
+    def __init__(self, segments, brightness=0.5, parallel=False):
+        """
+        Initialize multi-segment config
+
+        Args:
+            segments: List of (hardware_config, x_offset, y_offset) tuples
+            brightness: Brightness for every chain (0.0 to 1.0)
+            parallel: Push chains concurrently from threads (CPython only,
+                see SegmentedPixels; ignored on CircuitPython)
+        """
+        if not segments:
+            raise ValueError("segments must not be empty")
+
+        self.segments = []
+        self.led_offsets = []
+        num_leds = 0
+        width = 0
+        height = 0
+        for config, x_offset, y_offset in segments:
+            if x_offset < 0 or y_offset < 0:
+                raise ValueError(f"segment offsets must not be negative, got ({x_offset}, {y_offset})")
+            self.segments.append((config, x_offset, y_offset))
+            self.led_offsets.append(num_leds)
+            num_leds += config.num_leds
+            width = max(width, x_offset + config.width)
+            height = max(height, y_offset + config.height)
+
+        self._check_overlap(width, height)
+
+        self.parallel = parallel
+        pins = tuple(config.pin for config, _, _ in self.segments)
+        super().__init__(pins, num_leds=num_leds, brightness=brightness,
+                         width=width, height=height)
+
+    def _check_overlap(self, width, height):
+        """Raise ValueError if any canvas cell lies in two segments"""
+        covered = bytearray(width * height)
+        for config, x_offset, y_offset in self.segments:
+            for y in range(y_offset, y_offset + config.height):
+                row = y * width
+                for x in range(x_offset, x_offset + config.width):
+                    if covered[row + x]:
+                        raise ValueError(f"segments overlap at ({x}, {y})")
+                    covered[row + x] = 1
+
+    def map_coords(self, x, y):
+        """Find the segment covering (x, y) and offset its LED ID"""
+        for index, (config, x_offset, y_offset) in enumerate(self.segments):
+            local_x = x - x_offset
+            local_y = y - y_offset
+            if 0 <= local_x < config.width and 0 <= local_y < config.height:
+                led_id = config.coords_to_id(local_x, local_y)
+                if led_id is None:
+                    return None
+                return self.led_offsets[index] + led_id
         return None
+
+    def create_pixels(self, backend=None, threaded=False):
+        """
+        Create one pixel object per segment, wrapped as a single strip
+
+        Args:
+            backend: Optional pixel class for every chain
+            threaded: Push frames from a background output thread
+        """
+        if backend is None:
+            backend = default_backend
+        chains = [
+            backend(config.pin, config.num_leds, brightness=self._device_brightness(), auto_write=False)
+            for config, _, _ in self.segments
+        ]
+        return self._wrap_output(SegmentedPixels(chains, parallel=self.parallel), threaded)
@@ -0,0 +1,102 @@
+"""
+Stand-ins for CircuitPython's board and digitalio modules
+
+Lets cratelight run under CPython on a normal host for profiling, capture
+and regression tests. hardware.py and clock.py fall back to these when the
+real modules are missing; call install() before importing scripts such as
+code.py that do `import board` themselves.
+
+Usage:
+    from cratelight import headless
+    headless.install()
+
+    import board
+    from cratelight import ZigzagGrid, CapturePixels
+    config = ZigzagGrid(pin=board.GP2, width=32, height=8)
+    pixels = config.create_pixels(backend=CapturePixels)
+"""
+
+import sys
+
+
+class Pin:
+    """Named placeholder for a microcontroller pin"""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return f"board.{self.name}"
+
+
+class _Namespace:
+    """Simple attribute container standing in for a module"""
+
+    def __init__(self, name, **attrs):
+        self.__name__ = name
+        for key, value in attrs.items():
+            setattr(self, key, value)
+
+
+# Raspberry Pi Pico pin names
+board = _Namespace(
+    "board",
+    LED=Pin("LED"),
+    **{f"GP{i}": Pin(f"GP{i}") for i in range(29)}
+)
+
+
+class Direction:
+    """digitalio.Direction stand-in"""
+    INPUT = "INPUT"
+    OUTPUT = "OUTPUT"
+
+
+class Pull:
+    """digitalio.Pull stand-in"""
+    UP = "UP"
+    DOWN = "DOWN"
+
+
+class DigitalInOut:
+    """
+    digitalio.DigitalInOut stand-in
+
+    Inputs read whatever was last assigned to value, so tests can drive a
+    BPMClock by toggling clock.bpm_input.value.
+    """
+
+    def __init__(self, pin):
+        self.pin = pin
+        self.direction = Direction.INPUT
+        self.pull = None
+        self.value = False
+
+    def switch_to_input(self, pull=None):
+        self.direction = Direction.INPUT
+        self.pull = pull
+
+    def switch_to_output(self, value=False):
+        self.direction = Direction.OUTPUT
+        self.value = value
+
+    def deinit(self):
+        pass
+
+
+digitalio = _Namespace(
+    "digitalio",
+    DigitalInOut=DigitalInOut,
+    Direction=Direction,
+    Pull=Pull,
+)
+
+
+def install():
+    """Register the stand-ins as the board and digitalio modules (if missing)"""
+    for name, module in (("board", board), ("digitalio", digitalio)):
+        if name not in sys.modules:
+            try:
+                __import__(name)
+            except ImportError:
+                sys.modules[name] = module
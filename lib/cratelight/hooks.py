@@ -0,0 +1,76 @@
+"""Profiling hooks for the effect run loops"""
+
+# Events fired by Effect.run() and EffectManager.run()
+# on_frame_start(effect)       before the clock/effect update
+# on_beat(effect)              after a clock update that produced a beat
+# on_update_done(effect)       after effect.update()
+# on_show_done(effect)         after effect.show()
+# on_effect_switch(old, new)   when the manager starts a new effect (old is None at first)
+HOOK_EVENTS = (
+    "on_frame_start",
+    "on_beat",
+    "on_update_done",
+    "on_show_done",
+    "on_effect_switch",
+)
+
+
+class HookRegistry:
+    """
+    Callbacks registered per event
+
+    Run loops call active() once when an effect starts. It returns None when
+    nothing is registered, and the loops then run a body with no dispatch
+    code in it at all, so hooks cost nothing unless they are used.
+
+    Usage:
+        manager.add_hook("on_show_done", lambda effect: counter.tick())
+    """
+
+    def __init__(self):
+        self.hooks = {}
+
+    def add(self, event, callback):
+        """Register callback for event"""
+        if event not in HOOK_EVENTS:
+            raise ValueError(f"event must be one of {HOOK_EVENTS}, got '{event}'")
+        self.hooks.setdefault(event, []).append(callback)
+
+    def remove(self, event, callback):
+        """Unregister callback for event (no-op if it was not registered)"""
+        callbacks = self.hooks.get(event)
+        if callbacks and callback in callbacks:
+            callbacks.remove(callback)
+            if not callbacks:
+                del self.hooks[event]
+
+    def __bool__(self):
+        return bool(self.hooks)
+
+    def fire(self, event, *args):
+        """Call every callback registered for event"""
+        for callback in self.hooks.get(event, ()):
+            callback(*args)
+
+    def active(self, *others):
+        """
+        Snapshot this registry merged with others for a run loop
+
+        Args:
+            *others: More HookRegistry objects (e.g. the effect's own hooks)
+
+        Returns:
+            dict: {event: tuple of callbacks} for every event, or None if no
+                callbacks are registered anywhere
+        """
+        registries = (self,) + others
+        if not any(registries):
+            return None
+        return {
+            event: tuple(
+                callback
+                for registry in registries
+                for callback in registry.hooks.get(event, ())
+            )
+            for event in HOOK_EVENTS
+        }
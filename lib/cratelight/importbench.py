@@ -0,0 +1,144 @@
+"""
+Import-time and memory benchmark for the package at boot
+
+Runs each scenario in a fresh interpreter and reports how long its imports
+take and how much memory they keep allocated. "minimal" is what a code.py
+that only needs colors pays; "everything" loads every public name and
+effect, which is what importing cratelight cost before the package init
+became lazy, so the difference is the boot-time saving.
+
+Usage (from the lib directory):
+    python -m cratelight.importbench
+    python -m cratelight.importbench --python micropython --repeat 5
+
+On the board, wrap the imports at the top of code.py the same way: note
+time.monotonic_ns() and gc.mem_alloc() after gc.collect() before and after.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+LIB_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Scenario name -> import statements it runs
+SCENARIOS = (
+    ("minimal", "from cratelight import COLORS"),
+    ("show", "from cratelight import COLORS, EffectManager, ZigzagGrid, FixedBPMClock\n"
+             "from cratelight.effects.wave import WaveEffect"),
+    ("everything", "import cratelight\n"
+                   "[getattr(cratelight, name) for name in cratelight.__all__]\n"
+                   "[getattr(cratelight.effects, name) for name in cratelight.effects.__all__]"),
+)
+
+DEFAULT_REPEAT = 3
+
+# Runs in the fresh interpreter: works on CPython (tracemalloc) and
+# MicroPython's unix port (gc.mem_alloc)
+_PROBE = """
+import gc, sys, time
+sys.path.insert(0, {lib!r})
+tracemalloc = None
+if {trace!r}:
+    try:
+        import tracemalloc
+        tracemalloc.start()
+    except ImportError:
+        pass
+gc.collect()
+mem_before = gc.mem_alloc() if hasattr(gc, "mem_alloc") else 0
+start = time.monotonic_ns() if hasattr(time, "monotonic_ns") else time.ticks_us() * 1000
+exec({statement!r})
+end = time.monotonic_ns() if hasattr(time, "monotonic_ns") else time.ticks_us() * 1000
+gc.collect()
+if tracemalloc is not None:
+    mem = tracemalloc.get_traced_memory()[0]
+elif hasattr(gc, "mem_alloc"):
+    mem = gc.mem_alloc() - mem_before
+else:
+    mem = 0
+print((end - start) / 1000000, mem, len([m for m in sys.modules if m.startswith("cratelight")]))
+"""
+
+
+def measure(statement, python=sys.executable, lib_dir=LIB_DIR):
+    """
+    Run import statements in fresh interpreters
+
+    Time is taken from a run without tracemalloc (tracing slows imports
+    down), memory from a second run with it.
+
+    Args:
+        statement: Python source to time
+        python: Interpreter executable
+        lib_dir: Directory containing the cratelight package
+
+    Returns:
+        dict: ms, bytes (still allocated after the imports), modules (cratelight modules loaded)
+    """
+    results = []
+    for trace in (False, True):
+        source = _PROBE.format(lib=lib_dir, statement=statement, trace=trace)
+        output = subprocess.run([python, "-c", source], capture_output=True, text=True,
+                                check=True).stdout
+        results.append(output.split())
+    ms, mem, modules = results[0][0], results[1][1], results[1][2]
+    return {'ms': float(ms), 'bytes': int(mem), 'modules': int(modules)}
+
+
+def run_benchmarks(scenarios=SCENARIOS, repeat=DEFAULT_REPEAT, python=sys.executable):
+    """
+    Measure every scenario, keeping the fastest of repeat runs
+
+    Returns:
+        list: One dict per scenario: name, ms, bytes, modules
+    """
+    results = []
+    for name, statement in scenarios:
+        runs = [measure(statement, python) for _ in range(repeat)]
+        best = min(runs, key=lambda run: run['ms'])
+        results.append({
+            'name': name,
+            'ms': best['ms'],
+            'bytes': min(run['bytes'] for run in runs),
+            'modules': best['modules'],
+        })
+    return results
+
+
+def format_table(results):
+    """Format results with each scenario's saving against the last (largest) one"""
+    header = f"{'scenario':<12} {'ms':>8} {'KB':>9} {'modules':>8} {'saves ms':>9} {'saves KB':>9}"
+    lines = [header, "-" * len(header)]
+    full = results[-1]
+    for result in results:
+        lines.append(
+            f"{result['name']:<12} {result['ms']:>8.2f} {result['bytes'] / 1024:>9.1f} "
+            f"{result['modules']:>8} {full['ms'] - result['ms']:>9.2f} "
+            f"{(full['bytes'] - result['bytes']) / 1024:>9.1f}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    """Command line entry point (CPython)"""
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m cratelight.importbench",
+                                     description="Measure import time and memory of the package")
+    parser.add_argument("--python", default=sys.executable,
+                        help="interpreter to measure (e.g. micropython)")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT,
+                        help=f"runs per scenario, fastest kept (default {DEFAULT_REPEAT})")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(repeat=args.repeat, python=args.python)
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(format_table(results))
+
+
+if __name__ == "__main__":
+    main()
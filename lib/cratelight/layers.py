@@ -0,0 +1,243 @@
+"""Layered effects: run several effects at once and composite them"""
+
+from .backends import OffscreenPixels
+from .colors import COLORS
+from .effect_base import Effect
+
+BLEND_MODES = ("normal", "add", "multiply", "screen", "max")
+
+# Bulk path: every byte gets its own 16-bit lane in one Python int, so a blend
+# over the whole frame is a handful of C-level big-int operations. Needs
+# extended slice assignment to spread bytes into lanes (CPython).
+try:
+    bytearray(2)[0::2] = b"\x00"
+    _BULK = True
+except (TypeError, NotImplementedError):
+    _BULK = False
+
+
+class _Lanes:
+    """Lane constants for frames of one size"""
+
+    def __init__(self, size):
+        self.size = size
+        self.ones = int.from_bytes(b"\x01\x00" * size, "little")     # 0x0001 per lane
+        self.low = self.ones * 0xFF                                     # 0x00FF per lane
+        self.high = self.ones << 8                                      # 0x0100 per lane
+        self.round = self.ones * 128
+        # 0x0001 in the first lane of every pixel
+        self.first = int.from_bytes(b"\x01\x00\x00\x00\x00\x00" * (size // 3), "little")
+
+    def spread(self, buf):
+        """Bytes -> int with one byte per 16-bit lane"""
+        lanes = bytearray(self.size * 2)
+        lanes[0::2] = buf
+        return int.from_bytes(lanes, "little")
+
+    def pack(self, value):
+        """int with one byte per 16-bit lane -> bytes"""
+        return value.to_bytes(self.size * 2, "little")[0::2]
+
+    def multiply(self, a, b):
+        """Per lane round(a * b / 255)"""
+        ones = self.ones
+        product = 0
+        for bit in range(8):
+            product += (a << bit) & (((b >> bit) & ones) * 0xFFFF)
+        t = product + self.round
+        return ((t + ((t >> 8) & self.low)) >> 8) & self.low
+
+    def mix(self, base, top, weight):
+        """Per lane (base * (256 - weight) + top * weight) >> 8"""
+        return ((base * (256 - weight) + top * weight) >> 8) & self.low
+
+    def lit(self, value):
+        """0xFF in all three lanes of every pixel with any channel non-zero"""
+        nonzero = ((value + self.low) >> 8) & self.ones
+        pixel = (nonzero | (nonzero >> 16) | (nonzero >> 32)) & self.first
+        return (pixel | (pixel << 16) | (pixel << 32)) * 0xFF
+
+
+_lanes_cache = {}
+
+
+def _get_lanes(size):
+    lanes = _lanes_cache.get(size)
+    if lanes is None:
+        lanes = _Lanes(size)
+        _lanes_cache.clear()
+        _lanes_cache[size] = lanes
+    return lanes
+
+
+def _blend_byte(base, top, mode):
+    """Reference blend of one channel value"""
+    if mode == "add":
+        return min(255, base + top)
+    if mode == "max":
+        return base if base >= top else top
+    if mode == "multiply":
+        t = base * top + 128
+        return (t + (t >> 8)) >> 8
+    if mode == "screen":
+        t = (255 - base) * (255 - top) + 128
+        return 255 - ((t + (t >> 8)) >> 8)
+    return top
+
+
+def blend_into(dest, layer, mode="normal", alpha=1.0, transparent_black=True):
+    """
+    Composite one layer onto dest in place
+
+    Args:
+        dest: bytearray of RGB triples (the layers below, already composited)
+        layer: RGB bytes of the same length
+        mode: "normal", "add", "multiply", "screen" or "max"
+        alpha: Layer opacity 0.0 to 1.0 (mixes the blended result with dest)
+        transparent_black: In "normal" mode, leave dest unchanged where the
+            layer pixel is black (unlit LEDs let lower layers show through)
+    """
+    if mode not in BLEND_MODES:
+        raise ValueError(f"mode must be one of {BLEND_MODES}, got '{mode}'")
+
+    weight = min(256, max(0, int(alpha * 256)))
+    if weight == 0:
+        return
+
+    if _BULK:
+        lanes = _get_lanes(len(dest))
+        base = lanes.spread(dest)
+        top = lanes.spread(layer)
+
+        if mode == "add":
+            total = base + top
+            overflow = ((total >> 8) & lanes.ones) * 0xFF
+            result = (total | overflow) & lanes.low
+        elif mode == "max":
+            base_wins = (((base + lanes.high - top) >> 8) & lanes.ones) * 0xFF
+            result = (base & base_wins) | (top & (lanes.low ^ base_wins))
+        elif mode == "multiply":
+            result = lanes.multiply(base, top)
+        elif mode == "screen":
+            result = lanes.low ^ lanes.multiply(lanes.low ^ base, lanes.low ^ top)
+        else:
+            result = top
+
+        if weight < 256:
+            result = lanes.mix(base, result, weight)
+        if mode == "normal" and transparent_black:
+            result = base ^ ((base ^ result) & lanes.lit(top))
+
+        dest[:] = lanes.pack(result)
+        return
+
+    keep = 256 - weight
+    for offset in range(0, len(dest), 3):
+        if mode == "normal" and transparent_black and not (
+                layer[offset] or layer[offset + 1] or layer[offset + 2]):
+            continue
+        for i in range(offset, offset + 3):
+            value = _blend_byte(dest[i], layer[i], mode)
+            if weight < 256:
+                value = (dest[i] * keep + value * weight) >> 8
+            dest[i] = value
+
+
+class Layer:
+    """
+    One effect in a LayerStack
+
+    Usage:
+        Layer(RainbowScroll, speed=1.5)
+        Layer(ScrollingText, blend="normal", text="HELLO")
+        Layer(SparkleEffect, blend="add", alpha=0.7)
+    """
+
+    def __init__(self, effect_class, blend="normal", alpha=1.0, transparent_black=True, **kwargs):
+        """
+        Args:
+            effect_class: Effect class to run in this layer
+            blend: "normal", "add", "multiply", "screen" or "max"
+            alpha: Layer opacity 0.0 to 1.0
+            transparent_black: Black pixels don't cover lower layers ("normal")
+            **kwargs: Arguments for the effect
+        """
+        if blend not in BLEND_MODES:
+            raise ValueError(f"blend must be one of {BLEND_MODES}, got '{blend}'")
+        if not 0.0 <= alpha <= 1.0:
+            raise ValueError(f"alpha must be between 0.0 and 1.0, got {alpha}")
+
+        self.effect_class = effect_class
+        self.blend = blend
+        self.alpha = alpha
+        self.transparent_black = transparent_black
+        self.kwargs = kwargs
+
+
+class LayerStack(Effect):
+    """
+    Runs several effects at once, each in its own off-screen buffer, and
+    composites them bottom to top into the strip in one pass per frame
+
+    Usage:
+        manager.add_layers([
+            Layer(RainbowScroll),
+            Layer(ScrollingText, text="HELLO"),
+        ], beats=16)
+
+        manager.add_effect(LayerStack, beats=8, layers=[
+            Layer(PulseOnBeat),
+            Layer(SparkleEffect, blend="add"),
+        ])
+    """
+
+    def __init__(self, pixels, width=24, height=12, hardware_config=None, clock=None, layers=()):
+        """
+        Args:
+            layers: Sequence of Layer, bottom first
+        """
+        super().__init__(pixels, width, height, hardware_config, clock)
+        if not layers:
+            raise ValueError("LayerStack needs at least one layer")
+
+        num_leds = len(pixels)
+        self.layers = list(layers)
+        self.layer_effects = []
+        for layer in self.layers:
+            target = OffscreenPixels(num_leds)
+            self.layer_effects.append(layer.effect_class(
+                target, width, height, hardware_config, clock=clock, **layer.kwargs))
+        self.out = bytearray(num_leds * 3)
+
+    def setup(self):
+        for effect in self.layer_effects:
+            effect.setup()
+
+    def activate(self):
+        for effect in self.layer_effects:
+            effect.activate()
+
+    def update(self):
+        """Render every layer and composite them; False once all layers are done"""
+        out = self.out
+        out[:] = bytes(len(out))
+        running = False
+
+        for layer, effect in zip(self.layers, self.layer_effects):
+            if effect.update() is not False:
+                running = True
+            effect.show()
+            effect.frame_count += 1
+            blend_into(out, effect.pixels.buf, layer.blend, layer.alpha, layer.transparent_black)
+
+        return running
+
+    def show(self):
+        """Push the composited frame to the LEDs"""
+        self.pixels[:] = self.out
+        self.pixels.show()
+
+    def cleanup(self):
+        for effect in self.layer_effects:
+            effect.cleanup()
+        self.pixels.fill(COLORS["OFF"])
@@ -0,0 +1,191 @@
+"""Precomputed coordinate lookup tables for LED mappings"""
+
+import struct
+import sys
+from array import array
+try:
+    import mmap
+except ImportError:
+    mmap = None
+
+# Marks a grid position with no LED behind it in id_by_coord
+NO_LED = 0xFFFF
+
+
+def build_lookup_tables(width, height, num_leds, map_coords):
+    """
+    Build forward and reverse lookup tables for an LED mapping
+
+    The mapping function is evaluated once per grid position, so effects
+    can translate coordinates with a single index instead of a method call.
+
+    Args:
+        width: Grid width
+        height: Grid height
+        num_leds: Number of LEDs on the strip
+        map_coords: Function (x, y) -> LED ID or None
+
+    Returns:
+        tuple: (id_by_coord, coords_by_id)
+            id_by_coord: Flat row-major array('H') of LED IDs, NO_LED for holes
+            coords_by_id: List of (x, y) per LED ID, None for unmapped LEDs
+    """
+    if num_leds >= NO_LED:
+        raise ValueError(f"num_leds must be below {NO_LED}, got {num_leds}")
+
+    id_by_coord = array('H', [NO_LED] * (width * height))
+    coords_by_id = [None] * num_leds
+
+    index = 0
+    for y in range(height):
+        for x in range(width):
+            led_id = map_coords(x, y)
+            if led_id is not None and 0 <= led_id < num_leds:
+                id_by_coord[index] = led_id
+                coords_by_id[led_id] = (x, y)
+            index += 1
+
+    return id_by_coord, coords_by_id
+
+
+def build_reverse_table(width, num_leds, id_by_coord):
+    """
+    Build the coords_by_id list from a flat id_by_coord table
+
+    Args:
+        width: Grid width (row stride of id_by_coord)
+        num_leds: Number of LEDs on the strip
+        id_by_coord: Flat row-major table of LED IDs, NO_LED for holes
+
+    Returns:
+        list: (x, y) per LED ID, None for unmapped LEDs
+    """
+    coords_by_id = [None] * num_leds
+    for index, led_id in enumerate(id_by_coord):
+        if led_id == NO_LED:
+            continue
+        if led_id >= num_leds:
+            raise ValueError(f"LED ID {led_id} is out of range for {num_leds} LEDs")
+        coords_by_id[led_id] = (index % width, index // width)
+    return coords_by_id
+
+
+# Binary mapping file: little-endian header followed by width * height
+# uint16 LED IDs in row-major order (NO_LED for holes)
+MAPPING_MAGIC = b"CLMP"
+MAPPING_VERSION = 1
+MAPPING_HEADER = "<4sBxHHH"  # magic, version, pad, width, height, num_leds
+MAPPING_HEADER_SIZE = struct.calcsize(MAPPING_HEADER)
+
+
+def load_mapping(path):
+    """
+    Load an LED mapping from a CSV or binary mapping file
+
+    Files ending in .csv are parsed as text; anything else is read as the
+    packed binary format written by save_mapping().
+
+    Returns:
+        tuple: (width, height, num_leds, id_by_coord)
+    """
+    if str(path).lower().endswith(".csv"):  # str() also takes pathlib.Path
+        return load_mapping_csv(path)
+    return load_mapping_binary(path)
+
+
+def load_mapping_csv(path):
+    """
+    Load an LED mapping from CSV
+
+    One line per grid row, comma-separated LED IDs, top row first. Empty
+    cells or -1 mark holes; lines starting with # are comments.
+
+    Returns:
+        tuple: (width, height, num_leds, id_by_coord)
+    """
+    rows = []
+    with open(path, "r") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            row = []
+            for cell in line.split(","):
+                cell = cell.strip()
+                row.append(NO_LED if cell in ("", "-1") else int(cell))
+            rows.append(row)
+
+    if not rows:
+        raise ValueError(f"mapping file {path} has no rows")
+    width = len(rows[0])
+    for y, row in enumerate(rows):
+        if len(row) != width:
+            raise ValueError(f"row {y} of {path} has {len(row)} cells, expected {width}")
+
+    id_by_coord = array('H', [led_id for row in rows for led_id in row])
+    mapped = [led_id for led_id in id_by_coord if led_id != NO_LED]
+    num_leds = max(mapped) + 1 if mapped else 0
+    return width, len(rows), num_leds, id_by_coord
+
+
+def load_mapping_binary(path):
+    """
+    Load an LED mapping from the packed binary format
+
+    On CPython the file is memory-mapped and the table is used in place
+    (no parsing, no copy on little-endian hosts). On CircuitPython the file
+    is read with a single read() and copied into an array('H').
+
+    Returns:
+        tuple: (width, height, num_leds, id_by_coord)
+    """
+    if mmap is not None:
+        with open(path, "rb") as f:
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    else:
+        with open(path, "rb") as f:
+            data = f.read()
+
+    if len(data) < MAPPING_HEADER_SIZE:
+        raise ValueError(f"{path} is too short to be a mapping file")
+    magic, version, width, height, num_leds = struct.unpack_from(MAPPING_HEADER, data)
+    if magic != MAPPING_MAGIC:
+        raise ValueError(f"{path} is not a CrateLight mapping file")
+    if version != MAPPING_VERSION:
+        raise ValueError(f"unsupported mapping file version {version}")
+
+    size = width * height * 2
+    if len(data) < MAPPING_HEADER_SIZE + size:
+        raise ValueError(f"{path} is truncated")
+    table = memoryview(data)[MAPPING_HEADER_SIZE:MAPPING_HEADER_SIZE + size]
+
+    if mmap is not None and sys.byteorder == "little":
+        # Zero-copy view straight into the mapped file
+        id_by_coord = table.cast("H")
+    elif hasattr(array('H'), "frombytes"):
+        id_by_coord = array('H')
+        id_by_coord.frombytes(table)
+        if sys.byteorder == "big":
+            id_by_coord.byteswap()
+    else:
+        # MicroPython copies raw bytes when building an array from bytes
+        id_by_coord = array('H', bytes(table))
+
+    return width, height, num_leds, id_by_coord
+
+
+def save_mapping(path, width, height, num_leds, id_by_coord):
+    """
+    Write an LED mapping in the packed binary format
+
+    Usage:
+        config = CrateLightGrid()
+        save_mapping("crate.map", config.width, config.height,
+                     config.num_leds, config.id_by_coord)
+    """
+    if len(id_by_coord) != width * height:
+        raise ValueError(f"id_by_coord has {len(id_by_coord)} entries, expected {width * height}")
+
+    with open(path, "wb") as f:
+        f.write(struct.pack(MAPPING_HEADER, MAPPING_MAGIC, MAPPING_VERSION, width, height, num_leds))
+        f.write(struct.pack(f"<{len(id_by_coord)}H", *id_by_coord))
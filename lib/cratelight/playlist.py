@@ -0,0 +1,105 @@
+"""Declarative show files: the EffectManager playlist as JSON"""
+
+import json
+
+# Where effect names without a module are looked up
+DEFAULT_EFFECT_PACKAGE = "cratelight.effects"
+
+# Argument values of the form {"import": "dotted.path"} are replaced by that object
+IMPORT_KEY = "import"
+
+
+def import_object(path, default_package=None):
+    """
+    Import an object by dotted path
+
+    Uses __import__ so it works on CircuitPython (no importlib).
+
+    Args:
+        path: "package.module.Name"
+        default_package: Package to look in when path has no module part
+
+    Returns:
+        The named object
+    """
+    if "." in path:
+        module_name, name = path.rsplit(".", 1)
+    elif default_package:
+        module_name, name = default_package, path
+    else:
+        raise ValueError(f"'{path}' is not a dotted path (module.Name)")
+
+    try:
+        module = __import__(module_name, None, None, [name])
+        return getattr(module, name)
+    except (ImportError, AttributeError) as e:
+        raise ValueError(f"Cannot import '{path}': {e}")
+
+
+def resolve_args(value):
+    """
+    Turn JSON argument values into effect arguments
+
+    Lists become tuples (colors are tuples), {"import": "dotted.path"}
+    becomes the imported object (e.g. a font), other values pass through.
+    """
+    if isinstance(value, list):
+        return tuple(resolve_args(item) for item in value)
+    if isinstance(value, dict):
+        if len(value) == 1 and IMPORT_KEY in value:
+            return import_object(value[IMPORT_KEY])
+        return {key: resolve_args(item) for key, item in value.items()}
+    return value
+
+
+def load_show(path):
+    """
+    Read and validate a show file
+
+    Format:
+        {"effects": [
+            {"effect": "cratelight.effects.wave.WaveEffect", "beats": 16,
+             "args": {"bake": 32}},
+            {"effect": "ScrollingText", "duration": 10,
+             "args": {"text": "HELLO", "color": [255, 0, 0],
+                      "font": {"import": "cratelight.text.Font8x8"}}}
+        ]}
+
+    A bare list of entries is accepted too. Effect names without a module
+    are looked up in cratelight.effects. Nothing is imported here.
+
+    Args:
+        path: Path to the JSON file
+
+    Returns:
+        list: Entries as dicts with 'effect', 'beats', 'duration' and 'args'
+    """
+    with open(path, "r") as f:
+        show = json.load(f)
+
+    entries = show.get("effects") if isinstance(show, dict) else show
+    if not isinstance(entries, list):
+        raise ValueError(f"{path}: expected a list of effects")
+
+    playlist = []
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict) or not isinstance(entry.get("effect"), str):
+            raise ValueError(f"{path}: entry {index} needs an \"effect\" name")
+
+        beats = entry.get("beats")
+        duration = entry.get("duration")
+        for key, value in (("beats", beats), ("duration", duration)):
+            if value is not None and (not isinstance(value, (int, float)) or value <= 0):
+                raise ValueError(f"{path}: entry {index} {key} must be a positive number, got {value}")
+
+        args = entry.get("args", {})
+        if not isinstance(args, dict):
+            raise ValueError(f"{path}: entry {index} args must be an object")
+
+        playlist.append({
+            'effect': entry["effect"],
+            'beats': beats,
+            'duration': duration,
+            'args': args,
+        })
+    return playlist
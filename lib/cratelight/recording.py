@@ -0,0 +1,372 @@
+"""Record shows to a compact binary file and replay them"""
+
+import os
+import struct
+from array import array
+try:
+    import mmap
+except ImportError:
+    mmap = None
+
+from .backends import PixelBuffer
+from .colors import COLORS
+from .effect_base import Effect
+
+RECORDING_MAGIC = b"CLFR"
+RECORDING_VERSION = 1
+RECORDING_HEADER = "<4sBxHf"  # magic, version, pad, num_leds, fps
+RECORDING_HEADER_SIZE = struct.calcsize(RECORDING_HEADER)
+RECORD_HEADER = "<BI"  # frame flags, payload length
+RECORD_HEADER_SIZE = struct.calcsize(RECORD_HEADER)
+
+# Frame flags
+FRAME_BEAT = 0x01  # A beat occurred in this frame
+FRAME_RLE = 0x02   # Payload is run-length encoded
+
+RLE_MAX_RUN = 255
+
+
+def rle_encode(frame):
+    """
+    Run-length encode an RGB frame
+
+    Returns:
+        bytearray: (count, r, g, b) per run of identical pixels
+    """
+    out = bytearray()
+    size = len(frame)
+    offset = 0
+    while offset < size:
+        r, g, b = frame[offset], frame[offset + 1], frame[offset + 2]
+        end = offset + 3
+        limit = min(size, offset + RLE_MAX_RUN * 3)
+        while end < limit and frame[end] == r and frame[end + 1] == g and frame[end + 2] == b:
+            end += 3
+        out.append((end - offset) // 3)
+        out.append(r)
+        out.append(g)
+        out.append(b)
+        offset = end
+    return out
+
+
+def rle_decode(payload, out):
+    """Decode an rle_encode() payload into the bytearray out"""
+    position = 0
+    for i in range(0, len(payload), 4):
+        end = position + payload[i] * 3
+        out[position:end] = bytes(payload[i + 1:i + 4]) * payload[i]
+        position = end
+
+
+class FrameRecorder(PixelBuffer):
+    """
+    Output stage that writes every show() to a recording file
+
+    Effects draw into this buffer as usual; show() appends the frame to the
+    file (run-length encoded when that is smaller) with a beat marker if
+    the clock reported a beat, then pushes it to the device. Play the file
+    back with ReplayEffect.
+
+    Usage:
+        pixels = FrameRecorder(config.create_pixels(), "rings.clr", fps=30, clock=clock)
+        manager = EffectManager(pixels, config.width, config.height, config, clock)
+        ...
+        pixels.close()
+    """
+
+    def __init__(self, device, path, fps=30, clock=None, rle=True):
+        """
+        Initialize frame recorder
+
+        Args:
+            device: NeoPixel-compatible object that receives the frames
+                (a PixelBuffer to record without LEDs)
+            path: Recording file to create
+            fps: Frame rate the show runs at (stored for playback)
+            clock: Clock whose beats are marked in the recording
+            rle: Run-length encode frames where that saves space
+        """
+        super().__init__(getattr(device, "pin", None), len(device))
+        self.device = device
+        self.path = path
+        self.clock = clock
+        self.rle = rle
+        self.frames_written = 0
+        self._record_header = bytearray(RECORD_HEADER_SIZE)
+        self._file = open(path, "wb")
+        self._file.write(struct.pack(RECORDING_HEADER, RECORDING_MAGIC, RECORDING_VERSION,
+                                     self.n, fps))
+
+    def show(self):
+        """Record the frame and push it to the device"""
+        self.show_count += 1
+        self.write_frame(self.buf)
+        self.device[:] = self.buf
+        self.device.show()
+
+    def write_frame(self, frame, beat=None):
+        """
+        Append one frame to the recording
+
+        Args:
+            frame: RGB bytes for every LED
+            beat: Mark a beat (default: ask the clock)
+        """
+        if beat is None:
+            beat = bool(self.clock) and self.clock.beat_occurred()
+
+        flags = FRAME_BEAT if beat else 0
+        payload = frame
+        if self.rle:
+            encoded = rle_encode(frame)
+            if len(encoded) < len(frame):
+                payload = encoded
+                flags |= FRAME_RLE
+
+        struct.pack_into(RECORD_HEADER, self._record_header, 0, flags, len(payload))
+        self._file.write(self._record_header)
+        self._file.write(payload)
+        self.frames_written += 1
+
+    def close(self):
+        """Finish the recording file"""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def deinit(self):
+        """Close the recording and release the device"""
+        self.close()
+        if hasattr(self.device, "deinit"):
+            self.device.deinit()
+
+
+class FrameReader:
+    """
+    Random access to the frames of a recording
+
+    On CPython the file is memory-mapped and raw frames are returned as
+    zero-copy views. On CircuitPython each frame is read from the file into
+    a reusable buffer. Opening scans the record headers once and keeps only
+    the position of every beat (not of every frame), so long recordings
+    don't need RAM per frame; frames are found by stepping forward from the
+    last position or the nearest beat.
+
+    Usage:
+        reader = FrameReader("rings.clr")
+        pixels[:] = reader.frame(0)
+    """
+
+    def __init__(self, path):
+        """
+        Open a recording
+
+        Args:
+            path: Recording file written by FrameRecorder
+        """
+        self.path = path
+        self._header = bytearray(RECORD_HEADER_SIZE)
+        self._size = os.stat(path)[6]
+        self._map = None
+        self._data = None
+        # Checked before mapping: mmap can't map an empty file
+        if self._size < RECORDING_HEADER_SIZE:
+            raise ValueError(f"{path} is too short to be a recording")
+
+        self._file = open(path, "rb")
+        try:
+            if mmap is not None:
+                self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+                self._data = memoryview(self._map)
+
+            magic, version, num_leds, fps = struct.unpack(
+                RECORDING_HEADER,
+                self._read(0, RECORDING_HEADER_SIZE, bytearray(RECORDING_HEADER_SIZE)))
+            if magic != RECORDING_MAGIC:
+                raise ValueError(f"{path} is not a CrateLight recording")
+            if version != RECORDING_VERSION:
+                raise ValueError(f"unsupported recording version {version}")
+        except Exception:
+            self.close()
+            raise
+
+        self.num_leds = num_leds
+        self.fps = fps
+        self._frame = bytearray(num_leds * 3)
+        self._payload = bytearray(num_leds * 3)
+        self.beat_frames = array('L')   # Frame index of every beat marker
+        self._beat_offsets = array('L')
+        self.frame_count = self._scan()
+        self._next = (0, RECORDING_HEADER_SIZE)  # (frame index, file offset) of the next frame
+
+    def __len__(self):
+        return self.frame_count
+
+    def _read(self, offset, length, buf):
+        """Bytes at a file offset (a view of the mapping, or read into buf)"""
+        if self._data is not None:
+            return self._data[offset:offset + length]
+        self._file.seek(offset)
+        view = memoryview(buf)[:length]
+        self._file.readinto(view)
+        return view
+
+    def _record(self, offset):
+        """(flags, payload length) of the record at offset"""
+        return struct.unpack(RECORD_HEADER, self._read(offset, RECORD_HEADER_SIZE, self._header))
+
+    def _scan(self):
+        """Count complete frames and index the beats"""
+        offset = RECORDING_HEADER_SIZE
+        count = 0
+        while offset + RECORD_HEADER_SIZE <= self._size:
+            flags, length = self._record(offset)
+            if offset + RECORD_HEADER_SIZE + length > self._size:
+                break  # Frame cut off (recording not closed cleanly)
+            if flags & FRAME_BEAT:
+                self.beat_frames.append(count)
+                self._beat_offsets.append(offset)
+            offset += RECORD_HEADER_SIZE + length
+            count += 1
+        return count
+
+    def _seek_back(self, index):
+        """(frame index, offset) of the last beat at or before index, else the start"""
+        low, high = 0, len(self.beat_frames)
+        while low < high:
+            middle = (low + high) // 2
+            if self.beat_frames[middle] <= index:
+                low = middle + 1
+            else:
+                high = middle
+        if low == 0:
+            return 0, RECORDING_HEADER_SIZE
+        return self.beat_frames[low - 1], self._beat_offsets[low - 1]
+
+    def frame(self, index):
+        """
+        Get one frame
+
+        Returns:
+            RGB bytes (memoryview or bytearray, valid until the next call)
+        """
+        if not 0 <= index < self.frame_count:
+            raise IndexError(f"frame {index} out of range (0-{self.frame_count - 1})")
+
+        position, offset = self._next
+        if index < position:
+            position, offset = self._seek_back(index)
+        while position < index:
+            offset += RECORD_HEADER_SIZE + self._record(offset)[1]
+            position += 1
+
+        flags, length = self._record(offset)
+        start = offset + RECORD_HEADER_SIZE
+        self._next = (index + 1, start + length)
+
+        if flags & FRAME_RLE:
+            rle_decode(self._read(start, length, self._payload), self._frame)
+            return self._frame
+        return self._read(start, length, self._frame)
+
+    def close(self):
+        """Release the file"""
+        if self._map is not None:
+            if self._data is not None:
+                self._data.release()
+            self._map.close()
+            self._data = None
+            self._map = None
+        self._file.close()
+
+
+class ReplayEffect(Effect):
+    """
+    Plays back a recording made with FrameRecorder
+
+    Expensive generative shows (rings, Game of Life, text) can be rendered
+    once and replayed at full frame rate on weak hardware. With a clock and
+    beat markers in the recording, playback follows the live beat: each
+    live beat starts the next recorded beat, and the frames in between are
+    picked by the live beat phase. Without beat markers it plays at the
+    recorded frame rate (by clock time), or one frame per update without
+    a clock.
+
+    Usage:
+        manager.add_effect(ReplayEffect, beats=32, path="rings.clr")
+    """
+
+    def __init__(self, pixels, width=24, height=12, hardware_config=None, clock=None,
+                 path=None, loop=True, lock_to_beats=True):
+        """
+        Args:
+            path: Recording file
+            loop: Start over at the end (otherwise the effect finishes)
+            lock_to_beats: Follow the live clock's beats (needs beat markers)
+        """
+        super().__init__(pixels, width, height, hardware_config, clock)
+        if path is None:
+            raise ValueError("ReplayEffect needs the path of a recording")
+        self.path = path
+        self.loop = loop
+        self.lock_to_beats = lock_to_beats
+        self.reader = None
+
+    def setup(self):
+        if self.reader is not None:
+            self.reader.close()
+        self.reader = FrameReader(self.path)
+        if self.reader.num_leds != len(self.pixels):
+            raise ValueError(f"{self.path} has {self.reader.num_leds} LEDs, "
+                             f"the strip has {len(self.pixels)}")
+        # Also stamped here for callers that drive setup()/update() directly
+        self.activate()
+
+    def activate(self):
+        # Playback starts when the effect goes live, not when it was set up
+        self.beat_index = 0
+        self.start_time = self.clock.get_time() if self.clock else 0.0
+        self.start_frame = self.frame_count
+
+    def _frame_index(self):
+        """Recording frame to show now, None when playback is over"""
+        reader = self.reader
+        clock = self.clock
+        beats = reader.beat_frames
+
+        if self.lock_to_beats and clock and len(beats) >= 2:
+            if self.frame_count > self.start_frame and clock.beat_occurred():
+                self.beat_index += 1
+            if self.beat_index >= len(beats) - 1:
+                if not self.loop:
+                    return None
+                self.beat_index = 0
+            start = beats[self.beat_index]
+            end = beats[self.beat_index + 1]
+            return start + min(int(clock.get_phase() * (end - start)), end - start - 1)
+
+        if clock:
+            index = int((clock.get_time() - self.start_time) * reader.fps)
+        else:
+            index = self.frame_count - self.start_frame
+        if index >= reader.frame_count:
+            if not self.loop:
+                return None
+            index %= reader.frame_count
+        return index
+
+    def update(self):
+        if self.reader.frame_count == 0:
+            return False
+        index = self._frame_index()
+        if index is None:
+            return False
+        self.pixels[:] = self.reader.frame(index)
+        return True
+
+    def cleanup(self):
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
+        self.pixels.fill(COLORS["OFF"])
@@ -0,0 +1,496 @@
+"""
+Offline show renderer: an EffectManager playlist to arrays, GIF or raw video
+
+Runs the manager on VirtualTime against an in-memory capture backend, so a
+show renders as fast as the CPU allows instead of in real time, and returns
+the frames in logical grid order for previewing shows on a laptop before
+they go onto the crates.
+
+Usage (CPython, from the lib directory):
+    python -m cratelight.render examples/show.json --seconds 60 --gif show.gif
+    python -m cratelight.render examples/show.json --seconds 600 --raw show.rgb
+    python -m cratelight.render examples/show.json --seconds 3600 --raw show.rgb --processes 8
+
+Usage (from Python):
+    from cratelight.render import render_show
+    frames = render_show(manager, seconds=60, fps=30, gif_path="show.gif")
+    frames.shape  # (1800, height, width, 3)
+
+    # Across processes: make_manager builds the manager in every worker
+    frames = render_show_parallel(make_manager, seconds=3600, fps=30)
+
+Needs numpy; writing GIFs needs Pillow as well.
+"""
+
+import random
+import warnings
+
+from .backends import PixelBuffer
+from .effect_base import Effect
+from .hooks import HookRegistry
+from .scheduler import FrameScheduler
+from .timesource import VirtualTime
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    from PIL import Image
+except ImportError:
+    Image = None
+
+RENDER_FPS = 30
+RENDER_BPM = 120
+RENDER_SEED = 0
+GIF_SCALE = 8  # GIF pixels per LED in each direction
+
+# Segments per worker process for render_show_parallel() (evens out the load)
+SEGMENTS_PER_PROCESS = 4
+
+
+class ShowCapture(PixelBuffer):
+    """
+    PixelBuffer that keeps every show() in one preallocated buffer
+
+    Unlike CapturePixels it stores no timestamps and allocates nothing per
+    frame. Frames are the colors as drawn (before brightness).
+    """
+
+    def __init__(self, n, max_frames):
+        """
+        Initialize show capture
+
+        Args:
+            n: Number of LEDs
+            max_frames: Frames to keep (later frames are dropped)
+        """
+        super().__init__(None, n)
+        self.frame_size = n * 3
+        self.max_frames = max_frames
+        self.frames_captured = 0
+        self.data = bytearray(self.frame_size * max_frames)
+
+    def show(self):
+        """Append the current frame"""
+        self.show_count += 1
+        if self.frames_captured < self.max_frames:
+            offset = self.frames_captured * self.frame_size
+            self.data[offset:offset + self.frame_size] = self.buf
+            self.frames_captured += 1
+
+
+def render_frames(manager, seconds, fps=RENDER_FPS):
+    """
+    Run a manager's playlist on virtual time and capture its frames
+
+    The manager's pixels, time source (and its clock's) are swapped for a
+    ShowCapture and a VirtualTime for the run and restored afterwards. The
+    quality governor is switched off, so every frame renders at full
+    quality whatever the host's speed.
+
+    Args:
+        manager: EffectManager with its playlist added
+        seconds: Length of show to render
+        fps: Frame rate of the show
+
+    Returns:
+        ShowCapture: The frames in strip order
+    """
+    return _capture(manager, _frame_total(seconds, fps), fps)
+
+
+def _frame_total(seconds, fps):
+    """Number of frames in seconds of show"""
+    frames = int(round(seconds * fps))
+    if frames <= 0:
+        raise ValueError(f"need at least one frame, got {seconds}s at {fps} fps")
+    return frames
+
+
+def _capture(manager, frames, fps):
+    """render_frames() for a number of frames"""
+    clock = manager.clock
+    saved = (manager.pixels, manager.time_source, manager.governor)
+    saved_clock_time = clock.time_source if clock is not None else None
+
+    time_source = manager.time_source
+    if time_source.realtime:
+        # Continue from the current reading so clock state stays consistent
+        time_source = VirtualTime(start=time_source.monotonic())
+
+    capture = ShowCapture(len(manager.pixels), frames)
+    manager.pixels = capture
+    manager.time_source = time_source
+    manager.governor = None
+    if clock is not None:
+        clock.time_source = time_source
+    try:
+        manager.run(fps=fps, max_frames=frames)
+    finally:
+        manager.pixels, manager.time_source, manager.governor = saved
+        if clock is not None:
+            clock.time_source = saved_clock_time
+    return capture
+
+
+def grid_index(width, height, num_leds, hardware_config=None):
+    """
+    Strip index of every grid cell, row-major
+
+    Built from the config's reverse mapping (coords_by_id); cells without
+    an LED get num_leds. Without a config LEDs fill the grid row by row.
+
+    Returns:
+        numpy array of width * height LED indices
+    """
+    index = np.full(width * height, num_leds, dtype=np.intp)
+    if hardware_config is None:
+        count = min(num_leds, width * height)
+        index[:count] = np.arange(count)
+        return index
+
+    for led_id, coords in enumerate(hardware_config.coords_by_id):
+        if coords is not None:
+            x, y = coords
+            index[y * width + x] = led_id
+    return index
+
+
+def grid_frames(capture, width, height, hardware_config=None):
+    """
+    Rearrange captured frames from strip order into grid order
+
+    Returns:
+        numpy uint8 array shaped (frames, height, width, 3), black where
+        the grid has no LED
+    """
+    count = capture.frames_captured
+    strip = np.frombuffer(capture.data, dtype=np.uint8, count=count * capture.frame_size)
+    strip = strip.reshape(count, capture.n, 3)
+
+    index = grid_index(width, height, capture.n, hardware_config)
+    holes = index == capture.n
+    frames = strip[:, np.where(holes, 0, index)]
+    frames[:, holes] = 0
+    return frames.reshape(count, height, width, 3)
+
+
+def write_gif(frames, path, fps=RENDER_FPS, scale=GIF_SCALE):
+    """
+    Write grid-order frames as a looping animated GIF
+
+    GIF frame delays are whole centiseconds, so rates that don't divide
+    100 (e.g. 30 fps) play back slightly off.
+
+    Args:
+        frames: Array shaped (frames, height, width, 3)
+        path: GIF file to write
+        fps: Playback frame rate
+        scale: Pixels per LED in each direction
+    """
+    if Image is None:
+        raise RuntimeError("write_gif() needs Pillow")
+    height, width = frames.shape[1:3]
+    size = (width * scale, height * scale)
+    # Reduce to a palette at LED resolution, then enlarge: much cheaper
+    # than quantizing the enlarged frames, and the same picture
+    images = []
+    for frame in frames:
+        image = Image.fromarray(frame).quantize(dither=Image.Dither.NONE)
+        images.append(image.resize(size, Image.Resampling.NEAREST))
+    images[0].save(path, save_all=True, append_images=images[1:],
+                   duration=int(round(1000 / fps)), loop=0)
+
+
+def write_raw(frames, path):
+    """
+    Write grid-order frames as raw RGB video (rgb24, no header)
+
+    Play or convert with e.g.:
+        ffmpeg -f rawvideo -pix_fmt rgb24 -s 24x12 -r 30 -i show.rgb show.mp4
+    """
+    with open(path, "wb") as f:
+        f.write(np.ascontiguousarray(frames, dtype=np.uint8).tobytes())
+
+
+def render_show(manager, seconds, fps=RENDER_FPS, gif_path=None, raw_path=None,
+                gif_scale=GIF_SCALE):
+    """
+    Render a manager's playlist offline
+
+    Args:
+        manager: EffectManager with its playlist added
+        seconds: Length of show to render
+        fps: Frame rate of the show
+        gif_path: Also write an animated GIF here
+        raw_path: Also write raw RGB video here
+        gif_scale: GIF pixels per LED in each direction
+
+    Returns:
+        numpy uint8 array shaped (frames, height, width, 3) in grid order
+    """
+    _check_exports(gif_path)
+    capture = render_frames(manager, seconds, fps)
+    frames = grid_frames(capture, manager.width, manager.height, manager.hardware_config)
+    _export(frames, fps, gif_path, raw_path, gif_scale)
+    return frames
+
+
+def _check_exports(gif_path):
+    """Fail before rendering if an output can't be written"""
+    if np is None:
+        raise RuntimeError("offline rendering needs numpy")
+    if gif_path is not None and Image is None:
+        raise RuntimeError("writing GIFs needs Pillow")
+
+
+def _export(frames, fps, gif_path, raw_path, gif_scale):
+    """Write the requested output files"""
+    if gif_path is not None:
+        write_gif(frames, gif_path, fps, gif_scale)
+    if raw_path is not None:
+        write_raw(frames, raw_path)
+
+
+class _Placeholder(Effect):
+    """Draws nothing: stands in for every playlist entry while planning"""
+
+    def update(self):
+        return True
+
+    def show(self):
+        pass
+
+
+def plan_show(manager, seconds, fps=RENDER_FPS):
+    """
+    Work out when each playlist entry starts, without rendering
+
+    Runs the manager's own loop on virtual time with every entry replaced
+    by an effect that draws nothing, so beats and durations end entries at
+    the same frames as in a real run. Entries whose effect finishes by
+    itself (GameOfLife, RandomFill) are assumed to run their full length;
+    render_show_parallel() checks the entries actually played against this.
+
+    Args:
+        manager: Freshly built EffectManager with its clock on VirtualTime;
+            it is used up by the planning run
+        seconds: Length of show to plan
+        fps: Frame rate of the show
+
+    Returns:
+        list: (entry index, start frame) for every entry played, in order
+    """
+    if manager.time_source.realtime:
+        raise ValueError("plan_show() needs a manager whose clock runs on VirtualTime")
+    for index, config in enumerate(manager.effects):
+        if not config['duration'] and not (config['beats'] and manager.clock):
+            raise ValueError(f"playlist entry {index} has no beats or duration, "
+                             "so its length can't be planned")
+
+    slots = []
+    manager.effects = [{'class': _Placeholder, 'beats': config['beats'],
+                        'duration': config['duration'], 'kwargs': {}}
+                       for config in manager.effects]
+    manager.pixels = PixelBuffer(None, len(manager.pixels))
+    manager.transition = None
+    manager.governor = None
+    manager.prepare_next = False
+    manager.collect_stats = False
+    manager.hooks = HookRegistry()
+    manager.add_hook("on_effect_switch", lambda old, new: slots.append(
+        (manager.current_effect_index, manager.frame_count)))
+    manager.run(fps=fps, max_frames=_frame_total(seconds, fps))
+    return slots
+
+
+def _segments(slots, frames, count):
+    """
+    Group consecutive planned entries into about count segments
+
+    Returns:
+        list: (entry index, start frame, frames) per segment
+    """
+    target = frames / count
+    segments = []
+    entry, start = slots[0]
+    for next_entry, next_start in slots[1:]:
+        if next_start - start >= target:
+            segments.append((entry, start, next_start - start))
+            entry, start = next_entry, next_start
+    segments.append((entry, start, frames - start))
+    return segments
+
+
+def _seek(manager, frames, fps):
+    """
+    Step the clock and virtual time through frames without rendering them
+
+    The manager's next run continues the same frame schedule, so its
+    deadlines are bit-identical to those of a run from the start.
+    """
+    clock = manager.clock
+    scheduler = FrameScheduler(fps, time_source=manager.time_source)
+    scheduler.start()
+    for _ in range(frames):
+        if clock:
+            clock.update()
+        scheduler.wait()
+    manager.schedule_origin = (scheduler.start_time, frames)
+
+
+def _render_segment(task):
+    """
+    Worker: render one segment of the show
+
+    Returns:
+        tuple: (strip-order frames, (entry index, start frame) of every
+            entry played, to check against the plan)
+    """
+    make_manager, fps, seed, entry, start, frames = task
+    manager = make_manager(VirtualTime())
+    _seek(manager, start, fps)
+    manager.current_effect_index = entry
+    played = []
+    manager.add_hook("on_effect_switch", lambda old, new: played.append(
+        (manager.current_effect_index, start + manager.frame_count)))
+    random.seed(seed + start)
+    return _capture(manager, frames, fps).data, played
+
+
+def render_show_parallel(make_manager, seconds, fps=RENDER_FPS, processes=None,
+                         seed=RENDER_SEED, gif_path=None, raw_path=None, gif_scale=GIF_SCALE):
+    """
+    Render a playlist offline, split into segments across a process pool
+
+    The show is planned first (see plan_show) and cut at playlist entry
+    boundaries into segments of similar length. Each worker builds its own
+    manager, steps a fresh clock through the frames before its segment's
+    start (cheap: no effects run) and renders the segment; the frames are
+    stitched back in order. Beats and phase line up with a single-process
+    render, so deterministic effects give identical frames. If an effect
+    finishes by itself before its beats or duration are up, the entries
+    played no longer match the plan; that is detected, and the show is
+    rendered again in this process with a warning. Other differences:
+    random is seeded with seed + start frame per segment, the first effect
+    of a segment cuts in instead of transitioning, and one entry is never
+    split, so a single very long entry renders on one core.
+
+    Args:
+        make_manager: make_manager(time_source) returns a new EffectManager
+            with its playlist, with time_source given to its clock. Runs in
+            every worker, so it must pickle: a module-level function or a
+            functools.partial of one
+        seconds: Length of show to render
+        fps: Frame rate of the show
+        processes: Worker processes (default: one per CPU)
+        seed: Base seed for the random module
+        gif_path: Also write an animated GIF here
+        raw_path: Also write raw RGB video here
+        gif_scale: GIF pixels per LED in each direction
+
+    Returns:
+        numpy uint8 array shaped (frames, height, width, 3) in grid order
+    """
+    import multiprocessing
+    import os
+
+    _check_exports(gif_path)
+    frames = _frame_total(seconds, fps)
+    if processes is None:
+        processes = os.cpu_count() or 1
+
+    manager = make_manager(VirtualTime())
+    width, height, config = manager.width, manager.height, manager.hardware_config
+    capture = ShowCapture(len(manager.pixels), frames)
+    slots = plan_show(manager, seconds, fps)
+
+    segments = _segments(slots, frames, processes * SEGMENTS_PER_PROCESS)
+    tasks = [(make_manager, fps, seed, entry, start, length) for entry, start, length in segments]
+    matches_plan = True
+    with multiprocessing.Pool(processes) as pool:
+        results = pool.imap(_render_segment, tasks)
+        for (entry, start, length), (data, played) in zip(segments, results):
+            planned = [slot for slot in slots if start <= slot[1] < start + length]
+            if played != planned:
+                matches_plan = False
+                break
+            offset = start * capture.frame_size
+            capture.data[offset:offset + length * capture.frame_size] = data
+    capture.frames_captured = frames
+
+    if not matches_plan:
+        warnings.warn(f"an effect in the segment from frame {start} ended before its beats "
+                      "or duration, so segments don't line up with the plan; rendering serially")
+        random.seed(seed)
+        capture = render_frames(make_manager(VirtualTime()), seconds, fps)
+
+    frames = grid_frames(capture, width, height, config)
+    _export(frames, fps, gif_path, raw_path, gif_scale)
+    return frames
+
+
+def _make_config(grid):
+    """HardwareConfig for a --grid value: "crate" or WIDTHxHEIGHT"""
+    from .hardware import CrateLightGrid, ZigzagGrid
+
+    if grid == "crate":
+        return CrateLightGrid()
+    width, height = grid.lower().split("x")
+    return ZigzagGrid(width=int(width), height=int(height))
+
+
+def _show_manager(show, bpm, grid, time_source):
+    """EffectManager for a show file on a FixedBPMClock (pickles as a partial)"""
+    from .clock import FixedBPMClock
+    from .effect_manager import EffectManager
+
+    config = _make_config(grid)
+    clock = FixedBPMClock(bpm=bpm, time_source=time_source)
+    manager = EffectManager(config.create_pixels(backend=PixelBuffer), config.width,
+                            config.height, config, clock)
+    manager.load_playlist(show)
+    return manager
+
+
+def main(argv=None):
+    """Command line entry point (CPython)"""
+    import argparse
+    import time
+    from functools import partial
+
+    parser = argparse.ArgumentParser(prog="python -m cratelight.render",
+                                     description="Render a show file offline")
+    parser.add_argument("show", help="JSON show file (see playlist.py)")
+    parser.add_argument("--seconds", type=float, default=60.0, help="show length to render")
+    parser.add_argument("--fps", type=float, default=RENDER_FPS)
+    parser.add_argument("--bpm", type=float, default=RENDER_BPM)
+    parser.add_argument("--seed", type=int, default=RENDER_SEED, help="seed for the random module")
+    parser.add_argument("--grid", default="crate", help="\"crate\" or WIDTHxHEIGHT zigzag panel")
+    parser.add_argument("--gif", default=None, help="write an animated GIF")
+    parser.add_argument("--gif-scale", type=int, default=GIF_SCALE)
+    parser.add_argument("--raw", default=None, help="write raw rgb24 video")
+    parser.add_argument("--processes", type=int, default=1,
+                        help="render segments of the show in parallel (0: one per CPU)")
+    args = parser.parse_args(argv)
+
+    make_manager = partial(_show_manager, args.show, args.bpm, args.grid)
+    start = time.perf_counter()
+    if args.processes == 1:
+        random.seed(args.seed)
+        frames = render_show(make_manager(VirtualTime()), args.seconds, args.fps,
+                             args.gif, args.raw, args.gif_scale)
+    else:
+        frames = render_show_parallel(make_manager, args.seconds, args.fps,
+                                      args.processes or None, args.seed,
+                                      args.gif, args.raw, args.gif_scale)
+    elapsed = time.perf_counter() - start
+    shown = len(frames) / args.fps
+    print(f"{len(frames)} frames ({shown:.1f}s of show) in {elapsed:.2f}s, "
+          f"{shown / elapsed:.0f}x real time")
+
+
+if __name__ == "__main__":
+    main()
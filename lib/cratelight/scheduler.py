@@ -0,0 +1,170 @@
+"""Deadline-based frame pacing for effect run loops"""
+
+from .timesource import SYSTEM_TIME
+
+# What to do when a frame finishes after its deadline
+FRAME_POLICIES = ("skip", "catch_up")
+
+
+class FrameScheduler:
+    """
+    Paces a render loop against absolute frame deadlines
+
+    Instead of sleeping a fixed 1/fps after every frame (which adds the
+    frame's own render and show time on top), each frame has a deadline
+    start + n * frame_period and wait() only sleeps for the slack that is
+    left. The frame rate therefore stays at fps as long as frames fit in
+    the budget, no matter how expensive each one is.
+
+    When a frame overruns its deadline:
+    - "skip": drop the missed deadlines and wait for the next one on the
+      original grid, so the cadence stays aligned
+    - "catch_up": run the following frames back to back until the schedule
+      is met again (at most max_catch_up frames behind, then skip)
+
+    Usage:
+        scheduler = FrameScheduler(fps=30)
+        while True:
+            effect.update()
+            effect.show()
+            scheduler.wait()
+    """
+
+    def __init__(self, fps=30, policy="skip", busy_wait=0.0, max_catch_up=4, time_source=None):
+        """
+        Initialize frame scheduler
+
+        Args:
+            fps: Target frames per second
+            policy: "skip" or "catch_up" for missed deadlines
+            busy_wait: Seconds before each deadline to spin instead of sleep
+                (e.g. 0.001 for tighter timing where sleep() is coarse)
+            max_catch_up: Most frames "catch_up" will try to recover
+            time_source: TimeSource to pace against (default: wall clock;
+                a VirtualTime makes wait() advance time instead of sleeping)
+        """
+        if fps <= 0:
+            raise ValueError(f"fps must be positive, got {fps}")
+        if policy not in FRAME_POLICIES:
+            raise ValueError(f"policy must be one of {FRAME_POLICIES}, got '{policy}'")
+
+        self.fps = fps
+        self.frame_period = 1.0 / fps
+        self.policy = policy
+        self.busy_wait = busy_wait
+        self.max_catch_up = max_catch_up
+        self.time_source = time_source if time_source is not None else SYSTEM_TIME
+        self.start_time = None
+        self.deadline_number = 0  # next_deadline is start_time + deadline_number / fps
+        self.next_deadline = None
+        self.late_frames = 0      # Frames that finished after their deadline
+        self.dropped_frames = 0   # Deadlines given up by the "skip" policy
+
+    def start(self, start_time=None, frame=0):
+        """
+        Start the schedule (first deadline is one frame period away)
+
+        Args:
+            start_time: Time of frame 0 (default: now)
+            frame: Frames of this schedule already run, to continue an
+                earlier schedule from start_time exactly
+        """
+        if start_time is None:
+            start_time = self.time_source.monotonic()
+        self.start_time = start_time
+        self._set_deadline(frame + 1)
+
+    def _set_deadline(self, number):
+        """
+        Make deadline number the next one
+
+        Deadlines are computed from the start rather than by adding
+        frame_period to the previous one, so rounding never accumulates
+        and frames land exactly where SimulatedClock puts them.
+        """
+        self.deadline_number = number
+        self.next_deadline = self.start_time + number / self.fps
+
+    def slack(self):
+        """Seconds left until the next deadline (negative if already late)"""
+        if self.next_deadline is None:
+            return self.frame_period
+        return self.next_deadline - self.time_source.monotonic()
+
+    def wait(self):
+        """
+        Wait for the end of the current frame's slot
+
+        Returns:
+            int: Number of deadlines missed by this frame (0 if on time)
+        """
+        if self.next_deadline is None:
+            self.start()
+
+        time_source = self.time_source
+        deadline = self.next_deadline
+        slack = deadline - time_source.monotonic()
+
+        if slack >= 0:
+            if not time_source.realtime:
+                # Virtual time only moves on sleep(), so never spin
+                time_source.sleep_until(deadline)
+            else:
+                if slack > self.busy_wait:
+                    time_source.sleep(slack - self.busy_wait)
+                while time_source.monotonic() < deadline:
+                    pass
+            self._set_deadline(self.deadline_number + 1)
+            return 0
+
+        return self._late(deadline, slack)
+
+    async def wait_async(self):
+        """
+        wait() for asyncio run loops: other tasks run while this one sleeps
+
+        busy_wait is ignored, since spinning would block the event loop.
+        A late frame still yields once so other tasks are never starved.
+
+        Returns:
+            int: Number of deadlines missed by this frame (0 if on time)
+        """
+        # Imported here: asyncio is large and only async run loops need it
+        try:
+            import asyncio
+        except ImportError:
+            raise RuntimeError("wait_async() needs the asyncio library")
+
+        if self.next_deadline is None:
+            self.start()
+
+        deadline = self.next_deadline
+        slack = deadline - self.time_source.monotonic()
+
+        if slack >= 0:
+            if self.time_source.realtime:
+                await asyncio.sleep(slack)
+            else:
+                # Virtual time: advance it, but still let other tasks run
+                self.time_source.sleep_until(deadline)
+                await asyncio.sleep(0)
+            self._set_deadline(self.deadline_number + 1)
+            return 0
+
+        missed = self._late(deadline, slack)
+        await asyncio.sleep(0)
+        return missed
+
+    def _late(self, deadline, slack):
+        """Count the deadlines a late frame overran and set the next one"""
+        missed = int(-slack / self.frame_period) + 1
+        self.late_frames += 1
+
+        if self.policy == "catch_up" and missed <= self.max_catch_up:
+            # Next deadline is already due, so the next frames run back to back
+            self._set_deadline(self.deadline_number + 1)
+        else:
+            # Realign to the first deadline still in the future
+            self._set_deadline(self.deadline_number + missed)
+            self.dropped_frames += missed - 1
+        return missed
@@ -0,0 +1,166 @@
+"""Per-frame timing statistics for the effect run loops"""
+
+import time
+from array import array
+
+# Samples kept per timing ring (about 4 seconds at 30 fps)
+DEFAULT_WINDOW = 128
+
+# Frame stages timed by the run loops
+STAGES = ("clock", "update", "show", "frame")
+
+# ticks() reads a cheap monotonic counter; ticks_diff(end, start) turns two
+# readings into microseconds. On the board the counter is a small int that
+# wraps, so reading it never allocates (time.monotonic_ns() returns a long
+# int on CircuitPython, and float seconds lose microseconds within hours).
+if hasattr(time, "ticks_us"):
+    # MicroPython: microsecond ticks with wraparound-safe differences
+    ticks = time.ticks_us
+    ticks_diff = time.ticks_diff
+else:
+    try:
+        from supervisor import ticks_ms
+    except ImportError:
+        ticks_ms = None
+
+    if ticks_ms is not None:
+        # CircuitPython: millisecond ticks that wrap at 2**29
+        _TICKS_MASK = (1 << 29) - 1
+        ticks = ticks_ms
+
+        def ticks_diff(end, start):
+            """Microseconds between two ticks() readings (millisecond resolution)"""
+            return ((end - start) & _TICKS_MASK) * 1000
+    else:
+        if hasattr(time, "monotonic_ns"):
+            def ticks():
+                """Monotonic time in integer microseconds"""
+                return time.monotonic_ns() // 1000
+        else:
+            def ticks():
+                """Monotonic time in integer microseconds"""
+                return int(time.monotonic() * 1000000)
+
+        def ticks_diff(end, start):
+            """Microseconds between two ticks() readings"""
+            return end - start
+
+
+class TimingRing:
+    """
+    Fixed-size ring buffer of durations in microseconds
+
+    Samples are written into a preallocated array, so recording a frame
+    never allocates. Statistics are only computed when summary() is called.
+    """
+
+    def __init__(self, size=DEFAULT_WINDOW):
+        """
+        Initialize timing ring
+
+        Args:
+            size: Number of most recent samples to keep
+        """
+        if size <= 0:
+            raise ValueError(f"size must be positive, got {size}")
+
+        self.size = size
+        self.samples = array('L', [0] * size)
+        self.index = 0
+        self.count = 0
+
+    def record(self, micros):
+        """Store one duration, overwriting the oldest sample when full"""
+        self.samples[self.index] = micros
+        self.index += 1
+        if self.index == self.size:
+            self.index = 0
+        if self.count < self.size:
+            self.count += 1
+
+    def reset(self):
+        """Forget all samples"""
+        self.index = 0
+        self.count = 0
+
+    def summary(self):
+        """
+        Summarize the samples in the window
+
+        Returns:
+            dict: min/mean/p95/max in milliseconds, or None if empty
+        """
+        count = self.count
+        if not count:
+            return None
+
+        values = sorted(self.samples[:count])
+        p95 = values[min(count - 1, (count * 95) // 100)]
+        return {
+            'min': values[0] / 1000,
+            'mean': sum(values) / count / 1000,
+            'p95': p95 / 1000,
+            'max': values[-1] / 1000,
+        }
+
+
+class FrameStats:
+    """
+    Timing rings for each stage of a frame
+
+    Stages are clock (clock.update()), update (effect.update()), show
+    (effect.show(), i.e. blit and pixels.show()) and frame (all three).
+
+    Usage:
+        stats = FrameStats(budget_us=33333)
+        stats.record(clock_us, update_us, show_us)
+        print(stats.summary()['frame']['p95'])
+    """
+
+    def __init__(self, window=DEFAULT_WINDOW, budget_us=None):
+        """
+        Initialize frame stats
+
+        Args:
+            window: Samples kept per stage
+            budget_us: Frame budget in microseconds, frames over it are counted
+        """
+        self.budget_us = budget_us
+        self.rings = {stage: TimingRing(window) for stage in STAGES}
+        self._clock = self.rings['clock']
+        self._update = self.rings['update']
+        self._show = self.rings['show']
+        self._frame = self.rings['frame']
+        self.frames = 0
+        self.over_budget = 0
+
+    def record(self, clock_us, update_us, show_us):
+        """Record the stage durations of one frame"""
+        frame_us = clock_us + update_us + show_us
+        self._clock.record(clock_us)
+        self._update.record(update_us)
+        self._show.record(show_us)
+        self._frame.record(frame_us)
+        self.frames += 1
+        if self.budget_us is not None and frame_us > self.budget_us:
+            self.over_budget += 1
+
+    def reset(self):
+        """Forget all samples and counters"""
+        for ring in self.rings.values():
+            ring.reset()
+        self.frames = 0
+        self.over_budget = 0
+
+    def summary(self):
+        """
+        Summarize every stage
+
+        Returns:
+            dict: {stage: {min, mean, p95, max} in ms, 'frames': total frames,
+                'over_budget': frames slower than budget_us}
+        """
+        result = {stage: self.rings[stage].summary() for stage in STAGES}
+        result['frames'] = self.frames
+        result['over_budget'] = self.over_budget
+        return result
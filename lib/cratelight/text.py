@@ -1,5 +1,7 @@
 """Text rendering utilities for LED displays"""
 
+from .mapping import NO_LED
+
 
 class Font8x8:
     """8x8 pixel monospace font for LED displays"""
@@ -678,16 +680,20 @@ class TextRenderer:
             bg_color: Background color tuple (r, g, b)
         """
         text_data = self.font.render_text(text)
+        id_by_coord = self.config.id_by_coord
 
         for y in range(len(text_data)):
+            grid_y = y_pos + y
+            if not 0 <= grid_y < self.height:
+                continue
+            row = grid_y * self.width
             for x in range(len(text_data[0])):
                 grid_x = x_pos + x
-                grid_y = y_pos + y
 
                 # Check bounds
-                if 0 <= grid_x < self.width and 0 <= grid_y < self.height:
-                    led_id = self.config.coords_to_id(grid_x, grid_y)
-                    if led_id is not None:
+                if 0 <= grid_x < self.width:
+                    led_id = id_by_coord[row + grid_x]
+                    if led_id != NO_LED:
                         color = fg_color if text_data[y][x] else bg_color
                         self.pixels[led_id] = color
 
@@ -0,0 +1,77 @@
+"""Injectable time sources for clocks and run loops"""
+
+import time
+
+
+class TimeSource:
+    """
+    Wall-clock time: time.monotonic() and time.sleep()
+
+    Clocks, the FrameScheduler and the run loops read time through a time
+    source instead of the time module, so a VirtualTime can replace it.
+    """
+
+    # False for sources whose sleep() doesn't take real time
+    realtime = True
+
+    def monotonic(self):
+        """Current time in seconds"""
+        return time.monotonic()
+
+    def sleep(self, seconds):
+        """Wait for a number of seconds"""
+        time.sleep(seconds)
+
+    def sleep_until(self, deadline):
+        """Wait until monotonic() reaches deadline"""
+        seconds = deadline - self.monotonic()
+        if seconds > 0:
+            self.sleep(seconds)
+
+
+# Shared default instance
+SYSTEM_TIME = TimeSource()
+
+
+class VirtualTime(TimeSource):
+    """
+    Time that only moves when something waits on it
+
+    sleep() advances the time instantly instead of waiting, so a run loop
+    paced by a FrameScheduler advances exactly one frame period per frame
+    and renders as fast as the CPU allows. Give the same instance to the
+    clock and the run loop to render a show faster than real time.
+
+    Usage:
+        virtual = VirtualTime()
+        clock = FixedBPMClock(bpm=128, time_source=virtual)
+        manager = EffectManager(pixels, width, height, config, clock)  # uses the clock's time
+        manager.run(fps=30, max_frames=30 * 600)  # 10 minutes of show in seconds
+    """
+
+    realtime = False
+
+    def __init__(self, start=0.0):
+        """
+        Initialize virtual time
+
+        Args:
+            start: Time reported until the first sleep()/advance()
+        """
+        self.now = start
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        if seconds > 0:
+            self.now += seconds
+
+    def sleep_until(self, deadline):
+        # Land exactly on the deadline, so frame times don't pick up rounding
+        if deadline > self.now:
+            self.now = deadline
+
+    def advance(self, seconds):
+        """Move time forward without a run loop"""
+        self.sleep(seconds)
@@ -0,0 +1,208 @@
+"""Transitions between effects: crossfade, wipe and dissolve"""
+
+import random
+
+# Bulk path: bytes.translate() scales/thresholds every byte in C and Python
+# ints add/select whole frames at once. MicroPython lacks translate().
+_HAS_TRANSLATE = hasattr(bytes, "translate")
+
+
+def _scale_table(weight):
+    """256-byte table multiplying each value by weight/256"""
+    return bytes((value * weight) >> 8 for value in range(256))
+
+
+class Transition:
+    """
+    Base class for transitions
+
+    The EffectManager renders the outgoing and incoming effects into two
+    off-screen buffers (strip order RGB) and calls render() to combine them
+    into the output buffer each frame until the transition is over.
+
+    Subclasses implement render() and optionally prepare().
+    """
+
+    def __init__(self, beats=1, duration=None):
+        """
+        Initialize transition
+
+        Args:
+            beats: Length in beats (uses the manager's clock BPM, 60 without clock)
+            duration: Length in seconds (overrides beats)
+        """
+        if duration is None and beats <= 0:
+            raise ValueError(f"beats must be positive, got {beats}")
+        if duration is not None and duration <= 0:
+            raise ValueError(f"duration must be positive, got {duration}")
+
+        self.beats = beats
+        self.duration = duration
+
+    def length(self, bpm):
+        """Length of the transition in seconds at a given BPM"""
+        if self.duration is not None:
+            return self.duration
+        return self.beats * 60.0 / bpm
+
+    def prepare(self, num_leds, width, height, hardware_config=None):
+        """
+        Precompute per-LED data once before the first transition
+
+        Args:
+            num_leds: LEDs in the output buffer
+            width: Grid width
+            height: Grid height
+            hardware_config: HardwareConfig for the LED mapping (default:
+                row-major, one LED per grid position)
+        """
+        pass
+
+    def render(self, out, outgoing, incoming, progress):
+        """
+        Combine two frames
+
+        Args:
+            out: bytearray to write the result into
+            outgoing: Old effect's frame (RGB bytes, strip order)
+            incoming: New effect's frame
+            progress: 0.0 (all outgoing) to 1.0 (all incoming)
+        """
+        raise NotImplementedError
+
+
+class Crossfade(Transition):
+    """
+    Linear crossfade from the old effect to the new one
+
+    Usage:
+        manager.set_transition(Crossfade(beats=2))
+    """
+
+    def render(self, out, outgoing, incoming, progress):
+        weight = int(progress * 256)
+        if weight <= 0:
+            out[:] = outgoing
+            return
+        if weight >= 256:
+            out[:] = incoming
+            return
+
+        keep = 256 - weight
+        if _HAS_TRANSLATE:
+            # Scaled halves never carry into the next byte: a*keep/256 + b*weight/256 <= 255
+            faded_out = outgoing.translate(_scale_table(keep))
+            faded_in = incoming.translate(_scale_table(weight))
+            total = int.from_bytes(faded_out, "little") + int.from_bytes(faded_in, "little")
+            out[:] = total.to_bytes(len(out), "little")
+            return
+
+        for i in range(len(out)):
+            out[i] = ((outgoing[i] * keep) >> 8) + ((incoming[i] * weight) >> 8)
+
+
+class _MaskTransition(Transition):
+    """
+    Switches each LED from the old effect to the new one at its own threshold
+
+    prepare() stores a threshold (0-255) per LED, repeated for its three
+    bytes. At a given progress every byte below the threshold comes from the
+    incoming frame.
+    """
+
+    def __init__(self, beats=1, duration=None):
+        super().__init__(beats, duration)
+        self.thresholds = None
+
+    def _keys(self, num_leds, width, height, hardware_config):
+        """Return a threshold 0-255 for every LED ID (override)"""
+        raise NotImplementedError
+
+    def prepare(self, num_leds, width, height, hardware_config=None):
+        thresholds = bytearray(num_leds * 3)
+        for led_id, key in enumerate(self._keys(num_leds, width, height, hardware_config)):
+            offset = led_id * 3
+            thresholds[offset] = key
+            thresholds[offset + 1] = key
+            thresholds[offset + 2] = key
+        self.thresholds = bytes(thresholds)
+
+    def render(self, out, outgoing, incoming, progress):
+        cutoff = min(256, max(0, int(progress * 256)))
+        thresholds = self.thresholds
+
+        if _HAS_TRANSLATE:
+            # 0xFF where the LED has switched to the incoming frame, else 0x00
+            mask = int.from_bytes(
+                thresholds.translate(b"\xff" * cutoff + b"\x00" * (256 - cutoff)), "little")
+            old = int.from_bytes(outgoing, "little")
+            new = int.from_bytes(incoming, "little")
+            out[:] = (old ^ ((old ^ new) & mask)).to_bytes(len(out), "little")
+            return
+
+        for i in range(len(out)):
+            out[i] = incoming[i] if thresholds[i] < cutoff else outgoing[i]
+
+
+class Wipe(_MaskTransition):
+    """
+    Sweep the new effect in across the grid
+
+    Usage:
+        manager.set_transition(Wipe(direction="right", beats=1))
+    """
+
+    def __init__(self, direction="right", beats=1, duration=None):
+        """
+        Args:
+            direction: "right", "left", "down" or "up"
+            beats: Length in beats
+            duration: Length in seconds (overrides beats)
+        """
+        if direction not in ("right", "left", "down", "up"):
+            raise ValueError(f"direction must be 'right', 'left', 'down' or 'up', got '{direction}'")
+        super().__init__(beats, duration)
+        self.direction = direction
+
+    def _keys(self, num_leds, width, height, hardware_config):
+        keys = []
+        for led_id in range(num_leds):
+            if hardware_config is not None:
+                coords = hardware_config.id_to_coords(led_id)
+            else:
+                coords = (led_id % width, led_id // width)
+            if coords is None:
+                keys.append(0)
+                continue
+            x, y = coords
+            if self.direction == "right":
+                key = x * 256 // width
+            elif self.direction == "left":
+                key = (width - 1 - x) * 256 // width
+            elif self.direction == "down":
+                key = y * 256 // height
+            else:  # up
+                key = (height - 1 - y) * 256 // height
+            keys.append(key)
+        return keys
+
+
+class Dissolve(_MaskTransition):
+    """
+    Switch LEDs to the new effect one by one in random order
+
+    Usage:
+        manager.set_transition(Dissolve(beats=2))
+    """
+
+    def _keys(self, num_leds, width, height, hardware_config):
+        # Fisher-Yates shuffle (CircuitPython's random has no shuffle())
+        order = list(range(num_leds))
+        for i in range(num_leds - 1, 0, -1):
+            j = random.randint(0, i)
+            order[i], order[j] = order[j], order[i]
+
+        keys = [0] * num_leds
+        for rank, led_id in enumerate(order):
+            keys[led_id] = rank * 256 // num_leds
+        return keys
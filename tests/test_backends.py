@@ -0,0 +1,79 @@
+"""Tests for the pixel backends (run with: python -m pytest tests)"""
+
+import os
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "lib"))
+
+from cratelight.backends import PixelBuffer, ThreadedOutput  # noqa: E402
+
+
+class FailingPixels(PixelBuffer):
+    """PixelBuffer whose show() raises for the first `failures` calls"""
+
+    def __init__(self, n, failures=1):
+        super().__init__(None, n)
+        self.failures = failures
+
+    def show(self):
+        self.show_count += 1
+        if self.show_count <= self.failures:
+            raise OSError("bus error")
+
+
+def _within(timeout, function):
+    """Run function in a thread and return its exception; fail if it hangs"""
+    result = []
+
+    def target():
+        try:
+            function()
+        except Exception as e:
+            result.append(e)
+        else:
+            result.append(None)
+
+    thread = threading.Thread(target=target)
+    thread.daemon = True
+    thread.start()
+    thread.join(timeout)
+    assert not thread.is_alive(), f"{function.__name__}() hung"
+    return result[0]
+
+
+def test_threaded_output_flush_raises_device_error():
+    output = ThreadedOutput(FailingPixels(8), slots=1)
+    output.show()
+    error = _within(2.0, output.flush)
+    assert isinstance(error, OSError)
+    output.deinit()
+
+
+def test_threaded_output_show_raises_device_error():
+    output = ThreadedOutput(FailingPixels(8, failures=100), slots=1)
+
+    def show_frames():
+        for _ in range(5):
+            output.show()
+
+    error = _within(2.0, show_frames)
+    assert isinstance(error, OSError)
+    output.deinit()
+
+
+def test_threaded_output_recovers_after_error():
+    device = FailingPixels(8)
+    output = ThreadedOutput(device, slots=2)
+    output.show()
+    with pytest.raises(OSError):
+        output.flush()
+
+    output[0] = (1, 2, 3)
+    output.show()
+    output.flush()
+    assert device.show_count == 2
+    assert bytes(device.buf[:3]) == b"\x01\x02\x03"
+    output.deinit()